@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+#
+# Micro-benchmark for launch preparation (i.e., compiling run manifests).
+#
+# The benchmark generates configurations with an increasing number of builds and
+# revisions. Each experiment uses all builds, so compiling the manifests performs
+# one build lookup per (run, build) pair. Since build lookups take constant time,
+# the time per lookup should stay roughly constant as the configuration grows.
+#
+# Usage: python3 benchmarks/launch_preparation.py [--sizes 10 20 40 80]
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from simexpal import base
+from simexpal.launch import common
+
+def generate_yml(size):
+	build_names = ['build{:04}'.format(i) for i in range(size)]
+	return {
+		'builds': [{'name': name, 'git': 'none'} for name in build_names],
+		'revisions': [
+			{
+				'name': 'rev{:04}'.format(i),
+				'build_version': {name: 'v{}'.format(i) for name in build_names}
+			}
+			for i in range(size)
+		],
+		'instances': [{
+			'repo': 'local',
+			'items': [{'name': 'inst{:04}'.format(i), 'files': []} for i in range(4)]
+		}],
+		'experiments': [{'name': 'exp', 'args': ['true'], 'use_builds': build_names}]
+	}
+
+def measure(basedir, size):
+	cfg = base.Config(basedir, generate_yml(size))
+	runs = list(cfg.discover_all_runs())
+
+	start = time.perf_counter()
+	for run in runs:
+		common.compile_manifest(run)
+	elapsed = time.perf_counter() - start
+
+	return len(runs), len(runs) * size, elapsed
+
+def main():
+	parser = argparse.ArgumentParser()
+	parser.add_argument('--sizes', type=int, nargs='+', default=[10, 20, 40, 80],
+			help='Numbers of builds (and revisions) to benchmark')
+	args = parser.parse_args()
+
+	print('{:>8} {:>8} {:>10} {:>10} {:>14}'.format('builds', 'runs', 'lookups', 'time [s]', 'us / lookup'))
+	with tempfile.TemporaryDirectory() as basedir:
+		for size in args.sizes:
+			num_runs, num_lookups, elapsed = measure(basedir, size)
+			print('{:>8} {:>8} {:>10} {:>10.3f} {:>14.2f}'.format(size, num_runs, num_lookups,
+					elapsed, elapsed / num_lookups * 1e6))
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+#
+# Benchmark for capturing the output of runs.
+#
+# The benchmark launches a run that writes a large amount of data to stdout and
+# measures the CPU time that the supervisor (i.e., common.invoke_run()) spends per
+# GiB of output. With direct capturing, the supervisor does not touch the output;
+# with lazy capturing, the output is moved from a pipe to the file by splice() or
+# by read() and write(). The last configuration mimics the 16 KiB reads of previous
+# versions of simexpal.
+#
+# Usage: python3 benchmarks/output_capture.py [--size 1024] (in MiB)
+
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from simexpal import base
+from simexpal.launch import common
+
+CONFIGURATIONS = [
+	('direct', 'direct', True, common.CAPTURE_CHUNK_SIZE),
+	('lazy, splice()', 'lazy', True, common.CAPTURE_CHUNK_SIZE),
+	('lazy, 1 MiB reads', 'lazy', False, common.CAPTURE_CHUNK_SIZE),
+	('lazy, 16 KiB reads', 'lazy', False, 16 * 1024),
+]
+
+def generate_yml(size, mode):
+	return {
+		'instances': [{'repo': 'local', 'items': [{'name': 'inst', 'files': []}]}],
+		'experiments': [{
+			'name': 'exp',
+			'args': ['head', '-c', str(size), '/dev/zero'],
+			'output_capture': mode
+		}]
+	}
+
+def get_cpu_time():
+	usage = resource.getrusage(resource.RUSAGE_SELF)
+	return usage.ru_utime + usage.ru_stime
+
+def measure(basedir, size, mode, use_splice, chunk_size):
+	common.USE_SPLICE = use_splice and hasattr(os, 'splice')
+	common.CAPTURE_CHUNK_SIZE = chunk_size
+
+	cfg = base.Config(basedir, generate_yml(size, mode))
+	run, = cfg.discover_all_runs()
+	common.lock_run(run)
+	manifest = common.compile_manifest(run)
+
+	start_cpu = get_cpu_time()
+	start = time.perf_counter()
+	common.invoke_run(manifest)
+	elapsed = time.perf_counter() - start
+	cpu_time = get_cpu_time() - start_cpu
+
+	assert os.path.getsize(run.aux_file_path('stdout')) == size
+	return cpu_time, elapsed
+
+def main():
+	parser = argparse.ArgumentParser()
+	parser.add_argument('--size', type=int, default=1024,
+			help='Amount of output in MiB')
+	args = parser.parse_args()
+	size = args.size * 1024 * 1024
+
+	print('{:>20} {:>10} {:>10} {:>14}'.format('capture', 'time [s]', 'CPU [s]', 'CPU [s] / GiB'))
+	for name, mode, use_splice, chunk_size in CONFIGURATIONS:
+		if use_splice and mode == 'lazy' and not hasattr(os, 'splice'):
+			continue
+		with tempfile.TemporaryDirectory() as basedir:
+			cpu_time, elapsed = measure(basedir, size, mode, use_splice, chunk_size)
+		print('{:>20} {:>10.3f} {:>10.3f} {:>14.3f}'.format(name, elapsed, cpu_time,
+				cpu_time / (size / 1024 ** 3)))
+
+if __name__ == '__main__':
+	main()
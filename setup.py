@@ -27,6 +27,10 @@ setup(
 		'requests',
 		'pyyaml',
 		'jsonschema>=3.2.0'
-	]
+	],
+	extras_require={
+		'npz': ['numpy'],
+		'parquet': ['pyarrow']
+	}
 )
 
@@ -1,5 +1,5 @@
 
-from . import base, launch, util
+from . import base, launch, store, util
 
 from .base import config_for_dir
 
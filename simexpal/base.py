@@ -1,17 +1,28 @@
 
-from collections import OrderedDict
+from collections import OrderedDict, deque
 from enum import IntEnum
+import array
+import hashlib
+import heapq
 import itertools
 import json
+import marshal
+import operator
 import os
 import yaml
 import subprocess
 import sys
 import tempfile
+import time
 import warnings
+import zlib
 
 from . import util
+from . import output
 from . import queuesock
+from . import slurmquery
+from . import snapshot
+from . import store
 
 DEFAULT_DEV_BUILD_NAME = '_dev'
 EXPERIMENTS_LIST_THRESHOLD = 30
@@ -20,6 +31,18 @@ DEFAULT_SOCKETPATH = os.path.expanduser('~/.extl.sock')
 
 DID_WARN_KONECT = False
 
+# Files that determine the status of a run (in order of precedence) and their subdirectory.
+STATUS_SOURCES = [('status', 'output'), ('out', 'output'), ('run', 'aux'), ('lock', 'aux')]
+STATUS_REFRESH_CHUNK_SIZE = 256
+RESULT_CHUNK_SIZE = 64
+RESULT_CACHE_BATCH_SIZE = 4096
+
+# Number of seconds for which the states of queued Slurm jobs are cached.
+SLURM_STATUS_TTL = 30
+
+# Keys of the .status file that store the resource usage of a run (as reported by wait4()).
+RUSAGE_FIELDS = ['utime', 'stime', 'maxrss', 'majflt', 'minflt', 'nvcsw', 'nivcsw']
+
 did_warn_libyaml = False
 YmlLoader = yaml.SafeLoader
 try:
@@ -60,6 +83,28 @@ def get_output_file_name(ext, instance, repetition):
 		rep = '[{}]'.format(repetition)
 	return instance + '.' + ext + rep
 
+# Returns the shard (in range(num_shards)) that a run belongs to.
+# The assignment only depends on the run's name; it is stable across processes and machines.
+def get_run_shard(internal_name, instance, num_shards):
+	return zlib.crc32('{}/{}'.format(internal_name, instance).encode()) % num_shards
+
+# Returns the key that identifies a parse function in the result cache (or None if it cannot be
+# identified). Unless a version is given, the key covers the function's code; editing the function
+# thus invalidates its cached results.
+def get_parser_key(parse_fn, version=None):
+	if version is None:
+		code = getattr(parse_fn, '__code__', None)
+		if code is None:
+			# For example, functools.partial objects; their arguments are not covered by their name.
+			return None
+		version = hashlib.sha1(marshal.dumps(code)).hexdigest()
+	return '{}.{}:{}'.format(getattr(parse_fn, '__module__', None),
+			getattr(parse_fn, '__qualname__', type(parse_fn).__qualname__), version)
+
+# Canonical sort key of a variation (i.e., a tuple of variants).
+def variation_key(variation):
+	return tuple(variant.name for variant in variation)
+
 class MatrixScope:
 	__slots__ = ['experiments', 'revisions', 'axes', 'variants', 'instsets', 'repetitions']
 
@@ -77,16 +122,21 @@ class MatrixSelection:
 class Config:
 	"""Represents the entire configuration (i.e., an experiments.yml file)."""
 
-	def __init__(self, basedir, yml):
+	def __init__(self, basedir, yml, status_store=None, snapshot=None):
 		assert os.path.isabs(basedir)
 		self.basedir = basedir
 		self.yml = yml
+		self._snapshot = snapshot
 
-		self.status_cache_path = basedir + util.SIMEX_CACHE
-		self.status_cache_dict = {}
+		if status_store is None:
+			status_store = store.open_store(basedir)
+		self.status_store = status_store
+		self.status_cache_path = status_store.path
 
 		self.slurm_queried = False
 		self.slurm_queried_jobs = {}
+		self.slurm_job_elapsed = {}
+		self._slurm_job_expires = {}
 
 		self.queue_queried = False
 		self.queue_queried_jobs = {}
@@ -97,11 +147,20 @@ class Config:
 		self._axes = OrderedDict()
 		self._variants = OrderedDict()
 		self._exp_infos = OrderedDict()
+		self._builds = OrderedDict()
+		self._variants_by_axis = OrderedDict()
 
 		self._experiments_discovered = False
 		self._experiments = OrderedDict()
 		self._runs_discovered = False
-		self._runs = OrderedDict()
+		self._runs = None
+
+		self._selections = None
+		self._experiments_by_name = None
+		self._run_indexes = None
+
+		# Maps paths of .run files to ((mtime, size), SubmissionInfo)-tuples.
+		self._submission_infos = {}
 
 		def check_for_reserved_name(name):
 			if name.startswith('_'):
@@ -181,6 +240,18 @@ class Config:
 				raise RuntimeError("The variant name '{}' is ambiguous".format(variant.name))
 			self._variants[variant.name] = variant
 
+		# Precompute lookup tables for builds and variants.
+		for build_info in self._build_infos.values():
+			for revision in self._revisions.values():
+				# TODO: Exclude the build if not all requirements are specified in the revision.
+				if build_info.name in revision.specified_versions:
+					self._builds[(build_info.name, revision)] = Build(self, build_info, revision)
+
+		for axis in self._axes:
+			self._variants_by_axis[axis] = []
+		for variant in self._variants.values():
+			self._variants_by_axis[variant.axis].append(variant)
+
 		if 'experiments' in self.yml:
 			for exp_yml in sorted(self.yml['experiments'], key=lambda y: y['name']):
 				check_for_reserved_name(exp_yml['name'])
@@ -194,12 +265,6 @@ class Config:
 					warnings.warn(msg, DeprecationWarning)
 				self._exp_infos[exp_yml['name']] = ExperimentInfo(self, exp_yml)
 
-		try:
-			with open(self.status_cache_path, 'r') as cachefile:
-				self.status_cache_dict = json.load(cachefile)["status"]
-		except FileNotFoundError:
-			pass
-
 	def instance_dir(self):
 		"""Path of the directory that stores all the instances."""
 		return os.path.join(self.basedir, self.yml['instdir'])
@@ -242,14 +307,7 @@ class Config:
 		return self._revisions[name]
 
 	def all_builds(self):
-		if 'builds' in self.yml:
-			for build_yml in sorted(self.yml['builds'], key=lambda y: y['name']):
-				for revision in self.all_revisions():
-					spec_set = set(revision.specified_versions)
-					if build_yml['name'] not in spec_set:
-						continue
-					# TODO: Exclude the build if not all requirements are specified in spec_set.
-					yield Build(self, self.get_build_info(build_yml['name']), revision)
+		yield from self._builds.values()
 
 	def all_non_dev_builds(self):
 		for build in self.all_builds():
@@ -267,9 +325,9 @@ class Config:
 				yield build
 
 	def get_build(self, name, revision):
-		for build in self.all_builds(): # TODO: Avoid a quadratic blowup.
-			if build.name == name and build.revision == revision:
-				return build
+		build = self._builds.get((name, revision), None)
+		if build is not None:
+			return build
 		raise RuntimeError("Build '{}' does not exist in revision '{}'".format(name, revision.name))
 
 	def all_variants(self):
@@ -278,9 +336,7 @@ class Config:
 	def all_variants_for_axis(self, axis):
 		if axis not in self._axes:
 			raise RuntimeError("Axis {} does not exist".format(axis))
-		for var in self.all_variants():
-			if var.axis == axis:
-				yield var
+		yield from self._variants_by_axis[axis]
 
 	def get_variant(self, name):
 		if name not in self._variants:
@@ -295,25 +351,45 @@ class Config:
 			raise RuntimeError("Experiment {} does not exist".format(name))
 		return self._exp_infos[name]
 
+	# Helper to find all selected revisions for a given experiment (in canonical order).
+	def _revisions_for_experiment(self, selection, exp_info):
+		if 'use_builds' in exp_info._exp_yml:
+			if selection.revisions is not None:
+				return selection.revisions
+			return sorted(self.all_revisions(), key=lambda revision: revision.name)
+		return [None]
+
+	# Helper to find all selected repetitions for a given experiment.
+	def _repetitions_for_experiment(self, selection, exp_info):
+		if selection.repetitions is not None:
+			return range(0, selection.repetitions)
+		elif exp_info.repeat is not None:
+			return range(0, exp_info.repeat)
+		return range(0, 1)
+
 	def _fill_experiments(self):
 
 		def extract_experiments(selection):
-			def revisions_for_experiment(exp_info):
-				if 'use_builds' in exp_info._exp_yml:
-					if selection.revisions is not None:
-						yield from selection.revisions
-					else:
-						yield from self.all_revisions()
-				else:
-					yield None
-
 			for exp_info in selection.experiments:
-				yield from itertools.product([exp_info], revisions_for_experiment(exp_info), selection.variations)
-
-		key = lambda x: (x[0].name, x[1].name if x[1] is not None else '_none',
-						[sub_var.name for sub_var in x[2]])
+				for revision in self._revisions_for_experiment(selection, exp_info):
+					rev_key = revision.name if revision is not None else '_none'
+					for variation in selection.variations:
+						yield ((exp_info.name, rev_key, variation_key(variation)),
+								(exp_info, revision, variation))
 
-		for exp_info, revision, variation in self._expand_matrix(extract_experiments, key=key):
+		matrix = None
+		if self._snapshot is not None and self._snapshot.has_matrix:
+			try:
+				matrix = [(self.get_experiment_info(exp_name), self.get_revision(rev_name),
+							tuple(self.get_variant(var_name) for var_name in var_names))
+						for exp_name, rev_name, var_names in self._snapshot.experiments]
+			except Exception:
+				# The snapshot is unusable; fall back to a full expansion of the matrix.
+				self._snapshot.discard_matrix()
+		if matrix is None:
+			matrix = self._expand_matrix(extract_experiments)
+
+		for exp_info, revision, variation in matrix:
 			self._experiments[(exp_info, revision, variation)] = Experiment(self, exp_info, revision, variation)
 
 		self._experiments_discovered = True
@@ -325,77 +401,386 @@ class Config:
 
 		yield from self._experiments.values()
 
-	def _fill_runs(self):
+	def _generate_runs(self):
+		# Yields (experiment, instance, repetition)-tuples in canonical order.
+		if not self._experiments_discovered:
+			self._fill_experiments()
 
 		def extract_runs(selection):
-			# Helper to find all selected revisions for a given experiment.
-			def revisions_for_experiment(exp_info):
-				if 'use_builds' in exp_info._exp_yml:
-					if selection.revisions is not None:
-						yield from selection.revisions
-					else:
-						yield from self.all_revisions()
-				else:
-					yield None
-
 			for exp_info in selection.experiments:
-				for revision in revisions_for_experiment(exp_info):
+				reps = self._repetitions_for_experiment(selection, exp_info)
+				for revision in self._revisions_for_experiment(selection, exp_info):
+					rev_key = revision.name if revision is not None else '_none'
 					for variation in selection.variations:
+						experiment = self._experiments[(exp_info, revision, variation)]
+						var_key = variation_key(variation)
 						for instance in selection.instances:
-							if selection.repetitions is not None:
-								reps = range(0, selection.repetitions)
-							elif exp_info.repeat is not None:
-								reps = range(0, exp_info.repeat)
-							else:
-								reps = range(0, 1)
 							for rep in reps:
-								yield (self._experiments[(exp_info, revision, variation)], instance, rep)
-		key = lambda t: (t[0].name, t[0].revision.name if t[0].revision is not None else '_none',
-						[sub_var.name for sub_var in t[0].variation], t[1].shortname, t[2])
+								yield ((exp_info.name, rev_key, var_key, instance.shortname, rep),
+										(experiment, instance, rep))
+
+		yield from self._expand_matrix(extract_runs)
 
+	def _new_run_table(self):
 		if not self._experiments_discovered:
 			self._fill_experiments()
+		return RunTable(self, list(self._experiments.values()), list(self._insts.values()))
+
+	def _fill_runs(self):
+		table = self._new_run_table()
 
-		for experiment, instance, rep in self._expand_matrix(extract_runs, key=key):
-			self._runs[(experiment, instance, rep)] = Run(self, experiment, instance, rep)
+		if not self._load_snapshot_runs(table):
+			for experiment, instance, rep in self._generate_runs():
+				table.append(experiment, instance, rep)
+			if self._snapshot is not None:
+				self._save_matrix_snapshot(table)
 
+		self._runs = table
 		self._runs_discovered = True
 
-	def discover_all_runs(self):
+	def _load_snapshot_runs(self, table):
+		# Helper to fill a RunTable from the snapshot. Returns False if the snapshot
+		# does not contain a (usable) matrix.
+		if self._snapshot is None or not self._snapshot.has_matrix:
+			return False
+		try:
+			table.load_columns(*self._snapshot.runs)
+		except Exception:
+			self._snapshot.discard_matrix()
+			return False
+		return True
+
+	def _save_matrix_snapshot(self, table):
+		self._snapshot.experiments = [(experiment.name,
+					experiment.revision.name if experiment.revision is not None else None,
+					tuple(variant.name for variant in experiment.variation))
+				for experiment in table.experiments]
+		self._snapshot.runs = table.columns()
+		try:
+			self._snapshot.save()
+		except OSError:
+			# The snapshot is only an optimization; read-only base directories are fine.
+			pass
+
+	def discover_all_runs(self, stream=False, shard=None):
+		"""
+		Yields all runs of the experiment matrix in canonical order.
+
+		:param stream: If true and the runs have not been discovered before, the runs are
+			generated lazily and are not memorized. This keeps the memory consumption
+			bounded for large matrices.
+		:param shard: An ``(index, num_shards)``-tuple. If given, only the runs of the
+			given shard are yielded (see :func:`get_run_shard`). Runs of other shards
+			are skipped without constructing :class:`Run` objects for them.
+		"""
+
+		if stream and not self._runs_discovered:
+			table = self._new_run_table()
+			if self._load_snapshot_runs(table):
+				yield from table.iter_shard(shard)
+			else:
+				shard_of = ShardAssigner(shard)
+				for experiment, instance, rep in self._generate_runs():
+					if shard_of.selects(experiment, instance, rep):
+						yield Run(self, experiment, instance, rep)
+			return
+
+		if not self._runs_discovered:
+			self._fill_runs()
+
+		yield from self._runs.iter_shard(shard)
+
+	def _ensure_run_indexes(self):
+		# The indexes map keys to arrays of positions in the run table.
+		if self._run_indexes is not None:
+			return self._run_indexes
 
 		if not self._runs_discovered:
 			self._fill_runs()
+		table = self._runs
+
+		indexes = {key: {} for key in ['experiment', 'instance', 'instset', 'revision',
+				'variant', 'axis', 'repetition']}
+
+		def add(index, key, pos):
+			if key not in index:
+				index[key] = array.array('l', [pos])
+			else:
+				index[key].append(pos)
+
+		# Determine the keys per experiment and instance upfront.
+		exp_keys = []
+		for experiment in table.experiments:
+			keys = [('experiment', experiment.name)]
+			if experiment.revision is not None:
+				keys.append(('revision', experiment.revision.name))
+			for variant in experiment.variation:
+				keys.append(('variant', variant.name))
+				keys.append(('axis', variant.axis))
+			exp_keys.append(keys)
+		inst_keys = [[('instance', instance.shortname)] + [('instset', instset) for instset in instance.instsets]
+				for instance in table.instances]
+
+		for pos, (exp_id, inst_id, rep) in enumerate(table.iter_ids()):
+			for index_name, key in exp_keys[exp_id]:
+				add(indexes[index_name], key, pos)
+			for index_name, key in inst_keys[inst_id]:
+				add(indexes[index_name], key, pos)
+			add(indexes['repetition'], rep, pos)
+
+		self._run_indexes = indexes
+		return indexes
+
+	def _lookup_run(self, experiment, instance, repetition):
+		if self._runs_discovered:
+			return self._runs.find(experiment, instance, repetition)
+
+		# Check whether any include scope of the matrix contains the run.
+		for sel in self._matrix_selections():
+			if experiment.info not in sel.experiments:
+				continue
+			if experiment.revision not in self._revisions_for_experiment(sel, experiment.info):
+				continue
+			if experiment.variation not in sel.variations:
+				continue
+			if instance not in sel.instances:
+				continue
+			if repetition not in self._repetitions_for_experiment(sel, experiment.info):
+				continue
+			return Run(self, experiment, instance, repetition)
+		return None
+
+	def find_runs(self, experiment=None, instance=None, instset=None, revision=None,
+			variants=None, axes=None, repetition=None, statuses=None, shard=None):
+		"""
+		Returns all runs that match the given criteria (in canonical order).
+
+		Runs match if they contain all of the given ``variants`` and ``axes``.
+		Lookups use hash indexes, so the cost depends on the number of candidates rather
+		than on the size of the matrix. If ``experiment``, ``instance`` and ``repetition``
+		are given, the runs do not even have to be discovered.
+
+		:param statuses: If given, only runs whose (refreshed) status is contained in
+			``statuses`` are returned.
+		:param shard: If given, only runs of this ``(index, num_shards)``-shard are returned.
+		"""
+
+		if not self._runs_discovered and (experiment is not None and instance is not None
+				and repetition is not None):
+			if not self._experiments_discovered:
+				self._fill_experiments()
+			if self._experiments_by_name is None:
+				self._experiments_by_name = {}
+				for exp in self._experiments.values():
+					self._experiments_by_name.setdefault(exp.name, []).append(exp)
+
+			candidates = []
+			inst = self._insts.get(instance, None)
+			if inst is not None:
+				for exp in self._experiments_by_name.get(experiment, []):
+					run = self._lookup_run(exp, inst, repetition)
+					if run is not None:
+						candidates.append(run)
+		else:
+			indexes = self._ensure_run_indexes()
+			lookups = [(indexes['experiment'], [experiment]), (indexes['instance'], [instance]),
+					(indexes['instset'], [instset]), (indexes['revision'], [revision]),
+					(indexes['variant'], variants or []), (indexes['axis'], axes or []),
+					(indexes['repetition'], [repetition])]
+			candidate_lists = [index.get(key, []) for index, keys in lookups for key in keys
+					if key is not None]
+			if candidate_lists:
+				candidates = [self._runs[pos] for pos in min(candidate_lists, key=len)]
+			else:
+				candidates = list(self._runs.iter_shard(shard))
+
+		def matches(run):
+			exp = run.experiment
+			if experiment is not None and exp.name != experiment:
+				return False
+			if instance is not None and run.instance.shortname != instance:
+				return False
+			if instset is not None and instset not in run.instance.instsets:
+				return False
+			if revision is not None and (exp.revision is None or exp.revision.name != revision):
+				return False
+			if variants is not None:
+				if not set(variants).issubset(variant.name for variant in exp.variation):
+					return False
+			if axes is not None:
+				if not set(axes).issubset(variant.axis for variant in exp.variation):
+					return False
+			if repetition is not None and run.repetition != repetition:
+				return False
+			return True
+
+		shard_of = ShardAssigner(shard)
+		selection = [run for run in candidates
+				if matches(run) and shard_of.selects(run.experiment, run.instance, run.repetition)]
+
+		if statuses is not None:
+			run_statuses = self.refresh_statuses(selection)
+			selection = [run for run, status in zip(selection, run_statuses) if status in statuses]
+		return selection
+
+	# Returns the include scopes of the matrix as boxes, grouped by experiment.
+	# Each box is a tuple of frozensets (revisions, variations, instances, repetitions);
+	# the runs of the box are given by the cartesian product of these sets.
+	def _matrix_boxes(self):
+		boxes = OrderedDict((exp_info, []) for exp_info in self.all_experiment_infos())
+		for sel in self._matrix_selections():
+			variations = frozenset(sel.variations)
+			instances = frozenset(sel.instances)
+			for exp_info in sel.experiments:
+				box = (frozenset(self._revisions_for_experiment(sel, exp_info)), variations, instances,
+						frozenset(self._repetitions_for_experiment(sel, exp_info)))
+				if box not in boxes[exp_info]:
+					boxes[exp_info].append(box)
+		return boxes
+
+	def count_runs(self, experiment=None, instance=None, instset=None, revision=None,
+			variants=None, axes=None, repetition=None, group_by=None):
+		"""
+		Counts the runs that match the given criteria (see :meth:`find_runs`) without expanding the matrix.
+
+		The counts are computed from the include scopes of the matrix. Overlapping scopes
+		are handled by inclusion-exclusion; hence, the cost depends on the number of
+		(overlapping) include scopes but not on the number of runs.
+
+		:param group_by: If ``None``, the total number of runs is returned. Otherwise, one of
+			``'experiment'``, ``'revision'``, ``'variant'``, ``'axis'`` and ``'instset'``;
+			an ordered dict that maps each key to its number of runs is returned.
+			Runs with multiple variants (or instsets) are counted once per key.
+		"""
+
+		def restrict_box(box, rev_pred, var_pred, inst_pred, rep_pred):
+			revs, variations, insts, reps = box
+			return (frozenset(filter(rev_pred, revs)), frozenset(filter(var_pred, variations)),
+					frozenset(filter(inst_pred, insts)), frozenset(filter(rep_pred, reps)))
+
+		def count_union(boxes):
+			# Drop empty boxes and boxes that are contained in other boxes.
+			boxes = [box for box in boxes if all(box)]
+			boxes = [box for i, box in enumerate(boxes)
+					if not any(j != i and all(a <= b for a, b in zip(box, other))
+						and (box != other or j < i) for j, other in enumerate(boxes))]
+
+			# Inclusion-exclusion; supersets of subsets with empty intersections are skipped.
+			total = 0
+			def visit(start, current, sign):
+				nonlocal total
+				for k in range(start, len(boxes)):
+					if current is None:
+						inter = boxes[k]
+					else:
+						inter = tuple(a & b for a, b in zip(current, boxes[k]))
+						if not all(inter):
+							continue
+					size = 1
+					for factor in inter:
+						size *= len(factor)
+					total += sign * size
+					visit(k + 1, inter, -sign)
+			visit(0, None, 1)
+			return total
+
+		def rev_selected(rev):
+			return revision is None or (rev is not None and rev.name == revision)
+
+		def variation_selected(variation):
+			if variants is not None and not set(variants).issubset(v.name for v in variation):
+				return False
+			if axes is not None and not set(axes).issubset(v.axis for v in variation):
+				return False
+			return True
+
+		def inst_selected(inst):
+			if instance is not None and inst.shortname != instance:
+				return False
+			if instset is not None and instset not in inst.instsets:
+				return False
+			return True
+
+		def rep_selected(rep):
+			return repetition is None or rep == repetition
+
+		# The boxes are computed once and shared by all groups.
+		matrix_boxes = self._matrix_boxes()
+
+		def count(exp_pred=lambda exp_info: True, rev_pred=lambda rev: True,
+				var_pred=lambda variation: True, inst_pred=lambda inst: True):
+			total = 0
+			for exp_info, boxes in matrix_boxes.items():
+				if experiment is not None and exp_info.name != experiment:
+					continue
+				if not exp_pred(exp_info):
+					continue
+				total += count_union([restrict_box(box,
+						lambda rev: rev_selected(rev) and rev_pred(rev),
+						lambda variation: variation_selected(variation) and var_pred(variation),
+						lambda inst: inst_selected(inst) and inst_pred(inst),
+						rep_selected) for box in boxes])
+			return total
+
+		if group_by is None:
+			return count()
+
+		if group_by == 'experiment':
+			groups = [(exp_info.name, dict(exp_pred=lambda exp_info, name=exp_info.name: exp_info.name == name))
+					for exp_info in self.all_experiment_infos()]
+		elif group_by == 'revision':
+			groups = [(rev.name, dict(rev_pred=lambda r, rev=rev: r is rev)) for rev in self.all_revisions()]
+			groups.append((None, dict(rev_pred=lambda r: r is None)))
+		elif group_by == 'variant':
+			groups = [(variant.name, dict(var_pred=lambda variation, variant=variant: variant in variation))
+					for variant in self.all_variants()]
+		elif group_by == 'axis':
+			groups = [(axis, dict(var_pred=lambda variation, axis=axis: any(v.axis == axis for v in variation)))
+					for axis in self._axes]
+		elif group_by == 'instset':
+			instsets = sorted({iset for inst in self.all_instances() for iset in inst.instsets if iset is not None})
+			groups = [(iset, dict(inst_pred=lambda inst, iset=iset: iset in inst.instsets)) for iset in instsets]
+		else:
+			raise RuntimeError("Cannot group runs by '{}'".format(group_by))
+
+		return OrderedDict((key, count(**preds)) for key, preds in groups)
+
+	def _successful_runs(self, runs=None, workers=None, verbose=False):
+		# Yields the runs that finished successfully.
+		if runs is None:
+			runs = self.discover_all_runs(stream=True)
+		for run, status in self._stream_statuses(runs, workers=workers):
+			# Only runs that wrote a .status file are finished. Runs whose jobs failed
+			# without writing one (e.g., according to Slurm) count as unfinished.
+			finished = status.is_positive or (status.is_negative
+					and os.access(run.output_file_path('status'), os.F_OK))
+			if not finished:
+				if verbose:
+					print("Skipping unfinished run {}/{}[{}]".format(run.experiment.name,
+																	run.instance.shortname, run.repetition))
+				continue
 
-		yield from self._runs.values()
+			if status.is_negative:
+				if verbose:
+					print("Skipping failed run {}/{}[{}]".format(run.experiment.name,
+																run.instance.shortname, run.repetition))
+				continue
+			yield run
+		self.writeback_status_cache()
 
-	def collect_successful_results(self, parse_fn=None):
+	def collect_successful_results(self, parse_fn=None, workers=None):
 		"""
 		Collects all successful runs and optionally parses their output.
 
 		:param parse_fn: Function to parse the output. Takes two parameters
 			``(run, f)`` where ``run`` is a :class:`simexpal.base.Run` object
 			and ``f`` is a Python file object.
+		:param workers: Number of threads used to determine the statuses of runs
+			(see :meth:`refresh_statuses`).
 		:return: list of parsed outputs if ``parse_fn`` is given,
 			generator of successful :class:`simexpal.base.Run` objects otherwise
 		"""
 
-		def successful_runs(verbose=False):
-			for run in self.discover_all_runs():
-				finished = os.access(run.output_file_path('status'), os.F_OK)
-				if not finished:
-					if verbose:
-						print("Skipping unfinished run {}/{}[{}]".format(run.experiment.name,
-																		run.instance.shortname, run.repetition))
-					continue
-
-				if run.get_status().is_negative:
-					if verbose:
-						print("Skipping failed run {}/{}[{}]".format(run.experiment.name,
-																	run.instance.shortname, run.repetition))
-					continue
-				yield run
-			self.writeback_status_cache()
-
 		if parse_fn:
 			msg = "Calling 'Config.collect_successful_results()' with a parse function is deprecated and will be " \
 					"removed in future versions. Instead, call it without any parameters and it will return a " \
@@ -403,15 +788,383 @@ class Config:
 			warnings.warn(msg, DeprecationWarning)
 
 			res = []
-			for run in successful_runs(verbose=True):
+			for run in self._successful_runs(workers=workers, verbose=True):
 				with open(run.output_file_path('out'), 'r') as f:
 					res.append(parse_fn(run, f))
 			self.writeback_status_cache()
 			return res
 		else:
-			return successful_runs()
+			return self._successful_runs(workers=workers)
+
+	def collect_results(self, parse_fn, runs=None, workers=None, executor='process', cache=True,
+			version=None):
+		"""
+		Parses the output of all successful runs, possibly in parallel.
+
+		Runs are consumed lazily in batches of :data:`RESULT_CACHE_BATCH_SIZE` runs and
+		distributed over the workers in chunks of :data:`RESULT_CHUNK_SIZE` runs.
+		Results are yielded in the order of the runs as soon as they are available;
+		at most a few chunks per worker are in flight at any time.
+
+		For ``executor='process'``, ``parse_fn`` and its results must be picklable
+		(e.g., ``parse_fn`` must be defined at module level). Worker processes re-open
+		the configuration via :func:`config_for_dir`, i.e., it must correspond to the
+		experiments.yml file in :attr:`basedir`.
+
+		Parsed results are cached in the status store. A cached result is reused as long
+		as the output file of the run keeps its modification time and size and the parse
+		function keeps its key (see :func:`get_parser_key`).
+
+		:param parse_fn: Function to parse the output. Takes two parameters
+			``(run, f)`` where ``run`` is a :class:`simexpal.base.Run` object
+			and ``f`` is the opened output file of the run.
+		:param runs: Iterable of runs to consider. Defaults to all runs.
+			Only successful runs are parsed.
+		:param workers: Number of worker processes (or threads). By default, all
+			outputs are parsed by the calling thread.
+		:param executor: Either ``'process'`` or ``'thread'``.
+		:param cache: Whether parsed results are cached. Only results that can be represented
+			as JSON (e.g., dictionaries, lists, strings and numbers) are cached.
+		:param version: Version of ``parse_fn``. Change it to invalidate cached results
+			if ``parse_fn`` depends on code outside of its own body.
+		:return: generator of ``(run, result)``-tuples
+		"""
+
+		if executor not in ['process', 'thread']:
+			raise RuntimeError("Unknown executor '{}'".format(executor))
+
+		successful = self._successful_runs(runs)
+		parser = get_parser_key(parse_fn, version) if cache else None
+
+		pool = None
+		if workers is not None and workers > 1:
+			from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+			pool_class = ProcessPoolExecutor if executor == 'process' else ThreadPoolExecutor
+			pool = pool_class(max_workers=workers)
+
+		new_results = {}
+		try:
+			while True:
+				# Cached results are looked up per batch of runs, such that only the results
+				# of the selected runs are loaded (and never all of them at once).
+				batch = list(itertools.islice(successful, RESULT_CACHE_BATCH_SIZE))
+				if not batch:
+					break
+				cached = {}
+				if parser is not None:
+					cached = self.status_store.get_results(parser,
+							[(run.internal_name, run.instance.shortname) for run in batch])
+
+				# Determine which runs need to be parsed. Output files are stat()ed before they
+				# are parsed, so outputs that change while parsing are re-parsed next time.
+				entries = []
+				misses = []
+				for run in batch:
+					stamp = None
+					if parser is not None:
+						stamp = _stat_output_file(run)
+						cache_entry = cached.get((run.internal_name, run.instance.shortname), None)
+						if stamp is not None and cache_entry is not None and cache_entry[:2] == stamp:
+							entries.append((run, cache_entry[2], None))
+							continue
+					entries.append((run, None, stamp))
+					misses.append(run)
+				cached = None
+
+				parsed = self._parse_outputs(parse_fn, misses, pool, workers)
+				try:
+					for run, data, stamp in entries:
+						if data is not None:
+							yield run, json.loads(data)
+							continue
+
+						_, result = next(parsed)
+						if stamp is not None:
+							data = _encode_result(result)
+							if data is not None:
+								new_results[(run.internal_name, run.instance.shortname)] = stamp + (data,)
+							if len(new_results) >= RESULT_CACHE_BATCH_SIZE:
+								self.status_store.put_results(parser, new_results)
+								new_results = {}
+						yield run, result
+				finally:
+					parsed.close()
+		finally:
+			if pool is not None:
+				pool.shutdown()
+			if new_results:
+				self.status_store.put_results(parser, new_results)
+
+	def results_frame(self, parse_fn=None, runs=None, workers=None, executor='process', cache=True,
+			version=None, resource_usage=False):
+		"""
+		Parses the output of all successful runs into a columnar :class:`simexpal.results.ResultsFrame`.
+
+		The parameters are the same as for :meth:`collect_results`, except that ``parse_fn`` has
+		to return a dictionary that maps metric names to scalars. By default,
+		:func:`simexpal.results.parse_yaml_output` is used.
+
+		:param resource_usage: If true, the :class:`ResourceUsage` of each run is added as metrics
+			(see :func:`simexpal.results.add_resource_usage`).
+		"""
+		from . import results
+
+		if parse_fn is None:
+			parse_fn = results.parse_yaml_output
+
+		frame = results.ResultsFrame()
+		for run, result in self._collect_metrics(parse_fn, runs, workers, executor, cache, version,
+				resource_usage):
+			frame.append(run, result)
+		return frame
+
+	def aggregate(self, parse_fn=None, metrics=None, stats=('mean', 'median', 'ci95'),
+			group_by=('experiment', 'variation', 'revision', 'instance'), runs=None, workers=None,
+			executor='process', cache=True, version=None, resource_usage=False):
+		"""
+		Computes statistics of metrics over the repetitions of runs (or other groups of runs).
+
+		Runs and results are streamed through a :class:`simexpal.results.Aggregator` (see
+		:meth:`collect_results`), i.e., they are never held in memory at once. Means and
+		variances are exact; quantiles (e.g., ``'median'``) are exact for groups of up to
+		:data:`simexpal.results.EXACT_QUANTILE_LIMIT` values and estimated otherwise.
+
+		:param metrics: Names of the metrics to aggregate. By default, all numeric metrics are aggregated.
+		:param stats: Statistics to compute (see :class:`simexpal.results.Aggregator`).
+		:param group_by: Keys that runs are grouped by. By default, repetitions are aggregated.
+
+		The remaining parameters are the same as for :meth:`results_frame`.
+
+		:return: See :meth:`simexpal.results.Aggregator.result`.
+		"""
+		from . import results
+
+		if parse_fn is None:
+			parse_fn = results.parse_yaml_output
+
+		aggregator = results.Aggregator(metrics=metrics, stats=stats, group_by=group_by)
+		for run, result in self._collect_metrics(parse_fn, runs, workers, executor, cache, version,
+				resource_usage):
+			aggregator.add(run, result)
+		return aggregator.result()
+
+	def compare_revisions(self, base, target, metrics, parse_fn=None, runs=None, threshold=0.05,
+			alpha=0.05, higher_is_better=False, workers=None, executor='process', cache=True, version=None,
+			resource_usage=False):
+		"""
+		Compares metrics between the runs of two revisions.
+
+		As results are obtained from :meth:`collect_results`, only the outputs of runs that
+		changed since the last comparison are parsed again.
+
+		:param base: Name of the baseline revision.
+		:param target: Name of the revision that is compared against the baseline.
+		:param metrics: Names of the metrics to compare.
+		:param threshold: Relative slowdown that is reported as a regression.
+		:param alpha: Significance level of the t-tests.
+		:param higher_is_better: Whether higher values of the metrics are better.
+
+		The remaining parameters are the same as for :meth:`results_frame`.
+
+		:return: A list that contains a :class:`simexpal.results.RevisionComparison` per metric.
+		"""
+		from . import results
+
+		if parse_fn is None:
+			parse_fn = results.parse_yaml_output
+		revisions = [self.get_revision(base).name, self.get_revision(target).name]
+
+		if runs is None:
+			runs = self.discover_all_runs()
+		runs = [run for run in runs
+				if run.experiment.revision is not None and run.experiment.revision.name in revisions]
+
+		comparisons = [results.RevisionComparison(base, target, metric, threshold=threshold, alpha=alpha,
+				higher_is_better=higher_is_better) for metric in metrics]
+		for run, result in self._collect_metrics(parse_fn, runs, workers, executor, cache, version,
+				resource_usage):
+			for comparison in comparisons:
+				comparison.add(run, result)
+		return comparisons
+
+	def _collect_metrics(self, parse_fn, runs, workers, executor, cache, version, resource_usage):
+		# Wraps collect_results() and optionally adds the resource usage to the results.
+		from . import results
+
+		for run, result in self.collect_results(parse_fn, runs=runs, workers=workers, executor=executor,
+				cache=cache, version=version):
+			if resource_usage:
+				result = results.add_resource_usage(run, result)
+			yield run, result
+
+	def _parse_outputs(self, parse_fn, runs, pool=None, workers=None):
+		# Yields (run, result)-tuples in the order of the runs (see collect_results()).
+		# If a pool is given, at most 2 * workers chunks are in flight at any time.
+		chunks = [runs[i:i + RESULT_CHUNK_SIZE] for i in range(0, len(runs), RESULT_CHUNK_SIZE)]
+
+		if pool is None:
+			for chunk in chunks:
+				yield from zip(chunk, _parse_run_outputs(parse_fn, chunk))
+			return
+
+		pending = deque()
+		remaining = iter(chunks)
+		for chunk in itertools.islice(remaining, 2 * workers):
+			pending.append((chunk, pool.submit(_parse_run_outputs, parse_fn, chunk)))
+		while pending:
+			chunk, future = pending.popleft()
+			results = future.result()
+			for next_chunk in itertools.islice(remaining, 1):
+				pending.append((next_chunk, pool.submit(_parse_run_outputs, parse_fn, next_chunk)))
+			yield from zip(chunk, results)
+
+	def refresh_statuses(self, runs, workers=None):
+		"""
+		Determines the statuses of many runs at once.
+
+		Instead of probing the files of each run individually, the output and aux
+		subdirectories of each experiment are scanned once. Only ``.status`` files
+		whose modification time differs from the status cache are opened.
+
+		:param runs: Iterable of :class:`simexpal.base.Run` objects.
+		:param workers: Number of threads that perform file system accesses concurrently.
+			This pays off on networked file systems where each access has a high latency.
+			By default, all accesses are done by the calling thread.
+		:return: List of :class:`simexpal.base.Status` objects (in the order of ``runs``)
+		"""
+
+		return self._refresh_statuses(list(runs), workers, {})
+
+	def _stream_statuses(self, runs, workers=None):
+		# Yields (run, status)-tuples like refresh_statuses() but processes the runs in batches,
+		# such that they are never held in memory at once. Directories are only scanned once.
+		runs = iter(runs)
+		listings = {}
+		while True:
+			batch = list(itertools.islice(runs, RESULT_CACHE_BATCH_SIZE))
+			if not batch:
+				return
+			yield from zip(batch, self._refresh_statuses(batch, workers, listings))
+
+	def _refresh_statuses(self, runs, workers, listings):
+		# Helper for refresh_statuses(). listings maps output subdirectories to the
+		# (output, aux)-pairs of DirectoryListings that were already scanned.
+
+		# Worker threads only read from the status cache. Make sure that it is loaded upfront.
+		self.status_store.preload()
+
+		subdirs = OrderedDict()
+		for run in runs:
+			if run.experiment.output_subdir not in listings:
+				subdirs.setdefault(run.experiment.output_subdir, run.experiment.aux_subdir)
+
+		def scan(subdir_pair):
+			return (util.DirectoryListing(subdir_pair[0]), util.DirectoryListing(subdir_pair[1]))
+
+		def observe(chunk):
+			observations = []
+			for run in chunk:
+				output_listing, aux_listing = listings[run.experiment.output_subdir]
+				source, last_mod = run._find_status_source(output_listing.get_mtime, aux_listing.get_mtime)
+				status = run._get_cached_status(source, last_mod)
+				if status is not None:
+					observations.append(status)
+				else:
+					observations.append(run._read_status(source, last_mod))
+			return observations
+
+		chunks = [runs[i:i + STATUS_REFRESH_CHUNK_SIZE] for i in range(0, len(runs), STATUS_REFRESH_CHUNK_SIZE)]
+		if workers is not None and workers > 1:
+			from concurrent.futures import ThreadPoolExecutor
+
+			with ThreadPoolExecutor(max_workers=workers) as executor:
+				listings.update(zip(subdirs.keys(), executor.map(scan, subdirs.items())))
+				observations = list(executor.map(observe, chunks))
+		else:
+			listings.update(zip(subdirs.keys(), map(scan, subdirs.items())))
+			observations = list(map(observe, chunks))
+
+		# Merge the observations in the order of the input. Only this thread
+		# queries launchers and modifies the status cache.
+		slurm_jobids = [observation[2] for chunk_observations in observations
+				for observation in chunk_observations
+				if not isinstance(observation, Status) and observation[2] is not None]
+		if slurm_jobids:
+			# Query all Slurm jobs at once.
+			self.query_slurm(slurm_jobids)
+
+		statuses = []
+		for chunk, chunk_observations in zip(chunks, observations):
+			for run, observation in zip(chunk, chunk_observations):
+				if isinstance(observation, Status):
+					statuses.append(observation)
+				else:
+					statuses.append(run._record_status(*observation))
+		return statuses
 
-	def export_experiments(self, included_statuses=None):
+	def status_summary(self, runs=None, group_by=('experiment', 'variation', 'revision', 'instset'),
+			workers=None):
+		"""
+		Counts the statuses of runs per group.
+
+		The statuses are determined by :meth:`refresh_statuses`; afterwards, they are
+		counted in a single pass. Group keys are computed once per (experiment, instance) pair.
+
+		:param runs: Iterable of :class:`simexpal.base.Run` objects. Defaults to all runs.
+		:param group_by: Tuple of ``'experiment'``, ``'variation'`` (a tuple of variant names),
+			``'revision'``, ``'instance'`` and ``'instset'``. Runs that belong to multiple
+			instance sets are counted once per instance set.
+		:param workers: See :meth:`refresh_statuses`.
+		:return: Ordered dict that maps key tuples (in the order of ``group_by``) to lists of counts
+			indexed by :class:`simexpal.base.Status`. Keys appear in the order of the runs.
+		"""
+
+		exp_fields = {
+			'experiment': lambda exp: [exp.name],
+			'variation': lambda exp: [tuple(variant.name for variant in exp.variation)],
+			'revision': lambda exp: [exp.revision.name if exp.revision is not None else None]
+		}
+		inst_fields = {
+			'instance': lambda inst: [inst.shortname],
+			'instset': lambda inst: sorted(inst.instsets, key=lambda name: (name is not None, name))
+		}
+		for field in group_by:
+			if field not in exp_fields and field not in inst_fields:
+				raise RuntimeError("Cannot group statuses by '{}'".format(field))
+
+		if runs is None:
+			runs = self.discover_all_runs()
+		runs = list(runs)
+		statuses = self.refresh_statuses(runs, workers=workers)
+
+		keys_cache = {}
+		def get_keys(experiment, instance):
+			factors = []
+			for field in group_by:
+				if field in exp_fields:
+					factors.append(exp_fields[field](experiment))
+				else:
+					factors.append(inst_fields[field](instance))
+			return list(itertools.product(*factors))
+
+		summary = OrderedDict()
+		num_statuses = len(Status)
+		for run, status in zip(runs, statuses):
+			pair = (id(run.experiment), id(run.instance))
+			keys = keys_cache.get(pair, None)
+			if keys is None:
+				keys = get_keys(run.experiment, run.instance)
+				keys_cache[pair] = keys
+			for key in keys:
+				counts = summary.get(key, None)
+				if counts is None:
+					counts = [0] * num_statuses
+					summary[key] = counts
+				counts[status] += 1
+		return summary
+
+	def export_experiments(self, included_statuses=None, workers=None):
 		"""
 		Exports experiments based on their status.
 
@@ -425,14 +1178,16 @@ class Config:
 			5 - timeout,
 			6 - killed,
 			7 - failed.
+		:param workers: Number of threads used to determine the statuses of runs
+			(see :meth:`refresh_statuses`).
 
 		:return: List of (``exp_name``, ``variation-tuple``, ``inst_shortname``, ``status``)-tuples
 		"""
 		experiment_list = []
 
 		if included_statuses is not None:
-			for run in self.discover_all_runs():
-				status = run.get_status()
+			runs = list(self.discover_all_runs())
+			for run, status in zip(runs, self.refresh_statuses(runs, workers=workers)):
 				if status in included_statuses:
 					experiment_list.append((
 						run.experiment.name,
@@ -449,34 +1204,112 @@ class Config:
 	def export_failed_experiments(self):
 		return self.export_experiments([s for s in Status if s.is_negative])
 
-	def query_slurm(self):
-		if not self.slurm_queried:
-			# -h omits the header line.
-			# -r outputs one job array element per line.
-			output = subprocess.check_output(['squeue', '-h', '-r'])
-			output = output.decode().splitlines()
-
-			self.slurm_queried = True
-
-			if len(output) > 0:
-				output = [entry.split() for entry in output]
-				for entry in output:
-					entry_jobid = entry[0]
-					entry_state = entry[4]
-					if entry_state == 'PD':
-						status = Status.SUBMITTED
-					elif entry_state in ['R', 'CG']:
-						status = Status.STARTED
-					else:
-						status = Status.BROKEN
+	def query_slurm(self, jobids=None):
+		"""
+		Determines the states of Slurm jobs.
+
+		Only jobs of the current user that are neither cached in the status store nor
+		already known to this :class:`Config` are queried. Jobs that are listed by squeue
+		are cached for :data:`SLURM_STATUS_TTL` seconds; the states of jobs that left
+		the queue are taken from a single sacct call. Terminal states (e.g., completed
+		or cancelled jobs) cannot change anymore and are cached indefinitely; runs that
+		are launched again receive new job IDs.
+
+		:param jobids: IDs of the jobs to query. By default, the jobs of all runs of this
+			configuration that were submitted through Slurm and did not finish are queried.
+		"""
 
-					self.slurm_queried_jobs[entry_jobid] = status
+		if jobids is None:
+			jobids = self._pending_slurm_jobids()
+
+		now = time.time()
+		jobids = self._load_cached_slurm_jobs(jobids, now)
+		if not jobids:
+			return
+
+		entries = {}
+		for jobid, state in slurmquery.query_squeue(jobids).items():
+			if jobid not in jobids:
+				continue
+			entries[jobid] = (SLURM_STATES.get(state, Status.BROKEN), None, now + SLURM_STATUS_TTL)
+
+		missing = jobids.difference(entries)
+		if missing:
+			for jobid, (state, elapsed) in slurmquery.query_sacct(missing).items():
+				status = SLURM_STATES.get(state, Status.BROKEN)
+				expires = None if status.is_negative else now + SLURM_STATUS_TTL
+				entries[jobid] = (status, elapsed, expires)
+
+			# Jobs that are neither queued nor known to sacct (e.g., if accounting is disabled)
+			# are considered to be failed. Retry them after the TTL expires.
+			for jobid in missing.difference(entries):
+				entries[jobid] = (Status.FAILED, None, now + SLURM_STATUS_TTL)
+
+		for jobid, (status, elapsed, expires) in entries.items():
+			self.slurm_queried_jobs[jobid] = status
+			self.slurm_job_elapsed[jobid] = elapsed
+			self._slurm_job_expires[jobid] = expires
+		self.status_store.put_slurm_jobs(entries)
+		self.slurm_queried = True
+
+	def _load_cached_slurm_jobs(self, jobids, now):
+		# Takes the states of the given jobs from the status store.
+		# Returns the set of jobs whose states are still unknown.
+		jobids = set(jobid for jobid in jobids if not self._is_slurm_job_known(jobid, now))
+		if not jobids:
+			return jobids
+
+		for jobid, (status, elapsed, expires) in self.status_store.get_slurm_jobs(jobids).items():
+			if expires is not None and expires < now:
+				continue
+			self.slurm_queried_jobs[jobid] = Status(status)
+			self.slurm_job_elapsed[jobid] = elapsed
+			self._slurm_job_expires[jobid] = expires
+			jobids.discard(jobid)
+		return jobids
+
+	def _pending_slurm_jobids(self):
+		# Returns the Slurm job IDs of all runs that were submitted (or started) but did not finish.
+		# Each output directory is only scanned once.
+		listings = {}
+		jobids = []
+		for run in self.discover_all_runs(stream=True):
+			output_subdir = run.experiment.output_subdir
+			if output_subdir not in listings:
+				listings[output_subdir] = (util.DirectoryListing(output_subdir),
+						util.DirectoryListing(run.experiment.aux_subdir))
+			output_listing, aux_listing = listings[output_subdir]
+			source, _ = run._find_status_source(output_listing.get_mtime, aux_listing.get_mtime)
+			if source not in ['out', 'run']:
+				continue
+			info = run.get_submission_info()
+			if info is not None and info.slurm_jobid is not None:
+				jobids.append(info.slurm_jobid)
+		return jobids
+
+	def _is_slurm_job_known(self, jobid, now):
+		if jobid not in self.slurm_queried_jobs:
+			return False
+		expires = self._slurm_job_expires[jobid]
+		return expires is None or expires >= now
+
+	def _resolve_slurm_job(self, jobid):
+		if not self._load_cached_slurm_jobs([jobid], time.time()):
+			return
+		# Resolve the jobs of all pending runs at once. Otherwise, callers that loop
+		# over Run.get_status() would invoke squeue and sacct once per run.
+		self.query_slurm(itertools.chain([jobid], self._pending_slurm_jobids()))
 
 	def get_slurm_job_status(self, jobid):
-		# Returns 'failed' for jobs not listed in self.slurm_queried_jobs.
-		# This only holds for jobs that would receive the status
+		# This is only called for jobs that would receive the status
 		# 'submitted' or 'started' in Run._update_status_cache_dict().
-		return self.slurm_queried_jobs.get(jobid, Status.FAILED)
+		self._resolve_slurm_job(jobid)
+		return self.slurm_queried_jobs[jobid]
+
+	def get_slurm_job_elapsed(self, jobid):
+		"""Returns the wall time (in seconds) of a Slurm job that left the queue or ``None``."""
+		self._resolve_slurm_job(jobid)
+		return self.slurm_job_elapsed.get(jobid, None)
 
 	def query_queue(self):
 		if not self.queue_queried:
@@ -503,46 +1336,51 @@ class Config:
 		return Status(self.queue_queried_jobs.get(jobid, Status.FAILED))
 
 	def writeback_status_cache(self):
-		with open(os.path.join(self.basedir, util.SIMEX_CACHE), 'r') as cachefile:
-			cache = json.load(cachefile)
-		cache["status"] = self.status_cache_dict
-		with open(os.path.join(self.basedir, util.SIMEX_CACHE), 'w') as cachefile:
-			json.dump(cache, cachefile)
+		self.status_store.flush()
 
 	# -----------------------------------------------------------------------------------
 	# Matrix expansion.
 	# -----------------------------------------------------------------------------------
 
-	# Main function to expand information from the matrix.
-	# Calls the 'extract' function on all scopes of the matrix and returns the union
-	# of all iterables that were produced by 'extract'.
-	# Sorts (and deduplicates) the output according to the key.
-	def _expand_matrix(self, extract, key=None):
-		if key is None:
-			key = lambda ent: ent
+	def _expand_matrix(self, extract):
+		"""
+		Expands the matrix into a stream of entries in canonical order.
+
+		``extract(sel)`` must yield ``(key, entry)`` pairs in ascending order of their keys.
+		The streams of all include scopes are merged and deduplicated lazily; only one
+		pending entry per include scope is kept in memory.
+		"""
 
-		def extract_included(parent, yml):
+		selections = self._matrix_selections()
+
+		# Perform a k-way merge of the (sorted) streams and drop duplicates.
+		merged = heapq.merge(*[extract(sel) for sel in selections], key=operator.itemgetter(0))
+		prev_key = None
+		for key, entry in merged:
+			if key == prev_key:
+				continue
+			prev_key = key
+			yield entry
+
+	# Returns the selections of all (innermost) include scopes of the matrix.
+	def _matrix_selections(self):
+		if self._selections is not None:
+			return self._selections
+
+		def included_selections(parent, yml):
 			scope = self._restrict_scope(parent, yml)
 
 			if 'include' in yml:
 				for incl_yml in yml['include']:
-					yield from extract_included(scope, incl_yml)
-			else:
-				sel = self._get_selection_from_scope(scope)
-				yield from extract(sel)
-
-		def generate_unordered_expansion():
-			scope = MatrixScope()
-
-			if 'matrix' in self.yml:
-				yield from extract_included(scope, self.yml['matrix'])
+					yield from included_selections(scope, incl_yml)
 			else:
-				sel = self._get_selection_from_scope(scope)
-				yield from extract(sel)
+				yield self._get_selection_from_scope(scope)
 
-		# Perform sorting and deduplication according to the key.
-		ordered = sorted(generate_unordered_expansion(), key=key)
-		return (next(grp) for _, grp in itertools.groupby(ordered, key=key))
+		if 'matrix' in self.yml:
+			self._selections = list(included_selections(MatrixScope(), self.yml['matrix']))
+		else:
+			self._selections = [self._get_selection_from_scope(MatrixScope())]
+		return self._selections
 
 	def _restrict_scope(self, parent, yml):
 		def restrict_set(broad, narrow):
@@ -568,6 +1406,7 @@ class Config:
 		return scope
 
 	# Finds all experiments, revisions, etc. that are selected by a given scope.
+	# All lists are sorted in canonical order, such that the nested product is sorted as well.
 	def _get_selection_from_scope(self, scope):
 		sel = MatrixSelection()
 		sel.experiments = self._get_selected_experiments(scope)
@@ -581,22 +1420,23 @@ class Config:
 	# Determine all experiments selected by a scope.
 	def _get_selected_experiments(self, scope):
 		if scope.experiments is not None:
-			return [self.get_experiment_info(experiment) for experiment in scope.experiments]
+			return [self.get_experiment_info(experiment) for experiment in sorted(scope.experiments)]
 		else:
-			return list(self.all_experiment_infos())
+			return sorted(self.all_experiment_infos(), key=lambda exp_info: exp_info.name)
 
 	# Determine all revisions selected by a scope.
 	def _get_selected_revisions(self, scope):
 		if scope.revisions is not None:
-			return [self.get_revision(revision) for revision in scope.revisions]
+			return [self.get_revision(revision) for revision in sorted(scope.revisions)]
 		return None
 
 	# Determine all instances selected by a scope.
 	def _get_selected_instances(self, scope):
 		if scope.instsets is not None:
-			return [inst for inst in self.all_instances() if not scope.instsets.isdisjoint(inst.instsets)]
+			instances = [inst for inst in self.all_instances() if not scope.instsets.isdisjoint(inst.instsets)]
 		else:
-			return list(self.all_instances())
+			instances = list(self.all_instances())
+		return sorted(instances, key=lambda inst: inst.shortname)
 
 	# Determine the number of repetitions selected by a scope.
 	def _get_selected_repetitions(self, scope):
@@ -644,7 +1484,8 @@ class Config:
 			variant_list = sorted(variant_filter)
 			return tuple([self.get_variant(variant) for variant in variant_list])
 
-		return [make_variation(prod) for prod in itertools.product(*variation_bundle)]
+		return sorted((make_variation(prod) for prod in itertools.product(*variation_bundle)),
+				key=variation_key)
 
 class Instance:
 	"""Represents a single instance"""
@@ -1013,24 +1854,19 @@ class Build:
 		return os.path.join(self._cfg.basedir, 'develop', self.name + rev)
 
 	def is_checked_out(self, buildname):
-		with open(os.path.join(self._cfg.basedir, util.SIMEX_CACHE), 'r') as cachefile:
-			return json.load(cachefile)[buildname][util.CHECKOUT]
+		return self._cfg.status_store.get_build_phases(buildname)[util.CHECKOUT]
 
 	def is_regenerated(self, buildname):
-		with open(os.path.join(self._cfg.basedir, util.SIMEX_CACHE), 'r') as cachefile:
-			return json.load(cachefile)[buildname][util.REGENERATED]
-			
+		return self._cfg.status_store.get_build_phases(buildname)[util.REGENERATED]
+
 	def is_configured(self, buildname):
-		with open(os.path.join(self._cfg.basedir, util.SIMEX_CACHE), 'r') as cachefile:
-			return json.load(cachefile)[buildname][util.CONFIGURED]
+		return self._cfg.status_store.get_build_phases(buildname)[util.CONFIGURED]
 
 	def is_compiled(self, buildname):
-		with open(os.path.join(self._cfg.basedir, util.SIMEX_CACHE), 'r') as cachefile:
-			return json.load(cachefile)[buildname][util.COMPILED]
+		return self._cfg.status_store.get_build_phases(buildname)[util.COMPILED]
 
 	def is_installed(self, buildname):
-		with open(os.path.join(self._cfg.basedir, util.SIMEX_CACHE), 'r') as cachefile:
-			return json.load(cachefile)[buildname][util.INSTALLED]
+		return self._cfg.status_store.get_build_phases(buildname)[util.INSTALLED]
 
 	def purge(self, delete_source=False):
 		if not self.revision.is_dev_build:
@@ -1090,6 +1926,10 @@ class Variant:
 	def launcher(self):
 		return self.variant_yml.get('launcher', None)
 
+	@property
+	def affinity(self):
+		return self.variant_yml.get('affinity', None)
+
 	@property
 	def environ(self):
 		return self.variant_yml.get('environ', {})
@@ -1152,6 +1992,10 @@ class ExperimentInfo:
 	def stdout(self):
 		return self._exp_yml.get('stdout', None)
 
+	@property
+	def output_capture(self):
+		return self._exp_yml.get('output_capture', 'lazy')
+
 	@property
 	def workdir(self):
 		return self._exp_yml.get('workdir', None)
@@ -1172,6 +2016,10 @@ class ExperimentInfo:
 	def launcher(self):
 		return self._exp_yml.get('launcher', None)
 
+	@property
+	def affinity(self):
+		return self._exp_yml.get('affinity', None)
+
 class Experiment:
 	"""
 	Represents an experiment (see below).
@@ -1189,21 +2037,41 @@ class Experiment:
 		self.revision = revision
 		self.variation = variation
 
+		# Names and paths are shared by all runs of the experiment; compute them lazily once.
+		self._internal_name = None
+		self._aux_subdir = None
+		self._output_subdir = None
+
 	@property
 	def name(self):
 		return self.info.name
 
+	@property
+	def internal_name(self):
+		if self._internal_name is None:
+			internal_name = self.name
+			if self.variation:
+				internal_name += '~' + ','.join([variant.name for variant in self.variation])
+			if self.revision:
+				internal_name += '@' + self.revision.name
+			self._internal_name = sys.intern(internal_name)
+		return self._internal_name
+
 	@property
 	def aux_subdir(self):
-		return get_aux_subdir(self._cfg.basedir, self.name,
-				[variant.name for variant in self.variation],
-				self.revision.name if self.revision else None)
+		if self._aux_subdir is None:
+			self._aux_subdir = get_aux_subdir(self._cfg.basedir, self.name,
+					[variant.name for variant in self.variation],
+					self.revision.name if self.revision else None)
+		return self._aux_subdir
 
 	@property
 	def output_subdir(self):
-		return get_output_subdir(self._cfg.basedir, self.name,
-				[variant.name for variant in self.variation],
-				self.revision.name if self.revision else None)
+		if self._output_subdir is None:
+			self._output_subdir = get_output_subdir(self._cfg.basedir, self.name,
+					[variant.name for variant in self.variation],
+					self.revision.name if self.revision else None)
+		return self._output_subdir
 
 	@property
 	def effective_process_settings(self):
@@ -1286,6 +2154,22 @@ class Experiment:
 			return s.launcher
 		return self.info.launcher
 
+	@property
+	def effective_affinity(self):
+		s = None
+		for variant in self.variation:
+			if variant.affinity is None:
+				continue
+			if s:
+				raise RuntimeError("CPU affinity for experiment '{}' overridden by multiple variants: {}".format(
+					self.name, [s.name, variant.name]
+				))
+			s = variant
+
+		if s is not None:
+			return s.affinity
+		return self.info.affinity
+
 class Status(IntEnum):
 	NOT_SUBMITTED = 0
 	IN_SUBMISSION = 1
@@ -1329,49 +2213,312 @@ class Status(IntEnum):
 	def is_negative(self):
 		return self.value in [Status.TIMEOUT, Status.KILLED, Status.FAILED, Status.BROKEN]
 
+# Maps Slurm job states to the status of the run. Jobs are only queried if the run did
+# not write its .status file yet, so jobs that completed without it are considered failed.
+SLURM_STATES = {
+	'PENDING': Status.SUBMITTED,
+	'CONFIGURING': Status.SUBMITTED,
+	'REQUEUED': Status.SUBMITTED,
+	'REQUEUE_FED': Status.SUBMITTED,
+	'REQUEUE_HOLD': Status.SUBMITTED,
+	'RESV_DEL_HOLD': Status.SUBMITTED,
+	'RUNNING': Status.STARTED,
+	'COMPLETING': Status.STARTED,
+	'RESIZING': Status.STARTED,
+	'SIGNALING': Status.STARTED,
+	'STAGE_OUT': Status.STARTED,
+	'STOPPED': Status.STARTED,
+	'SUSPENDED': Status.STARTED,
+	'TIMEOUT': Status.TIMEOUT,
+	'DEADLINE': Status.TIMEOUT,
+	'CANCELLED': Status.KILLED,
+	'PREEMPTED': Status.KILLED,
+	'COMPLETED': Status.FAILED,
+	'FAILED': Status.FAILED,
+	'BOOT_FAIL': Status.FAILED,
+	'NODE_FAIL': Status.FAILED,
+	'OUT_OF_MEMORY': Status.FAILED
+}
+
+class SubmissionInfo:
+	"""Metadata about the submission of a run (as stored in its .run file)."""
+
+	__slots__ = ['launcher', 'job_id', 'submit_host', 'submit_time']
+
+	def __init__(self, launcher=None, job_id=None, submit_host=None, submit_time=None):
+		self.launcher = launcher
+		self.job_id = job_id
+		self.submit_host = submit_host
+		self.submit_time = submit_time
+
+	@classmethod
+	def from_yml(cls, yml):
+		if yml is None:
+			# .run files of old versions of simexpal were completely empty.
+			return cls()
+
+		launcher = yml.get('launcher', None)
+		job_id = yml.get('job_id', None)
+		if launcher is None:
+			# .run files of old versions of simexpal only store the job id.
+			if yml.get('slurm_jobid', None) is not None:
+				launcher, job_id = 'slurm', yml['slurm_jobid']
+			elif yml.get('queue_jobid', None) is not None:
+				launcher, job_id = 'queue', yml['queue_jobid']
+		return cls(launcher, job_id, yml.get('submit_host', None), yml.get('submit_time', None))
+
+	def to_yml(self):
+		yml = {
+			'launcher': self.launcher,
+			'job_id': self.job_id,
+			'submit_host': self.submit_host,
+			'submit_time': self.submit_time
+		}
+		# Keep the keys of old versions of simexpal, such that they can still query the job.
+		if self.slurm_jobid is not None:
+			yml['slurm_jobid'] = self.slurm_jobid
+		if self.queue_jobid is not None:
+			yml['queue_jobid'] = self.queue_jobid
+		return yml
+
+	@property
+	def slurm_jobid(self):
+		return self.job_id if self.launcher == 'slurm' else None
+
+	@property
+	def queue_jobid(self):
+		return self.job_id if self.launcher == 'queue' else None
+
+class ResourceUsage:
+	"""
+	Resource usage of a run (as stored in its .status file).
+
+	``utime`` and ``stime`` are the user and system CPU times in seconds, ``maxrss`` is the
+	peak resident set size in KiB, ``majflt`` and ``minflt`` count major and minor page faults
+	and ``nvcsw`` and ``nivcsw`` count voluntary and involuntary context switches. Fields are
+	``None`` if they were not recorded (e.g., by old versions of simexpal).
+	"""
+
+	__slots__ = ['walltime'] + RUSAGE_FIELDS
+
+	def __init__(self, walltime=None, **kwargs):
+		self.walltime = walltime
+		for field in RUSAGE_FIELDS:
+			setattr(self, field, kwargs.pop(field, None))
+		if kwargs:
+			raise TypeError("Unexpected resource usage fields: {}".format(', '.join(kwargs)))
+
+	@classmethod
+	def from_yml(cls, yml):
+		return cls(yml.get('walltime', None), **{field: yml.get(field, None) for field in RUSAGE_FIELDS})
+
+	def to_yml(self):
+		return {field: getattr(self, field) for field in self.__slots__}
+
+	@property
+	def cpu_time(self):
+		if self.utime is None or self.stime is None:
+			return None
+		return self.utime + self.stime
+
+class ShardAssigner:
+	"""
+	Decides whether runs belong to a given ``(index, num_shards)``-shard.
+
+	This computes the same assignment as :func:`get_run_shard`, but the checksums of
+	experiment names are computed incrementally and cached, so no strings need to be
+	formatted per run.
+	"""
+
+	def __init__(self, shard):
+		self.shard = shard
+		self._exp_crcs = {}
+		self._inst_bytes = {}
+
+	def selects(self, experiment, instance, repetition):
+		if self.shard is None:
+			return True
+		index, num_shards = self.shard
+
+		crc = self._exp_crcs.get(experiment, None)
+		if crc is None:
+			crc = zlib.crc32(experiment.internal_name.encode())
+			self._exp_crcs[experiment] = crc
+		inst_bytes = self._inst_bytes.get(instance, None)
+		if inst_bytes is None:
+			inst_bytes = '/{}'.format(instance.shortname).encode()
+			self._inst_bytes[instance] = inst_bytes
+
+		if repetition:
+			crc = zlib.crc32('[{}]'.format(repetition).encode(), crc)
+		return zlib.crc32(inst_bytes, crc) % num_shards == index
+
+class RunTable:
+	"""
+	Compact table of the runs of a configuration (in canonical order).
+
+	Runs are stored as parallel integer arrays of experiment indices, instance indices
+	and repetitions. :class:`Run` objects are only created as lightweight views when
+	runs are accessed.
+	"""
+
+	def __init__(self, cfg, experiments, instances):
+		# Both lists must be in canonical order, such that the rows of the table are sorted.
+		self._cfg = cfg
+		self.experiments = experiments
+		self.instances = instances
+		self._exp_ids = {experiment: i for i, experiment in enumerate(experiments)}
+		self._inst_ids = {instance: i for i, instance in enumerate(instances)}
+		self._exp_col = array.array('l')
+		self._inst_col = array.array('l')
+		self._rep_col = array.array('l')
+
+	def __len__(self):
+		return len(self._rep_col)
+
+	def __getitem__(self, pos):
+		return Run(self._cfg, self.experiments[self._exp_col[pos]],
+				self.instances[self._inst_col[pos]], self._rep_col[pos])
+
+	def __iter__(self):
+		cfg = self._cfg
+		experiments = self.experiments
+		instances = self.instances
+		for exp_id, inst_id, rep in self.iter_ids():
+			yield Run(cfg, experiments[exp_id], instances[inst_id], rep)
+
+	def iter_ids(self):
+		return zip(self._exp_col, self._inst_col, self._rep_col)
+
+	def iter_shard(self, shard):
+		"""Yields the runs of the given ``(index, num_shards)``-shard (or all runs if ``shard`` is ``None``)."""
+		if shard is None:
+			yield from self
+			return
+
+		cfg = self._cfg
+		experiments = self.experiments
+		instances = self.instances
+		shard_of = ShardAssigner(shard)
+		for exp_id, inst_id, rep in self.iter_ids():
+			experiment = experiments[exp_id]
+			instance = instances[inst_id]
+			if shard_of.selects(experiment, instance, rep):
+				yield Run(cfg, experiment, instance, rep)
+
+	def append(self, experiment, instance, repetition):
+		self._exp_col.append(self._exp_ids[experiment])
+		self._inst_col.append(self._inst_ids[instance])
+		self._rep_col.append(repetition)
+
+	def columns(self):
+		return (self._exp_col, self._inst_col, self._rep_col)
+
+	def load_columns(self, exp_col, inst_col, rep_col):
+		exp_col = array.array('l', exp_col)
+		inst_col = array.array('l', inst_col)
+		rep_col = array.array('l', rep_col)
+		if not len(exp_col) == len(inst_col) == len(rep_col):
+			raise ValueError('Columns of the run table differ in length')
+		for col, bound in [(exp_col, len(self.experiments)), (inst_col, len(self.instances))]:
+			if col and (min(col) < 0 or max(col) >= bound):
+				raise ValueError('Columns of the run table are out of range')
+		self._exp_col = exp_col
+		self._inst_col = inst_col
+		self._rep_col = rep_col
+
+	def find(self, experiment, instance, repetition):
+		"""Returns the run with the given key or ``None``."""
+		exp_id = self._exp_ids.get(experiment, None)
+		inst_id = self._inst_ids.get(instance, None)
+		if exp_id is None or inst_id is None:
+			return None
+
+		# Binary search; the rows are sorted lexicographically.
+		key = (exp_id, inst_id, repetition)
+		lo, hi = 0, len(self._rep_col)
+		while lo < hi:
+			mid = (lo + hi) // 2
+			if (self._exp_col[mid], self._inst_col[mid], self._rep_col[mid]) < key:
+				lo = mid + 1
+			else:
+				hi = mid
+		if lo < len(self._rep_col) and (self._exp_col[lo], self._inst_col[lo], self._rep_col[lo]) == key:
+			return self[lo]
+		return None
+
 class Run:
+	__slots__ = ['_cfg', 'experiment', 'instance', 'repetition']
+
 	def __init__(self, cfg, experiment, instance, repetition):
 		self._cfg = cfg
 		self.experiment = experiment
 		self.instance = instance
 		self.repetition = repetition
 
+	def __eq__(self, other):
+		if not isinstance(other, Run):
+			return NotImplemented
+		return (self.experiment is other.experiment and self.instance is other.instance
+				and self.repetition == other.repetition)
+
+	def __hash__(self):
+		return hash((id(self.experiment), id(self.instance), self.repetition))
+
+	def __reduce__(self):
+		# Runs are pickled by their identity. The configuration is re-opened on unpickling
+		# (see _restore_run()), which is cheap due to the configuration snapshot.
+		exp = self.experiment
+		return (_restore_run, (self._cfg.basedir, exp.name,
+				exp.revision.name if exp.revision is not None else None,
+				tuple(variant.name for variant in exp.variation),
+				self.instance.shortname, self.repetition))
+
 	@property
 	def config(self):
 		return self._cfg
 
 	@property
 	def internal_name(self):
-		internal_name = self.experiment.name
-		if self.experiment.variation:
-			internal_name += '~' + ','.join([variant.name for variant in self.experiment.variation])
-		if self.experiment.revision:
-			internal_name += '@' + self.experiment.revision.name
 		if self.repetition:
-			internal_name += '[{}]'.format(self.repetition)
-		return internal_name
+			return self.experiment.internal_name + '[{}]'.format(self.repetition)
+		return self.experiment.internal_name
 
-	@property
-	def slurm_jobid(self):
+	def get_submission_info(self):
+		"""
+		Returns the :class:`SubmissionInfo` from the run's .run file (or ``None`` if the run was not submitted).
+
+		The parsed file is memorized by the configuration until its modification time changes.
+		"""
+		path = self.aux_file_path('run')
+		memo = self._cfg._submission_infos
 		try:
-			with open(self.aux_file_path('run'), 'r') as f:
-				data = yaml.load(f, Loader=YmlLoader)
-				if data is None:
-					# .run files before adding this property were completely empty
-					return None
-			return data.get('slurm_jobid', None)
+			st = os.stat(path)
 		except FileNotFoundError:
+			memo.pop(path, None)
 			return None
 
-	def get_queue_jobid(self):
+		entry = memo.get(path, None)
+		if entry is not None and entry[0] == (st.st_mtime_ns, st.st_size):
+			return entry[1]
+
 		try:
-			with open(self.aux_file_path('run'), 'r') as f:
-				data = yaml.load(f, Loader=YmlLoader)
-				if data is None:
-					return None
-			return data.get('queue_jobid', None)
+			with open(path, 'r') as f:
+				info = SubmissionInfo.from_yml(yaml.load(f, Loader=YmlLoader))
+				st = os.fstat(f.fileno())
 		except FileNotFoundError:
 			return None
+		memo[path] = ((st.st_mtime_ns, st.st_size), info)
+		return info
+
+	@property
+	def slurm_jobid(self):
+		info = self.get_submission_info()
+		return info.slurm_jobid if info is not None else None
+
+	def get_queue_jobid(self):
+		info = self.get_submission_info()
+		return info.queue_jobid if info is not None else None
 
 	# Contains auxiliary files that SHOULD NOT be necessary to determine the result of the run.
 	def aux_file_path(self, ext):
@@ -1384,14 +2531,53 @@ class Run:
 		return os.path.join(self.experiment.output_subdir,
 				get_output_file_name(ext, self.instance.shortname, self.repetition))
 
-	def _update_status_cache_dict(self):
+	def _find_status_source(self, output_mtime, aux_mtime):
+		# Returns the (source, last_mod)-pair of the file that determines the status of the run.
+		# output_mtime and aux_mtime map file names within the output and aux subdirectory
+		# to their modification times (or None if the file does not exist).
+		for source, subdir in STATUS_SOURCES:
+			if subdir == 'output':
+				last_mod = output_mtime(get_output_file_name(source, self.instance.shortname, self.repetition))
+			else:
+				last_mod = aux_mtime(get_aux_file_name(source, self.instance.shortname, self.repetition))
+			if last_mod is not None:
+				return source, last_mod
+		return None, None
+
+	def _get_cached_status(self, source, last_mod):
+		cache_entry = self._cfg.status_store.get_run(self.internal_name, self.instance.shortname)
+		if cache_entry is None:
+			return None
 
-		# Determine status cache entry.
-		status, last_mod = Status.NOT_SUBMITTED, None
-		try:
-			with open(self.output_file_path('status'), 'r') as f:
-				status_dict = yaml.load(f, Loader=YmlLoader)
-				last_mod = os.fstat(f.fileno()).st_mtime
+		cached_status, cached_last_mod = cache_entry
+		if last_mod != cached_last_mod:
+			return None
+
+		# Verify that the file with the same last modification time truly produced this
+		# cache entry by matching the cached status with the source it originated from.
+		status = Status(cached_status)
+		if (((status.is_positive or status.is_negative) and source == 'status')
+			or (status == Status.STARTED and source == 'out')
+			or (status == Status.SUBMITTED and source == 'run')
+			or (status == Status.IN_SUBMISSION and source == 'lock')
+			or (status == Status.NOT_SUBMITTED and source is None)):
+			return status
+		return None
+
+	def _read_status(self, source, last_mod):
+		# Determines the status from the source file. This function only reads files and
+		# thus can be called from worker threads (see Config.refresh_statuses()).
+		# Returns a (status, last_mod, slurm_jobid, queue_jobid)-tuple that is passed to _record_status().
+		status = Status.NOT_SUBMITTED
+		slurm_jobid, queue_jobid = None, None
+		if source == 'status':
+			try:
+				with open(self.output_file_path('status'), 'r') as f:
+					status_dict = yaml.load(f, Loader=YmlLoader)
+					last_mod = os.fstat(f.fileno()).st_mtime
+			except FileNotFoundError:
+				# The run was purged after we determined the source.
+				return self._read_status(*self._stat_status_source())
 
 			if status_dict['timeout']:
 				status = Status.TIMEOUT
@@ -1401,94 +2587,48 @@ class Run:
 				status = Status.FAILED
 			else:
 				status = Status.FINISHED
-		except FileNotFoundError:
-			if os.access(self.output_file_path('out'), os.F_OK):
-				status, last_mod = Status.STARTED, os.stat(self.output_file_path('out')).st_mtime
-
-				jobid = self.slurm_jobid
-				queue_jobid = self.get_queue_jobid()
-				if jobid is not None:
-					if not self._cfg.slurm_queried:
-						self._cfg.query_slurm()
-					status = self._cfg.get_slurm_job_status(jobid)
-				elif queue_jobid is not None:
-					if not self._cfg.queue_queried:
-						self._cfg.query_queue()
-					status = self._cfg.get_queue_job_status(queue_jobid)
-
-			elif os.access(self.aux_file_path('run'), os.F_OK):
-				status, last_mod = Status.SUBMITTED, os.stat(self.aux_file_path('run')).st_mtime
-
-				jobid = self.slurm_jobid
-				queue_jobid = self.get_queue_jobid()
-				if jobid is not None:
-					if not self._cfg.slurm_queried:
-						self._cfg.query_slurm()
-					status = self._cfg.get_slurm_job_status(jobid)
-				elif queue_jobid is not None:
-					if not self._cfg.queue_queried:
-						self._cfg.query_queue()
-					status = self._cfg.get_queue_job_status(queue_jobid)
-
-			elif os.access(self.aux_file_path('lock'), os.F_OK):
-				status, last_mod = Status.IN_SUBMISSION, os.stat(self.aux_file_path('lock')).st_mtime
-
-		internal_name = self.internal_name
-		if internal_name not in self._cfg.status_cache_dict:
-			self._cfg.status_cache_dict[internal_name] = {
-				self.instance.shortname: {'status': status, 'last_mod': last_mod}}
-		else:
-			self._cfg.status_cache_dict[internal_name][self.instance.shortname] = {
-				'status': status, 'last_mod': last_mod}
-
+		elif source in ['out', 'run']:
+			status = Status.STARTED if source == 'out' else Status.SUBMITTED
+			info = self.get_submission_info()
+			if info is not None:
+				slurm_jobid = info.slurm_jobid
+				queue_jobid = info.queue_jobid
+		elif source == 'lock':
+			status = Status.IN_SUBMISSION
+
+		return status, last_mod, slurm_jobid, queue_jobid
+
+	def _record_status(self, status, last_mod, slurm_jobid, queue_jobid):
+		# Asks the launcher about submitted jobs and updates the status cache entry.
+		if slurm_jobid is not None:
+			status = self._cfg.get_slurm_job_status(slurm_jobid)
+		elif queue_jobid is not None:
+			if not self._cfg.queue_queried:
+				self._cfg.query_queue()
+			status = self._cfg.get_queue_job_status(queue_jobid)
+
+		self._cfg.status_store.put_run(self.internal_name, self.instance.shortname, status, last_mod)
 		return status
 
+	def _stat_status_source(self):
+		output_subdir = self.experiment.output_subdir
+		aux_subdir = self.experiment.aux_subdir
+		return self._find_status_source(
+				lambda name: util.get_mtime(os.path.join(output_subdir, name)),
+				lambda name: util.get_mtime(os.path.join(aux_subdir, name)))
+
+	def _update_status_cache_dict(self):
+		return self._record_status(*self._read_status(*self._stat_status_source()))
+
 	def purge_status_cache_dict(self):
-		try:
-			del self._cfg.status_cache_dict[self.internal_name][self.instance.shortname]
-		except KeyError:
-			pass
+		self._cfg.status_store.delete_run(self.internal_name, self.instance.shortname)
 
 	def get_status(self):
-		internal_name = self.internal_name
-		if internal_name in self._cfg.status_cache_dict:
-			if self.instance.shortname in self._cfg.status_cache_dict[internal_name]:
-				cache_entry = self._cfg.status_cache_dict[internal_name][self.instance.shortname]
-
-				last_mod = None
-				last_mod_source = None
-				try:
-					last_mod = os.stat(self.output_file_path('status')).st_mtime
-					last_mod_source = 'status'
-				except FileNotFoundError:
-					try:
-						last_mod = os.stat(self.output_file_path('out')).st_mtime
-						last_mod_source = 'out'
-					except FileNotFoundError:
-						try:
-							last_mod = os.stat(self.aux_file_path('run')).st_mtime
-							last_mod_source = 'run'
-						except FileNotFoundError:
-							try:
-								last_mod = os.stat(self.aux_file_path('lock')).st_mtime
-								last_mod_source = 'lock'
-							except FileNotFoundError:
-								pass
-
-				if last_mod == cache_entry.get('last_mod', None):
-
-					# Verify that the file with the same last modification time truly produced this
-					# cache entry by matching the cached status with the source it originated from.
-					status = Status(cache_entry["status"])
-					if (((status.is_positive or status.is_negative) and last_mod_source == 'status')
-						or (status == Status.STARTED and last_mod_source == 'out')
-						or (status == Status.SUBMITTED and last_mod_source == 'run')
-						or (status == Status.IN_SUBMISSION and last_mod_source == 'lock')
-						or (status == Status.NOT_SUBMITTED and last_mod_source is None)):
-
-						return status
-
-		return self._update_status_cache_dict()
+		source, last_mod = self._stat_status_source()
+		status = self._get_cached_status(source, last_mod)
+		if status is not None:
+			return status
+		return self._record_status(*self._read_status(source, last_mod))
 
 	def output_file_path_from_yml(self):
 		def get_qualified_output_file(ext):
@@ -1512,23 +2652,84 @@ class Run:
 			raise RuntimeError("The experiment '{}' with instance '{}' has not been started yet".format(
 				self.experiment.display_name, self.instance.shortname))
 
-def init_cache_for_basedir(basedir):
-	if not os.path.isfile(os.path.join(basedir,util.SIMEX_CACHE)):
-		with open(os.path.join(basedir,util.SIMEX_CACHE), "x") as cachefile:
-			json.dump({"status": {}, "validation": {}}, cachefile) 
-
-def init_cache_entry_for_build(basedir, buildname):
-	assert os.path.isfile(os.path.join(basedir, util.SIMEX_CACHE))
-	with open(os.path.join(basedir, util.SIMEX_CACHE), 'r') as cachefile:
-		cache = json.load(cachefile)
-	if not buildname in cache:
-		cache[buildname] = {util.CHECKOUT: False, util.REGENERATED: False, util.CONFIGURED: False, util.COMPILED: False, util.INSTALLED: False}
-		with open(os.path.join(basedir, util.SIMEX_CACHE), 'w') as cachefile:
-			json.dump(cache, cachefile)
-
-def config_for_dir(basedir=None):
+	def get_output(self, ext=None):
+		"""
+		Returns an :class:`simexpal.output.OutputFile` to access an output file without reading it completely.
+
+		:param ext: Extension of the output file. By default, the output file of the experiment
+			(see :meth:`output_file_path_from_yml`) is accessed.
+		"""
+		if ext is None:
+			return output.OutputFile(self.output_file_path_from_yml())
+		return output.OutputFile(self.output_file_path(ext))
+
+	def get_error_output(self):
+		"""Returns an :class:`simexpal.output.OutputFile` to access the stderr output of the run."""
+		return output.OutputFile(self.aux_file_path('stderr'))
+
+	def get_resource_usage(self):
+		"""Returns the :class:`ResourceUsage` from the run's .status file (or ``None`` if the run has not finished)."""
+		try:
+			with open(self.output_file_path('status'), 'r') as f:
+				status_dict = yaml.load(f, Loader=YmlLoader)
+		except FileNotFoundError:
+			return None
+		return ResourceUsage.from_yml(status_dict)
+
+# Configurations that were opened to unpickle runs (e.g., in worker processes).
+_restored_configs = {}
+
+def _restore_run(basedir, exp_name, rev_name, var_names, instance, repetition):
+	cfg = _restored_configs.get(basedir, None)
+	if cfg is None:
+		cfg = config_for_dir(basedir)
+		_restored_configs[basedir] = cfg
+	if not cfg._experiments_discovered:
+		cfg._fill_experiments()
+	experiment = cfg._experiments[(cfg.get_experiment_info(exp_name), cfg.get_revision(rev_name),
+			tuple(cfg.get_variant(var_name) for var_name in var_names))]
+	return Run(cfg, experiment, cfg.get_instance(instance), repetition)
+
+def _stat_output_file(run):
+	try:
+		st = os.stat(run.output_file_path_from_yml())
+	except FileNotFoundError:
+		return None
+	return (st.st_mtime_ns, st.st_size)
+
+def _encode_result(result):
+	# Helper for Config.collect_results(). Results are cached as JSON (and not pickled), such
+	# that reading the cache never executes code. Returns None for results that JSON cannot
+	# represent faithfully (e.g., tuples or custom classes); such results are not cached.
+	try:
+		data = json.dumps(result)
+	except (TypeError, ValueError):
+		return None
+	if json.loads(data) != result:
+		return None
+	return data
+
+def _parse_run_outputs(parse_fn, runs):
+	# Helper for Config.collect_results() that is executed by the workers.
+	results = []
+	for run in runs:
+		with run.open_output_file() as f:
+			results.append(parse_fn(run, f))
+	return results
+
+def config_for_dir(basedir=None, status_store_backend=None):
 	if basedir is None:
 		basedir = '.'
-	init_cache_for_basedir(basedir)
-	yml = util.validate_setup_file(basedir, 'experiments.yml', 'experiments.json')
-	return Config(os.path.abspath(basedir), yml)
\ No newline at end of file
+	status_store = store.open_store(basedir, backend=status_store_backend)
+
+	# If neither the setup files nor simexpal changed, we can skip validation and YAML parsing.
+	config_snapshot = snapshot.load_snapshot(basedir)
+	if config_snapshot.yml is None:
+		config_snapshot.yml = util.validate_setup_file(basedir, 'experiments.yml', 'experiments.json',
+				store=status_store)
+		try:
+			config_snapshot.save()
+		except OSError:
+			pass
+	return Config(os.path.abspath(basedir), config_snapshot.yml, status_store=status_store,
+			snapshot=config_snapshot)
\ No newline at end of file
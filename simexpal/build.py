@@ -1,6 +1,5 @@
 
 from enum import Enum, IntEnum
-import json
 import os.path
 import sys, subprocess
 
@@ -67,13 +66,9 @@ class Phase(IntEnum):
 	COMPILE = 4
 	INSTALL = 5
 
-def mark_as_finished(basedir, buildname, type):
+def mark_as_finished(cfg, buildname, type):
 	assert(type != None)
-	with open(os.path.join(basedir, util.SIMEX_CACHE), 'r') as cachefile:
-		cache = json.load(cachefile)
-	cache[buildname][type] = True
-	with open(os.path.join(basedir, util.SIMEX_CACHE), 'w') as cachefile:
-		json.dump(cache, cachefile)
+	cfg.status_store.mark_build_phase(buildname, type)
 
 def make_build_in_order(cfg, build, wanted_builds, wanted_phases):
 	if not build.revision.is_dev_build:
@@ -157,7 +152,7 @@ def make_build_in_order(cfg, build, wanted_builds, wanted_phases):
 	def skip_phase(phase):
 		return phase > max(wanted_phases)
 
-	base.init_cache_entry_for_build(cfg.basedir, build.name)
+	cfg.status_store.init_build(build.name)
 
 	done_phases = set()
 	if build.name in wanted_builds:
@@ -284,7 +279,7 @@ def make_build_in_order(cfg, build, wanted_builds, wanted_phases):
 				if not build.info.git_repo == 'none' and not build.info.git_repo == None:
 					subprocess.check_call(['git', 'clone', build.info.git_repo, build.source_dir])
 
-			mark_as_finished(cfg.basedir, build.name, util.CHECKOUT)		
+			mark_as_finished(cfg, build.name, util.CHECKOUT)		
 
 			if build.info.recursive_clone:
 				# Clone submodules recursively
@@ -301,7 +296,7 @@ def make_build_in_order(cfg, build, wanted_builds, wanted_phases):
 		regenerate_args = util.ensure_list_type(build.info.regenerate)
 		for step_yml in regenerate_args:
 			do_step(step_yml, default_workdir=checkout_dir)
-		mark_as_finished(cfg.basedir, build.name, util.REGENERATED)
+		mark_as_finished(cfg, build.name, util.REGENERATED)
 		did_work = True
 
 	if want_phase(Phase.CONFIGURE):
@@ -314,7 +309,7 @@ def make_build_in_order(cfg, build, wanted_builds, wanted_phases):
 		configure_args = util.ensure_list_type(build.info.configure)
 		for step_yml in configure_args:
 			do_step(step_yml, default_workdir=build.compile_dir)
-		mark_as_finished(cfg.basedir, build.name, util.CONFIGURED)
+		mark_as_finished(cfg, build.name, util.CONFIGURED)
 		did_work = True
 
 	if want_phase(Phase.COMPILE):
@@ -323,7 +318,7 @@ def make_build_in_order(cfg, build, wanted_builds, wanted_phases):
 		compile_args = util.ensure_list_type(build.info.compile)
 		for step_yml in compile_args:
 			do_step(step_yml, default_workdir=build.compile_dir)
-		mark_as_finished(cfg.basedir, build.name, util.COMPILED)
+		mark_as_finished(cfg, build.name, util.COMPILED)
 		did_work = True
 
 	if want_phase(Phase.INSTALL):
@@ -336,7 +331,7 @@ def make_build_in_order(cfg, build, wanted_builds, wanted_phases):
 		install_args = util.ensure_list_type(build.info.install)
 		for step_yml in install_args:
 			do_step(step_yml, default_workdir=build.compile_dir)
-		mark_as_finished(cfg.basedir, build.name, util.INSTALLED)
+		mark_as_finished(cfg, build.name, util.INSTALLED)
 		did_work = True
 
 	if not did_work:
@@ -2,6 +2,7 @@
 import os
 import selectors
 import signal
+import socket
 import subprocess
 import sys
 import time
@@ -11,9 +12,72 @@ import yaml
 from .. import base
 from .. import util
 
+# Size of the chunks that are read from output pipes.
+CAPTURE_CHUNK_SIZE = 1024 * 1024
+
+# Whether output is moved from pipes to files by splice() (i.e., without copying it to user space).
+USE_SPLICE = hasattr(os, 'splice')
+
+# Modes of capturing the stdout and stderr of runs:
+# 'lazy' creates the output files only if something is written. The output is read from pipes
+# by the supervisor and moved to the files by splice() (or by large writes).
+# 'direct' redirects the output to the files, i.e., the supervisor does not touch the output at all.
+OUTPUT_CAPTURE_MODES = ['lazy', 'direct']
+
 class Launcher:
 	pass
 
+# Creates a pipe for capturing output. Returns a (read end, write end)-tuple.
+def create_capture_pipe():
+	(read_fd, write_fd) = os.pipe()
+	os.set_blocking(read_fd, False)
+	try:
+		import fcntl
+
+		# Larger pipes reduce the number of wake-ups of the supervisor.
+		fcntl.fcntl(read_fd, fcntl.F_SETPIPE_SZ, CAPTURE_CHUNK_SIZE)
+	except (ImportError, AttributeError, OSError):
+		pass
+	return (read_fd, write_fd)
+
+# Dumps data from an FD to the FS.
+# Creates the output file only if something is written.
+class LazyWriter:
+	def __init__(self, fd, path):
+		self._fd = fd
+		self._path = path
+		self._out = None
+		self._use_splice = USE_SPLICE
+
+	def _write(self, chunk):
+		view = memoryview(chunk)
+		while view:
+			view = view[os.write(self._out, view):]
+
+	def progress(self):
+		if self._out is not None and self._use_splice:
+			try:
+				return os.splice(self._fd, self._out, CAPTURE_CHUNK_SIZE, flags=os.SPLICE_F_NONBLOCK) > 0
+			except BlockingIOError:
+				return True
+			except OSError:
+				# The file system does not support splice(); fall back to read() and write().
+				self._use_splice = False
+
+		# Specify some chunk size to avoid reading the whole pipe at once.
+		chunk = os.read(self._fd, CAPTURE_CHUNK_SIZE)
+		if not len(chunk):
+			return False
+
+		if self._out is None:
+			self._out = os.open(self._path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+		self._write(chunk)
+		return True
+
+	def close(self):
+		if self._out is not None:
+			os.close(self._out)
+
 def lock_run(run):
 	util.try_mkdir(os.path.join(run.config.basedir, 'aux'))
 	util.try_mkdir(os.path.join(run.config.basedir, 'output'))
@@ -36,11 +100,13 @@ def lock_run(run):
 	os.close(lockfd)
 	return True
 
-def create_run_file(run, yml_dict={}):
+def create_run_file(run, yml_dict={}, launcher=None, job_id=None):
+	info = base.SubmissionInfo(launcher=launcher, job_id=job_id,
+			submit_host=socket.gethostname(), submit_time=time.time())
 
 	# Create the .run file. This signals that the run has been submitted.
 	with open(run.aux_file_path('run.tmp'), 'w') as f:
-		yaml.dump(yml_dict, f)
+		yaml.dump(dict(yml_dict, **info.to_yml()), f)
 	os.rename(run.aux_file_path('run.tmp'), run.aux_file_path('run'))
 
 # Stores all information that is necessary to invoke a run.
@@ -106,6 +172,28 @@ class RunManifest:
 	def timeout(self):
 		return self.yml['timeout']
 
+	@property
+	def num_threads(self):
+		num_threads = self.yml.get('num_threads', None)
+		if num_threads is None:
+			return None
+		if isinstance(num_threads, str):
+			num_threads = util.expand_at_params(num_threads,
+					lambda p: str(self.get_variant_value(p.split(':')[1]))
+					if p.startswith('VARIANT_VALUE:') else None)
+		try:
+			return int(num_threads)
+		except ValueError:
+			raise RuntimeError("The value of the 'num_threads' key has to be an integer: {}".format(num_threads))
+
+	@property
+	def affinity(self):
+		return self.yml.get('affinity', None)
+
+	@property
+	def output_capture(self):
+		return self.yml.get('output_capture', 'lazy')
+
 	@property
 	def aux_subdir(self):
 		return base.get_aux_subdir(self.base_dir, self.experiment,
@@ -258,6 +346,8 @@ def compile_manifest(run):
 	for (k, v) in exp.info.environ.items():
 		environ[k] = str(v)
 
+	ts = exp.effective_thread_settings
+
 	stdout = None
 	if exp.info.stdout is not None:
 		stdout = exp.info.stdout
@@ -282,13 +372,113 @@ def compile_manifest(run):
 		'builds': builds_dict,
 		'args': exp.info.args,
 		'timeout': float(exp.info.timeout) if exp.info.timeout is not None else exp.info.timeout,
+		'num_threads': ts['num_threads'] if ts is not None else None,
+		'affinity': exp.effective_affinity,
+		'output_capture': exp.info.output_capture,
 		'environ': environ,
 		'output_extensions': exp.info.output_extensions,
 		'stdout': stdout,
 		'workdir': exp.info.workdir
 	})
 
-def invoke_run(manifest):
+# Parses CPU lists such as '0-3,8' (as in /sys/devices/system/cpu/online).
+def parse_cpu_list(cpu_list):
+	cpus = []
+	for item in cpu_list.split(','):
+		first, _, last = item.strip().partition('-')
+		try:
+			cpus.extend(range(int(first), int(last if last else first) + 1))
+		except ValueError:
+			raise RuntimeError("Invalid CPU list: {}".format(cpu_list))
+	return cpus
+
+# Helper to read the (package, core) ID of a logical CPU. Returns None if the topology is unknown.
+def _read_core_id(cpu):
+	topology_dir = '/sys/devices/system/cpu/cpu{}/topology'.format(cpu)
+	try:
+		with open(os.path.join(topology_dir, 'physical_package_id')) as f:
+			package = int(f.read())
+		with open(os.path.join(topology_dir, 'core_id')) as f:
+			core = int(f.read())
+	except (OSError, ValueError):
+		return None
+	return (package, core)
+
+def get_physical_cores(cpus, read_core_id=None):
+	"""
+	Groups logical CPUs by the physical cores that they belong to (i.e., SMT siblings end up in
+	the same group). Returns a list of sorted lists of CPUs, ordered by their first CPU.
+	"""
+	if read_core_id is None:
+		read_core_id = _read_core_id
+	cores = {}
+	for cpu in sorted(cpus):
+		core_id = read_core_id(cpu)
+		cores.setdefault(core_id if core_id is not None else ('cpu', cpu), []).append(cpu)
+	return sorted(cores.values())
+
+def resolve_affinity(affinity, slots, available=None):
+	"""
+	Determines the CPUs that a run is pinned to.
+
+	:param affinity: Either an explicit list of CPUs (as a list or a string like ``'0-3,8'``;
+		slot *i* uses the *i*-th CPU of the list), ``'logical'`` (slot *i* uses the *i*-th
+		available logical CPU) or ``'physical'`` (slot *i* uses one logical CPU of the *i*-th
+		available physical core, i.e., SMT siblings stay idle).
+	:param slots: Indices of the slots that the run occupies. Runs that are executed concurrently
+		occupy disjoint slots and are thus pinned to disjoint CPUs.
+	:param available: CPUs that can be used (default: the affinity of the current process).
+		Explicit lists of CPUs are not restricted to the available CPUs.
+	"""
+	if affinity in ['logical', 'physical']:
+		if available is None:
+			available = os.sched_getaffinity(0)
+		if affinity == 'logical':
+			units = [[cpu] for cpu in sorted(available)]
+		else:
+			units = get_physical_cores(available)
+		kind = affinity
+	else:
+		# Explicit lists are the pool of CPUs that the slots are distributed over.
+		explicit = affinity if isinstance(affinity, list) else parse_cpu_list(affinity)
+		units = [[cpu] for cpu in sorted(set(explicit))]
+		kind = 'listed'
+
+	slots = list(slots)
+	if slots and max(slots) >= len(units):
+		raise RuntimeError("Cannot pin {} slots to distinct {} cores: only {} cores are available".format(
+				max(slots) + 1, kind, len(units)))
+	return sorted(units[slot][0] for slot in slots)
+
+# Converts a status returned by os.wait*() to a return code (as in subprocess.Popen.returncode).
+def decode_wait_status(wait_status):
+	if os.WIFSIGNALED(wait_status):
+		return -os.WTERMSIG(wait_status)
+	return os.WEXITSTATUS(wait_status)
+
+# Converts a resource.struct_rusage to the resource usage fields of the .status file.
+def get_rusage_dict(rusage):
+	maxrss = rusage.ru_maxrss
+	if sys.platform == 'darwin':
+		# macOS reports bytes instead of KiB.
+		maxrss //= 1024
+	return {
+		'utime': rusage.ru_utime,
+		'stime': rusage.ru_stime,
+		'maxrss': maxrss,
+		'majflt': rusage.ru_majflt,
+		'minflt': rusage.ru_minflt,
+		'nvcsw': rusage.ru_nvcsw,
+		'nivcsw': rusage.ru_nivcsw
+	}
+
+def invoke_run(manifest, slots=None):
+	"""
+	Executes a run and writes its .status file.
+
+	:param slots: Indices of the slots that the run occupies (see :func:`resolve_affinity`).
+		By default, the run occupies the first ``num_threads`` slots.
+	"""
 
 	def get_qualified_output_file(ext):
 		if ext not in manifest.output_extensions:
@@ -297,18 +487,28 @@ def invoke_run(manifest):
 			)
 		return manifest.output_file_path(ext)
 
+	def open_output_fd(path):
+		with open(path, 'w') as f:
+			return os.dup(f.fileno())
+
+	if manifest.output_capture not in OUTPUT_CAPTURE_MODES:
+		raise RuntimeError("Unknown output capture mode for experiment '{}': {}".format(
+				manifest.experiment, manifest.output_capture))
+	direct_capture = manifest.output_capture == 'direct'
+
 	(stdout_pipe, stdout) = (None, None)
 	if manifest.stdout is not None:
 		stdout_path = get_qualified_output_file(manifest.stdout)
 
 		# We do not actually need to write anything to the output file.
 		# However, we might want to pipe experimental output to it.
-		with open(stdout_path, 'w') as f:
-			stdout = os.dup(f.fileno())
+		stdout = open_output_fd(stdout_path)
 	else:
 		stdout_path = manifest.aux_file_path('stdout')
-		(stdout_pipe, stdout) = os.pipe()
-		os.set_blocking(stdout_pipe, False)
+		if direct_capture:
+			stdout = open_output_fd(stdout_path)
+		else:
+			(stdout_pipe, stdout) = create_capture_pipe()
 
 	# Create all the other the output files.
 	# The creation of the output file with extension '.out' signals that the run has been started.
@@ -317,8 +517,11 @@ def invoke_run(manifest):
 		util.touch(manifest.output_file_path(ext))
 
 	# Create the error file.
-	(stderr_pipe, stderr) = os.pipe()
-	os.set_blocking(stderr_pipe, False)
+	stderr_pipe = None
+	if direct_capture:
+		stderr = open_output_fd(manifest.aux_file_path('stderr'))
+	else:
+		(stderr_pipe, stderr) = create_capture_pipe()
 
 	def get_qualified_filename(identifier):
 		if manifest.instance_is_filess:
@@ -427,66 +630,58 @@ def invoke_run(manifest):
 
 	environ.update(manifest_environ)
 
-	# Dumps data from an FD to the FS.
-	# Creates the output file only if something is written.
-	class LazyWriter:
-		def __init__(self, fd, path):
-			self._fd = fd
-			self._path = path
-			self._out = None
-
-		def progress(self):
-			# Specify some chunk size to avoid reading the whole pipe at once.
-			chunk = os.read(self._fd, 16 * 1024)
-			if not len(chunk):
-				return False
-
-			if self._out is None:
-				self._out = open(self._path, "wb")
-			self._out.write(chunk)
-			self._out.flush()
-			return True
-
-		def close(self):
-			if self._out is not None:
-				self._out.close()
+	cpus = None
+	preexec_fn = None
+	if manifest.affinity is not None:
+		if slots is None:
+			slots = range(manifest.num_threads or 1)
+		cpus = resolve_affinity(manifest.affinity, slots)
+		preexec_fn = lambda: os.sched_setaffinity(0, cpus)
 
 	start = time.perf_counter()
 	cwd = (util.expand_at_params(manifest.workdir, substitute)
 			if manifest.workdir is not None else manifest.base_dir)
 	try:
 		child = subprocess.Popen(cmd, cwd=cwd, env=environ,
-				stdout=stdout, stderr=stderr)
-	except FileNotFoundError:
+				stdout=stdout, stderr=stderr, preexec_fn=preexec_fn)
+	except (FileNotFoundError, subprocess.SubprocessError) as e:
 		import traceback
 
+		for fd in [stdout, stderr, stdout_pipe, stderr_pipe]:
+			if fd is not None:
+				os.close(fd)
+
 		# Log the error traceback.
 		with open(manifest.aux_file_path('stderr'), 'w') as f:
 			f.write(traceback.format_exc())
 
 		# Create the .status file.
+		# Exceptions in preexec_fn (i.e., sched_setaffinity()) are reported as SubprocessError.
 		status_dict = {'timeout': False, 'walltime': 0,
 				'status': -1, 'signal': None,
-				'error': 'executable_not_found'}
+				'error': 'executable_not_found' if isinstance(e, FileNotFoundError) else 'affinity_failed',
+				'affinity': cpus}
 		with open(manifest.output_file_path('status.tmp'), "w") as f:
 			yaml.dump(status_dict, f)
 		os.rename(manifest.output_file_path('status.tmp'), manifest.output_file_path('status'))
 
 		return
 
+	os.close(stdout)
 	os.close(stderr)
 	sel = selectors.DefaultSelector()
 
-	if manifest.stdout is None:
-		os.close(stdout)
+	if stdout_pipe is not None:
 		stdout_writer = LazyWriter(stdout_pipe, manifest.aux_file_path('stdout'))
 		sel.register(stdout_pipe, selectors.EVENT_READ, stdout_writer)
-	stderr_writer = LazyWriter(stderr_pipe, manifest.aux_file_path('stderr'))
-	sel.register(stderr_pipe, selectors.EVENT_READ, stderr_writer)
+	if stderr_pipe is not None:
+		stderr_writer = LazyWriter(stderr_pipe, manifest.aux_file_path('stderr'))
+		sel.register(stderr_pipe, selectors.EVENT_READ, stderr_writer)
 
 	signal_reader, signal_writer = os.pipe()
+	os.set_blocking(signal_reader, False)
 	os.set_blocking(signal_writer, False)
-	signal.set_wakeup_fd(signal_writer)
+	previous_wakeup_fd = signal.set_wakeup_fd(signal_writer)
 
 	# We need to install a signal handler in order for
 	# signal.set_wakeup_fd() to write the signal into fd
@@ -495,34 +690,75 @@ def invoke_run(manifest):
 
 	sel.register(signal_reader, selectors.EVENT_READ)
 
+	# Wake up exactly when the child exits: pidfds become readable on exit. Without pidfd
+	# support, SIGCHLD is delivered through the wakeup fd instead. Since the child might have
+	# exited before the handler was installed, we always try to reap it before we block.
+	exit_fd = None
+	previous_sigchld_handler = None
+	try:
+		exit_fd = os.pidfd_open(child.pid)
+	except (AttributeError, OSError):
+		previous_sigchld_handler = signal.signal(signal.SIGCHLD, lambda *args: None)
+	else:
+		sel.register(exit_fd, selectors.EVENT_READ)
+
 	do_exit = False
+	timeout_signal = None
+	if manifest.timeout is not None:
+		# Programs can catch the SIGXCPU signal and keep running.
+		# Thus, the kill command ensures that the time limit is respected (with a grace period).
+		timeout_signal = (start + manifest.timeout, signal.SIGXCPU)
 
 	# Wait until the run program finishes.
+	# We reap the child ourselves (instead of using child.poll()) to obtain its resource usage.
+	rusage = None
+	exit_time = None
 	while True:
-		if child.poll() is not None:
+		pid, wait_status, rusage = os.wait4(child.pid, os.WNOHANG)
+		if pid:
+			child.returncode = decode_wait_status(wait_status)
+			if exit_time is None:
+				exit_time = time.perf_counter()
 			break
+		exit_time = None
 
-		elapsed = time.perf_counter() - start
-		if manifest.timeout is not None and elapsed > manifest.timeout:
-			# Programs can catch the SIGXCPU signal and keep running.
-			# Thus, the kill command ensures that the time limit is respected (with a grace period).
-			if elapsed > manifest.timeout + base.TIMEOUT_GRACE_PERIOD:
-				child.kill()
+		now = time.perf_counter()
+		while timeout_signal is not None and now >= timeout_signal[0]:
+			child.send_signal(timeout_signal[1])
+			if timeout_signal[1] == signal.SIGXCPU:
+				timeout_signal = (start + manifest.timeout + base.TIMEOUT_GRACE_PERIOD, signal.SIGKILL)
 			else:
-				child.send_signal(signal.SIGXCPU)
+				timeout_signal = None
 
 		# Consume any output that might be ready.
-		events = sel.select(timeout=1)
+		events = sel.select(timeout=timeout_signal[0] - now if timeout_signal is not None else None)
+		event_time = time.perf_counter()
 		for (sk, mask) in events:
 			if sk.fileobj == signal_reader:
-				sel.unregister(signal_reader)
-				child.kill()
-				do_exit = True  # We also need to terminate the parent process. Otherwise subsequent experiments will be launched.
+				try:
+					signums = os.read(signal_reader, 512)
+				except BlockingIOError:
+					continue
+				if signal.SIGCHLD in signums:
+					exit_time = event_time
+				if signal.SIGTERM in signums or signal.SIGINT in signums:
+					child.kill()
+					do_exit = True  # We also need to terminate the parent process. Otherwise subsequent experiments will be launched.
+			elif sk.fileobj == exit_fd:
+				exit_time = event_time
 			elif not sk.data.progress():
 				sel.unregister(sk.fd)
 
+	sel.unregister(signal_reader)
+	signal.set_wakeup_fd(previous_wakeup_fd)
+	if previous_sigchld_handler is not None:
+		signal.signal(signal.SIGCHLD, previous_sigchld_handler)
 	os.close(signal_reader)
 	os.close(signal_writer)
+	if exit_fd is not None:
+		sel.unregister(exit_fd)
+		os.close(exit_fd)
+	runtime = exit_time - start
 
 	# Consume all remaining output.
 	while True:
@@ -532,12 +768,12 @@ def invoke_run(manifest):
 				sel.unregister(sk.fd)
 		if not events:
 			break
-	if manifest.stdout is None:
+	if stdout_pipe is not None:
 		stdout_writer.close()
 		os.close(stdout_pipe)
-	stderr_writer.close()
-	os.close(stderr_pipe)
-	runtime = time.perf_counter() - start
+	if stderr_pipe is not None:
+		stderr_writer.close()
+		os.close(stderr_pipe)
 
 	# Collect the status information.
 	status = None
@@ -551,7 +787,8 @@ def invoke_run(manifest):
 	# Create the status file to signal that we are finished.
 	status_dict = {'timeout': did_timeout, 'walltime': runtime,
 			'status': status, 'signal': sigcode,
-			'error': None}
+			'error': None, 'affinity': cpus}
+	status_dict.update(get_rusage_dict(rusage))
 	with open(manifest.output_file_path('status.tmp'), "w") as f:
 		yaml.dump(status_dict, f)
 	os.rename(manifest.output_file_path('status.tmp'), manifest.output_file_path('status'))
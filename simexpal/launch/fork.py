@@ -1,14 +1,159 @@
 
+import collections
+import multiprocessing
+import multiprocessing.connection
+import signal
+import sys
+
 from . import common
 
 class ForkLauncher(common.Launcher):
+	"""
+	Launches runs on the local machine.
+
+	:param jobs: Number of slots (i.e., cores) that runs are scheduled on. If this is greater
+		than one, runs are executed concurrently by :meth:`submit_multiple`. Each run occupies
+		as many slots as it has threads (see the ``num_threads`` key); exclusive runs occupy
+		all slots. The ``max_simultaneous`` key limits the number of concurrent runs per experiment.
+	"""
+
+	def __init__(self, jobs=None):
+		self.jobs = jobs
+
 	def submit(self, config, run):
 		if not common.lock_run(run):
 			return
-		common.create_run_file(run)
+		common.create_run_file(run, launcher='fork')
 
-		print("Launching run {}/{}[{}] on local machine".format(
-				run.experiment.display_name, run.instance.shortname, run.repetition))
+		print_launch_message(run)
 		manifest = common.compile_manifest(run)
 		common.invoke_run(manifest)
 
+	def submit_multiple(self, config, runs):
+		if self.jobs is None or self.jobs <= 1:
+			for run in runs:
+				self.submit(config, run)
+			return
+
+		scheduler = SlotScheduler(self.jobs)
+		for run in runs:
+			scheduler.add(run)
+		scheduler.execute()
+
+def print_launch_message(run):
+	print("Launching run {}/{}[{}] on local machine".format(
+			run.experiment.display_name, run.instance.shortname, run.repetition))
+
+# Returns the number of slots that a run occupies (out of num_slots slots).
+def get_num_run_slots(run, manifest, num_slots):
+	if run.experiment.is_exclusive:
+		return num_slots
+	return max(1, min(manifest.num_threads or 1, num_slots))
+
+# Entry point of the processes that supervise runs.
+def _supervise_run(manifest, slots):
+	try:
+		common.invoke_run(manifest, slots=slots)
+	except RuntimeError as e:
+		print(e, file=sys.stderr)
+		sys.exit(1)
+
+def _raise_keyboard_interrupt(signum, frame):
+	raise KeyboardInterrupt()
+
+class SlotScheduler:
+	"""
+	Executes runs concurrently on a fixed number of slots.
+
+	Runs are started in the order in which they were added. Runs that do not fit into the free
+	slots are skipped in favor of later runs, unless they are exclusive (such that exclusive runs
+	are not starved). Each run is supervised by a forked process that calls
+	:func:`common.invoke_run`, i.e., the ``.lock``/``.run``/``.status`` protocol is the same
+	as for sequential launches. Slots are numbered; concurrent runs occupy disjoint slots,
+	such that runs with an ``affinity`` are pinned to disjoint CPUs.
+	"""
+
+	def __init__(self, num_slots):
+		self.num_slots = num_slots
+		self._pending = []
+		self._free_slots = list(range(num_slots))
+		self._active = {}
+		self._num_active = collections.Counter()
+
+	def add(self, run):
+		manifest = common.compile_manifest(run)
+		if manifest.affinity is not None:
+			# Make sure that all slots can be pinned before any run is launched.
+			common.resolve_affinity(manifest.affinity, range(self.num_slots))
+		self._pending.append((run, manifest, get_num_run_slots(run, manifest, self.num_slots)))
+
+	def _can_start(self, run, num_run_slots):
+		if num_run_slots > len(self._free_slots):
+			return False
+		limit = run.experiment.max_simultaneous
+		return not limit or self._num_active[run.experiment] < limit
+
+	def _start_runs(self, context):
+		i = 0
+		while i < len(self._pending):
+			run, manifest, num_run_slots = self._pending[i]
+			if not self._can_start(run, num_run_slots):
+				if run.experiment.is_exclusive:
+					break
+				i += 1
+				continue
+			del self._pending[i]
+
+			if not common.lock_run(run):
+				continue
+			common.create_run_file(run, launcher='fork')
+
+			slots = self._free_slots[:num_run_slots]
+			del self._free_slots[:num_run_slots]
+
+			print_launch_message(run)
+			sys.stdout.flush()
+			process = context.Process(target=_supervise_run, args=(manifest, slots))
+			process.start()
+			self._active[process.sentinel] = (process, run, slots)
+			self._num_active[run.experiment] += 1
+
+	def _reap(self, sentinel):
+		process, run, slots = self._active.pop(sentinel)
+		process.join()
+		self._free_slots.extend(slots)
+		self._free_slots.sort()
+		self._num_active[run.experiment] -= 1
+		return process.exitcode == 0
+
+	def execute(self):
+		"""Executes all runs and blocks until they are finished."""
+		context = multiprocessing.get_context('fork')
+
+		# Terminate the runs (instead of only this process) on SIGTERM.
+		previous_handler = signal.signal(signal.SIGTERM, _raise_keyboard_interrupt)
+		failed = False
+		try:
+			try:
+				while self._active or (self._pending and not failed):
+					if not failed:
+						self._start_runs(context)
+					if not self._active:
+						break
+					for sentinel in multiprocessing.connection.wait(list(self._active)):
+						if not self._reap(sentinel):
+							# Stop launching runs, e.g., because the supervisor received SIGINT.
+							failed = True
+			except KeyboardInterrupt:
+				failed = True
+				for process, _, _ in self._active.values():
+					process.terminate()
+				for sentinel in list(self._active):
+					self._reap(sentinel)
+		finally:
+			signal.signal(signal.SIGTERM, previous_handler)
+
+		if failed:
+			raise RuntimeError(
+				"simexpal stopped launching runs as a run supervisor failed or a termination signal "
+				"(either SIGINT or SIGTERM) was received")
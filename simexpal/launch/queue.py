@@ -32,7 +32,7 @@ class QueueLauncher(common.Launcher):
 											dir=os.path.join(cfg.basedir, 'aux/_queue'))
 
 		queue_jobid = util.extract_file_prefix_from_path(specfile, '-spec')
-		common.create_run_file(run, {'queue_jobid': queue_jobid})
+		common.create_run_file(run, launcher='queue', job_id=queue_jobid)
 
 		specs = {'manifest': common.compile_manifest(run).yml}
 		with os.fdopen(specfd, 'w') as f:
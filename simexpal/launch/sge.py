@@ -80,5 +80,5 @@ class SgeLauncher(common.Launcher):
 					subprocess.check_call(invoke_args + ['-n'], env=sim_env)
 
 		for run in locked:
-			common.create_run_file(run)
+			common.create_run_file(run, launcher='sge')
 
@@ -167,7 +167,7 @@ class SlurmLauncher(common.Launcher):
 		jobid = prog.match(return_msg).group('jobid')
 		if use_array:
 			for idx, run in enumerate(locked):
-				common.create_run_file(run, {'slurm_jobid': str(jobid) + '_' + str(idx)})
+				common.create_run_file(run, launcher='slurm', job_id=str(jobid) + '_' + str(idx))
 		else:
-			common.create_run_file(locked[0], {'slurm_jobid': str(jobid)})
+			common.create_run_file(locked[0], launcher='slurm', job_id=str(jobid))
 
@@ -0,0 +1,141 @@
+
+import contextlib
+import mmap
+import os
+
+# Size of the blocks that are read when searching for line breaks.
+BLOCK_SIZE = 64 * 1024
+
+class OutputFile:
+	"""
+	Read access to an output file of a run that never loads more of the file than necessary.
+
+	Files that do not exist (e.g., because the run has not started yet) behave like empty files.
+	Lines are returned as strings without line terminators; undecodable bytes are replaced.
+	"""
+
+	def __init__(self, path, encoding='utf-8'):
+		self.path = path
+		self.encoding = encoding
+
+	def _decode(self, data):
+		return data.decode(self.encoding, errors='replace')
+
+	def _open(self):
+		try:
+			return open(self.path, 'rb')
+		except FileNotFoundError:
+			return None
+
+	@property
+	def exists(self):
+		return os.path.isfile(self.path)
+
+	@property
+	def size(self):
+		try:
+			return os.stat(self.path).st_size
+		except FileNotFoundError:
+			return 0
+
+	@contextlib.contextmanager
+	def mmap(self):
+		"""
+		Maps the file into memory (read-only) and yields the ``mmap`` object.
+
+		For empty or missing files, ``b''`` is yielded instead (as these cannot be mapped).
+		"""
+		f = self._open()
+		if f is None:
+			yield b''
+			return
+		with f:
+			if os.fstat(f.fileno()).st_size == 0:
+				yield b''
+				return
+			with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+				yield m
+
+	def read_bytes(self, start=0, end=None):
+		"""Returns the bytes in ``[start, end)``. Negative offsets count from the end of the file (as for slices)."""
+		f = self._open()
+		if f is None:
+			return b''
+		with f:
+			start, end, _ = slice(start, end).indices(os.fstat(f.fileno()).st_size)
+			if end <= start:
+				return b''
+			f.seek(start)
+			return f.read(end - start)
+
+	def iter_blocks(self, start=0, end=None):
+		"""Yields the bytes in ``[start, end)`` in blocks of :data:`BLOCK_SIZE` bytes."""
+		f = self._open()
+		if f is None:
+			return
+		with f:
+			start, end, _ = slice(start, end).indices(os.fstat(f.fileno()).st_size)
+			f.seek(start)
+			remaining = end - start
+			while remaining > 0:
+				block = f.read(min(BLOCK_SIZE, remaining))
+				if not block:
+					break
+				remaining -= len(block)
+				yield block
+
+	def iter_lines(self):
+		"""Yields the lines of the file one by one."""
+		f = self._open()
+		if f is None:
+			return
+		with f:
+			for line in f:
+				yield self._decode(line.rstrip(b'\n'))
+
+	def head(self, num_lines):
+		"""Returns the first ``num_lines`` lines."""
+		lines = []
+		if num_lines <= 0:
+			return lines
+		for line in self.iter_lines():
+			lines.append(line)
+			if len(lines) == num_lines:
+				break
+		return lines
+
+	def tail(self, num_lines):
+		"""Returns the last ``num_lines`` lines. Only the end of the file is read."""
+		if num_lines <= 0:
+			return []
+		f = self._open()
+		if f is None:
+			return []
+		with f:
+			end = os.fstat(f.fileno()).st_size
+			if end == 0:
+				return []
+
+			# A line break at the end of the file does not start another line.
+			f.seek(end - 1)
+			if f.read(1) == b'\n':
+				end -= 1
+
+			# Read blocks backwards until they contain enough line breaks.
+			blocks = []
+			num_breaks = 0
+			pos = end
+			while pos > 0 and num_breaks < num_lines:
+				size = min(BLOCK_SIZE, pos)
+				pos -= size
+				f.seek(pos)
+				block = f.read(size)
+				num_breaks += block.count(b'\n')
+				blocks.append(block)
+
+		lines = b''.join(reversed(blocks)).split(b'\n')
+		return [self._decode(line) for line in lines[-num_lines:]]
+
+	def read_text(self):
+		"""Returns the whole file as a string."""
+		return self._decode(self.read_bytes())
@@ -0,0 +1,724 @@
+
+from array import array
+from collections import OrderedDict
+import csv
+import importlib
+import math
+import os
+import sys
+import yaml
+
+from . import base
+
+# Columns that identify the run of each row. All but the repetition are dictionary-encoded.
+KEY_COLUMNS = ['experiment', 'variation', 'revision', 'instance', 'repetition']
+
+# Number of rows per row group of Parquet files.
+ROW_GROUP_SIZE = 64 * 1024
+
+EXPORT_FORMATS = ['parquet', 'npz', 'csv']
+
+# Prefix of the metrics that are taken from the resource usage of runs (see add_resource_usage()).
+RESOURCE_USAGE_PREFIX = 'rusage.'
+
+class DictionaryColumn:
+	"""
+	Column of strings that stores one integer code per row. Each distinct value is stored
+	once in :attr:`categories`; missing values are encoded as ``-1``.
+	"""
+
+	def __init__(self):
+		self.categories = []
+		self.codes = array('l')
+		self._code_of = {}
+
+	def __len__(self):
+		return len(self.codes)
+
+	def __getitem__(self, i):
+		code = self.codes[i]
+		return self.categories[code] if code >= 0 else None
+
+	def __iter__(self):
+		categories = self.categories
+		for code in self.codes:
+			yield categories[code] if code >= 0 else None
+
+	def append(self, value):
+		if value is None:
+			self.codes.append(-1)
+			return
+		code = self._code_of.get(value, None)
+		if code is None:
+			code = len(self.categories)
+			self.categories.append(value)
+			self._code_of[value] = code
+		self.codes.append(code)
+
+class MetricColumn:
+	"""
+	Column of scalars of a single kind (``'bool'``, ``'int'``, ``'float'`` or ``'str'``).
+
+	Numbers are stored in typed arrays, strings are dictionary-encoded. Integer columns
+	are promoted to floats if a float value occurs. Missing values are tracked in
+	:attr:`valid`.
+	"""
+
+	_typecodes = {'bool': 'b', 'int': 'q', 'float': 'd'}
+
+	def __init__(self, name, num_rows=0):
+		self.name = name
+		self.kind = None
+		self.values = None
+		self.valid = array('b', bytes(num_rows))
+
+	def __len__(self):
+		return len(self.valid)
+
+	def __getitem__(self, i):
+		if not self.valid[i]:
+			return None
+		value = self.values[i]
+		return bool(value) if self.kind == 'bool' else value
+
+	def __iter__(self):
+		for i in range(len(self)):
+			yield self[i]
+
+	@staticmethod
+	def _kind_of(value):
+		if isinstance(value, bool):
+			return 'bool'
+		if isinstance(value, int):
+			return 'int'
+		if isinstance(value, float):
+			return 'float'
+		if isinstance(value, str):
+			return 'str'
+		return None
+
+	def _new_storage(self, kind, num_rows):
+		if kind == 'str':
+			storage = DictionaryColumn()
+			for _ in range(num_rows):
+				storage.append(None)
+			return storage
+		return array(self._typecodes[kind], bytes(num_rows * array(self._typecodes[kind]).itemsize))
+
+	def _convert(self, kind):
+		# Widens the column to the given kind (or fails if the kinds are incompatible).
+		order = ['bool', 'int', 'float']
+		if self.kind in order and kind in order:
+			if order.index(kind) < order.index(self.kind):
+				return
+			self.values = array(self._typecodes[kind], self.values)
+			self.kind = kind
+			return
+		raise RuntimeError("Metric '{}' contains values of type {} and {}".format(self.name, self.kind, kind))
+
+	def append(self, value):
+		if value is None:
+			self.append_missing()
+			return
+
+		kind = self._kind_of(value)
+		if kind is None:
+			raise RuntimeError("Metric '{}' contains a value that is not a scalar: {!r}".format(self.name, value))
+		if self.kind is None:
+			self.values = self._new_storage(kind, len(self.valid))
+			self.kind = kind
+		elif kind != self.kind:
+			self._convert(kind)
+
+		self.values.append(value)
+		self.valid.append(1)
+
+	def append_missing(self):
+		if self.kind == 'str':
+			self.values.append(None)
+		elif self.kind is not None:
+			self.values.append(0)
+		self.valid.append(0)
+
+class ResultsFrame:
+	"""
+	Columnar table of parsed results with one row per run.
+
+	The key columns (see :data:`KEY_COLUMNS`) identify the run; the variation is given
+	as a comma separated list of variant names. Each key of the dictionaries returned
+	by the parse function becomes a :class:`MetricColumn`.
+	"""
+
+	def __init__(self):
+		self.experiment = DictionaryColumn()
+		self.variation = DictionaryColumn()
+		self.revision = DictionaryColumn()
+		self.instance = DictionaryColumn()
+		self.repetition = array('l')
+		self.metrics = OrderedDict()
+		self._num_rows = 0
+
+	def __len__(self):
+		return self._num_rows
+
+	def append(self, run, result):
+		"""Appends a row. ``result`` maps metric names to scalars (or ``None`` for missing values)."""
+		if not isinstance(result, dict):
+			raise RuntimeError("Results must be dictionaries that map metric names to values, got {!r}".format(
+					result))
+
+		exp = run.experiment
+		self.experiment.append(exp.name)
+		self.variation.append(','.join(variant.name for variant in exp.variation))
+		self.revision.append(exp.revision.name if exp.revision is not None else None)
+		self.instance.append(run.instance.shortname)
+		self.repetition.append(run.repetition)
+
+		for name, value in result.items():
+			column = self.metrics.get(name, None)
+			if column is None:
+				column = MetricColumn(name, self._num_rows)
+				self.metrics[name] = column
+			column.append(value)
+		self._num_rows += 1
+
+		# Metrics that the result does not contain are missing.
+		for name, column in self.metrics.items():
+			if len(column) < self._num_rows:
+				column.append_missing()
+
+	@property
+	def column_names(self):
+		return KEY_COLUMNS + list(self.metrics.keys())
+
+	def column(self, name):
+		"""Returns the column of the given name (a :class:`DictionaryColumn`, :class:`MetricColumn` or array)."""
+		if name in KEY_COLUMNS:
+			return getattr(self, name)
+		if name not in self.metrics:
+			raise RuntimeError("Results do not contain a column '{}'".format(name))
+		return self.metrics[name]
+
+	def rows(self):
+		"""Yields one dictionary per row (with decoded values)."""
+		names = self.column_names
+		for values in zip(*[self.column(name) for name in names]):
+			yield dict(zip(names, values))
+
+	def to_arrow(self):
+		"""Returns a ``pyarrow.Table``; key columns and string metrics become dictionary arrays."""
+		pa = _import_optional('pyarrow', 'Arrow tables')
+
+		def dictionary_array(column):
+			indices = pa.array([code if code >= 0 else None for code in column.codes], type=pa.int32())
+			return pa.DictionaryArray.from_arrays(indices, pa.array(column.categories, type=pa.string()))
+
+		def metric_array(column):
+			if column.kind is None:
+				return pa.nulls(len(column))
+			if column.kind == 'str':
+				return dictionary_array(column.values)
+			arrow_type = {'bool': pa.bool_(), 'int': pa.int64(), 'float': pa.float64()}[column.kind]
+			return pa.array(list(column), type=arrow_type)
+
+		arrays = [dictionary_array(getattr(self, name)) for name in KEY_COLUMNS[:-1]]
+		arrays.append(pa.array(self.repetition, type=pa.int64()))
+		arrays.extend(metric_array(column) for column in self.metrics.values())
+		return pa.Table.from_arrays(arrays, names=self.column_names)
+
+	def to_pandas(self):
+		"""Returns a ``pandas.DataFrame``; key columns and string metrics become categoricals."""
+		pd = _import_optional('pandas', 'pandas data frames')
+
+		def categorical(column):
+			return pd.Categorical.from_codes(list(column.codes), categories=column.categories)
+
+		data = OrderedDict((name, categorical(getattr(self, name))) for name in KEY_COLUMNS[:-1])
+		data['repetition'] = list(self.repetition)
+		for name, column in self.metrics.items():
+			if column.kind == 'str':
+				data[name] = categorical(column.values)
+			else:
+				data[name] = list(column)
+		return pd.DataFrame(data)
+
+	def write_parquet(self, path, row_group_size=ROW_GROUP_SIZE):
+		pq = _import_optional('pyarrow.parquet', 'Parquet export')
+		pq.write_table(self.to_arrow(), path, row_group_size=row_group_size)
+
+	def write_npz(self, path):
+		"""
+		Writes the columns to a NumPy ``.npz`` archive.
+
+		Dictionary-encoded columns are stored as ``<name>.codes`` and ``<name>.categories``;
+		metrics are stored as ``<name>`` together with a ``<name>.valid`` mask.
+		"""
+		np = _import_optional('numpy', 'NumPy export')
+
+		arrays = {}
+		for name in KEY_COLUMNS[:-1]:
+			column = getattr(self, name)
+			arrays[name + '.codes'] = np.frombuffer(column.codes, dtype=np.int_).astype(np.int32)
+			arrays[name + '.categories'] = np.array(column.categories, dtype=str)
+		arrays['repetition'] = np.frombuffer(self.repetition, dtype=np.int_).astype(np.int64)
+		for name, column in self.metrics.items():
+			arrays[name + '.valid'] = np.frombuffer(column.valid, dtype=np.int8).astype(bool)
+			if column.kind == 'str':
+				arrays[name + '.codes'] = np.frombuffer(column.values.codes, dtype=np.int_).astype(np.int32)
+				arrays[name + '.categories'] = np.array(column.values.categories, dtype=str)
+			elif column.kind is not None:
+				dtype = {'bool': np.int8, 'int': np.int64, 'float': np.float64}[column.kind]
+				values = np.frombuffer(column.values, dtype=dtype)
+				arrays[name] = values.astype(bool) if column.kind == 'bool' else values
+		np.savez_compressed(path, **arrays)
+
+	def write_csv(self, f):
+		writer = csv.writer(f)
+		writer.writerow(self.column_names)
+		for row in self.rows():
+			writer.writerow(['' if value is None else value for value in row.values()])
+
+	def export(self, path, fmt):
+		"""Writes the results to ``path`` in one of the :data:`EXPORT_FORMATS`."""
+		if fmt == 'parquet':
+			self.write_parquet(path)
+		elif fmt == 'npz':
+			self.write_npz(path)
+		elif fmt == 'csv':
+			with open(path, 'w', newline='') as f:
+				self.write_csv(f)
+		else:
+			raise RuntimeError("Unknown export format '{}'".format(fmt))
+
+# -----------------------------------------------------------------------------------
+# Streaming statistics.
+# -----------------------------------------------------------------------------------
+
+AGGREGATE_STATS = ['count', 'mean', 'stddev', 'var', 'min', 'max', 'median', 'ci95']
+
+# Number of values for which quantiles are computed exactly; afterwards, they are estimated.
+EXACT_QUANTILE_LIMIT = 128
+
+# 0.975-quantiles of Student's t-distribution for 1 to 30 degrees of freedom.
+_T_975 = [12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+		2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+		2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042]
+
+def _t_quantile_975(df):
+	if df <= len(_T_975):
+		return _T_975[df - 1]
+	# Cornish-Fisher expansion around the normal quantile.
+	z = 1.959964
+	return (z + (z ** 3 + z) / (4 * df) + (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * df ** 2)
+			+ (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / (384 * df ** 3))
+
+class RunningStats:
+	"""Accumulates count, mean, variance (using Welford's algorithm), minimum and maximum."""
+
+	__slots__ = ['count', 'mean', '_m2', 'min', 'max']
+
+	def __init__(self):
+		self.count = 0
+		self.mean = 0.0
+		self._m2 = 0.0
+		self.min = None
+		self.max = None
+
+	def add(self, x):
+		self.count += 1
+		delta = x - self.mean
+		self.mean += delta / self.count
+		self._m2 += delta * (x - self.mean)
+		if self.min is None or x < self.min:
+			self.min = x
+		if self.max is None or x > self.max:
+			self.max = x
+
+	@property
+	def var(self):
+		"""Sample variance (or ``None`` for less than two values)."""
+		if self.count < 2:
+			return None
+		return self._m2 / (self.count - 1)
+
+	@property
+	def stddev(self):
+		var = self.var
+		return var ** 0.5 if var is not None else None
+
+	@property
+	def ci95(self):
+		"""95% confidence interval of the mean (based on Student's t-distribution) as a ``(low, high)``-tuple."""
+		if self.count < 2:
+			return None
+		half_width = _t_quantile_975(self.count - 1) * self.stddev / self.count ** 0.5
+		return (self.mean - half_width, self.mean + half_width)
+
+class QuantileSketch:
+	"""
+	Estimates a quantile in constant memory.
+
+	The first :data:`EXACT_QUANTILE_LIMIT` values are buffered and their quantile is computed
+	exactly (with linear interpolation). Afterwards, the P-square algorithm (Jain and Chlamtac,
+	1985) maintains five markers whose heights approximate the quantile.
+	"""
+
+	__slots__ = ['p', '_buffer', '_heights', '_positions', '_desired', '_increments']
+
+	def __init__(self, p):
+		self.p = p
+		self._buffer = []
+		self._heights = None
+
+	def add(self, x):
+		if self._heights is None:
+			self._buffer.append(x)
+			if len(self._buffer) > EXACT_QUANTILE_LIMIT:
+				self._init_markers()
+			return
+
+		q, n = self._heights, self._positions
+		if x < q[0]:
+			q[0] = x
+			k = 0
+		elif x >= q[4]:
+			q[4] = x
+			k = 3
+		else:
+			k = 0
+			while x >= q[k + 1]:
+				k += 1
+		for i in range(k + 1, 5):
+			n[i] += 1
+		for i in range(5):
+			self._desired[i] += self._increments[i]
+
+		for i in range(1, 4):
+			d = self._desired[i] - n[i]
+			if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+				d = 1 if d > 0 else -1
+				height = self._parabolic(i, d)
+				if not q[i - 1] < height < q[i + 1]:
+					height = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+				q[i] = height
+				n[i] += d
+
+	def _parabolic(self, i, d):
+		q, n = self._heights, self._positions
+		return q[i] + d / (n[i + 1] - n[i - 1]) * (
+				(n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+				+ (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+
+	def _init_markers(self):
+		values = sorted(self._buffer)
+		last = len(values) - 1
+		p = self.p
+		self._desired = [0, last * p / 2, last * p, last * (1 + p) / 2, last]
+		self._increments = [0, p / 2, p, (1 + p) / 2, 1]
+		# Marker positions have to be strictly increasing.
+		positions = [0]
+		for desired in self._desired[1:4]:
+			positions.append(min(max(int(round(desired)), positions[-1] + 1), last - (4 - len(positions))))
+		positions.append(last)
+		self._positions = positions
+		self._heights = [values[pos] for pos in positions]
+		self._buffer = None
+
+	def value(self):
+		if self._heights is not None:
+			return self._heights[2]
+		if not self._buffer:
+			return None
+		values = sorted(self._buffer)
+		h = (len(values) - 1) * self.p
+		lo = int(h)
+		if lo + 1 >= len(values):
+			return values[lo]
+		return values[lo] + (h - lo) * (values[lo + 1] - values[lo])
+
+def _parse_stat(stat):
+	# Returns the quantile that a statistic refers to (or None if it is not a quantile).
+	if stat == 'median':
+		return 0.5
+	if len(stat) > 1 and stat[0] == 'p':
+		try:
+			percent = float(stat[1:])
+		except ValueError:
+			percent = None
+		if percent is not None and 0 <= percent <= 100:
+			return percent / 100
+	if stat not in AGGREGATE_STATS:
+		raise RuntimeError("Unknown statistic '{}'".format(stat))
+	return None
+
+class Aggregator:
+	"""
+	Computes statistics of metrics per group of runs in a single pass and in constant memory per group.
+
+	:param metrics: Names of the metrics to aggregate. By default, all numeric metrics are aggregated.
+	:param stats: Statistics to compute: any of :data:`AGGREGATE_STATS` and percentiles
+		given as ``'p<percent>'`` (e.g., ``'p90'``).
+	:param group_by: Keys that runs are grouped by: ``'experiment'``, ``'variation'`` (a tuple
+		of variant names), ``'revision'``, ``'instance'`` and ``'repetition'``.
+	"""
+
+	def __init__(self, metrics=None, stats=('mean', 'median', 'ci95'),
+			group_by=('experiment', 'variation', 'revision', 'instance')):
+		self.metrics = list(metrics) if metrics is not None else None
+		self.stats = list(stats)
+		self.group_by = list(group_by)
+		self._quantiles = [p for p in map(_parse_stat, self.stats) if p is not None]
+		for field in self.group_by:
+			if field not in KEY_COLUMNS:
+				raise RuntimeError("Cannot group results by '{}'".format(field))
+		self._groups = OrderedDict()
+
+	def _group_key(self, run):
+		exp = run.experiment
+		fields = {
+			'experiment': lambda: exp.name,
+			'variation': lambda: tuple(variant.name for variant in exp.variation),
+			'revision': lambda: exp.revision.name if exp.revision is not None else None,
+			'instance': lambda: run.instance.shortname,
+			'repetition': lambda: run.repetition
+		}
+		return tuple(fields[field]() for field in self.group_by)
+
+	def add(self, run, result):
+		"""Adds the result (a dictionary that maps metric names to values) of a run."""
+		key = self._group_key(run)
+		group = self._groups.get(key, None)
+		if group is None:
+			group = OrderedDict()
+			self._groups[key] = group
+
+		names = self.metrics if self.metrics is not None else result.keys()
+		for name in names:
+			value = result.get(name, None)
+			# Missing and non-numeric values are skipped.
+			if isinstance(value, bool) or not isinstance(value, (int, float)):
+				continue
+			accumulators = group.get(name, None)
+			if accumulators is None:
+				accumulators = (RunningStats(), [QuantileSketch(p) for p in self._quantiles])
+				group[name] = accumulators
+			running, sketches = accumulators
+			running.add(value)
+			for sketch in sketches:
+				sketch.add(value)
+
+	def result(self):
+		"""
+		Returns an ordered dict that maps group keys (tuples in the order of ``group_by``) to
+		ordered dicts that map metric names to ordered dicts of statistics.
+		"""
+		summary = OrderedDict()
+		for key, group in self._groups.items():
+			metrics = OrderedDict()
+			for name, (running, sketches) in group.items():
+				values = OrderedDict()
+				sketch_iter = iter(sketches)
+				for stat in self.stats:
+					if _parse_stat(stat) is not None:
+						values[stat] = next(sketch_iter).value()
+					else:
+						values[stat] = getattr(running, stat)
+				metrics[name] = values
+			summary[key] = metrics
+		return summary
+
+# -----------------------------------------------------------------------------------
+# Comparison of revisions.
+# -----------------------------------------------------------------------------------
+
+def _incomplete_beta(a, b, x):
+	# Regularized incomplete beta function I_x(a, b), evaluated by a continued fraction
+	# (see Numerical Recipes, section 6.4).
+	if x <= 0:
+		return 0.0
+	if x >= 1:
+		return 1.0
+	front = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b)
+			+ a * math.log(x) + b * math.log(1 - x))
+	if x > (a + 1) / (a + b + 2):
+		return 1 - _incomplete_beta(b, a, 1 - x)
+
+	tiny = 1e-300
+	c, d = 1.0, 1 - (a + b) * x / (a + 1)
+	d = 1 / (d if abs(d) > tiny else tiny)
+	f = d
+	for m in range(1, 300):
+		for numerator in [m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+				-(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1))]:
+			d = 1 + numerator * d
+			d = 1 / (d if abs(d) > tiny else tiny)
+			c = 1 + numerator / c
+			c = c if abs(c) > tiny else tiny
+			f *= c * d
+		if abs(c * d - 1) < 1e-12:
+			break
+	return front * f / a
+
+def welch_t_test(first, second):
+	"""
+	Returns the two-sided p-value of Welch's t-test for the means of two samples
+	(given as :class:`RunningStats`), or ``None`` if one of them has less than two values.
+	"""
+	if first.count < 2 or second.count < 2:
+		return None
+	se1 = first.var / first.count
+	se2 = second.var / second.count
+	if se1 + se2 == 0:
+		return 1.0 if first.mean == second.mean else 0.0
+	t = (first.mean - second.mean) / math.sqrt(se1 + se2)
+	df = (se1 + se2) ** 2 / (se1 ** 2 / (first.count - 1) + se2 ** 2 / (second.count - 1))
+	return _incomplete_beta(df / 2, 0.5, df / (df + t * t))
+
+def geometric_mean(values):
+	values = [value for value in values if value is not None and value > 0]
+	if not values:
+		return None
+	return math.exp(sum(math.log(value) for value in values) / len(values))
+
+class ComparisonRow:
+	"""Comparison of a metric on one (experiment, variation, instance) between two revisions."""
+
+	__slots__ = ['experiment', 'variation', 'instance', 'base', 'target', 'speedup', 'p_value', 'verdict']
+
+	def __init__(self, experiment, variation, instance, base, target):
+		self.experiment = experiment
+		self.variation = variation
+		self.instance = instance
+		self.base = base
+		self.target = target
+		self.speedup = None
+		self.p_value = None
+		self.verdict = None
+
+class RevisionComparison:
+	"""
+	Compares a metric between the runs of two revisions.
+
+	Runs are matched by experiment, variation, instance and repetition; only repetitions
+	that exist for both revisions are compared. For each (experiment, variation, instance),
+	the speedup is the ratio of the means (``base / target`` if lower values are better,
+	``target / base`` otherwise), i.e., speedups above 1 are improvements. Differences are
+	tested for significance with Welch's t-test over the repetitions.
+
+	:param threshold: Relative change that is considered a regression (or improvement).
+	:param alpha: Significance level. Rows with less than two repetitions are never significant.
+	"""
+
+	def __init__(self, base, target, metric, threshold=0.05, alpha=0.05, higher_is_better=False):
+		self.base = base
+		self.target = target
+		self.metric = metric
+		self.threshold = threshold
+		self.alpha = alpha
+		self.higher_is_better = higher_is_better
+		self._values = OrderedDict()
+
+	def add(self, run, result):
+		exp = run.experiment
+		revision = exp.revision.name if exp.revision is not None else None
+		if revision not in [self.base, self.target]:
+			return
+		value = result.get(self.metric, None)
+		if isinstance(value, bool) or not isinstance(value, (int, float)):
+			return
+		key = (exp.name, tuple(variant.name for variant in exp.variation), run.instance.shortname)
+		per_revision = self._values.setdefault(key, ({}, {}))
+		per_revision[0 if revision == self.base else 1][run.repetition] = value
+
+	def rows(self):
+		"""Returns a list of :class:`ComparisonRow` objects (in the order of the runs)."""
+		rows = []
+		for (experiment, variation, instance), (base_values, target_values) in self._values.items():
+			repetitions = sorted(set(base_values).intersection(target_values))
+			if not repetitions:
+				continue
+			base, target = RunningStats(), RunningStats()
+			for rep in repetitions:
+				base.add(base_values[rep])
+				target.add(target_values[rep])
+
+			row = ComparisonRow(experiment, variation, instance, base, target)
+			numerator, denominator = (target.mean, base.mean) if self.higher_is_better else (base.mean, target.mean)
+			if denominator > 0:
+				row.speedup = numerator / denominator
+			row.p_value = welch_t_test(base, target)
+			if row.speedup is not None and row.p_value is not None and row.p_value < self.alpha:
+				if row.speedup < 1 - self.threshold:
+					row.verdict = 'regression'
+				elif row.speedup > 1 + self.threshold:
+					row.verdict = 'improvement'
+			rows.append(row)
+		return rows
+
+	def geometric_means(self, rows=None):
+		"""
+		Returns an ordered dict that maps ``(experiment, variation)`` to the geometric mean of
+		its speedups. The key ``None`` refers to the geometric mean over all rows.
+		"""
+		if rows is None:
+			rows = self.rows()
+		speedups = OrderedDict()
+		for row in rows:
+			speedups.setdefault((row.experiment, row.variation), []).append(row.speedup)
+		means = OrderedDict((key, geometric_mean(values)) for key, values in speedups.items())
+		means[None] = geometric_mean([row.speedup for row in rows])
+		return means
+
+def _import_optional(module, feature):
+	try:
+		return importlib.import_module(module)
+	except ImportError:
+		raise RuntimeError("The '{}' package is required for {}, but it is not installed".format(
+				module.split('.')[0], feature))
+
+def parse_yaml_output(run, f):
+	"""
+	Default parse function: reads a YAML (or JSON) mapping and keeps its scalar values.
+
+	Nested values are skipped.
+	"""
+	output = yaml.load(f, Loader=base.YmlLoader)
+	if not isinstance(output, dict):
+		raise RuntimeError("The output of run {}/{}[{}] is not a YAML mapping".format(
+				run.experiment.display_name, run.instance.shortname, run.repetition))
+	return {str(key): value for key, value in output.items()
+			if value is None or isinstance(value, (bool, int, float, str))}
+
+def add_resource_usage(run, result):
+	"""
+	Returns a copy of ``result`` that additionally contains the :class:`simexpal.base.ResourceUsage`
+	of the run as metrics (e.g., ``'rusage.maxrss'``).
+	"""
+	result = dict(result)
+	usage = run.get_resource_usage()
+	if usage is not None:
+		for field, value in usage.to_yml().items():
+			result[RESOURCE_USAGE_PREFIX + field] = value
+	return result
+
+def load_parse_fn(spec, basedir='.'):
+	"""
+	Resolves a parse function given as ``'<module>:<function>'``.
+
+	The module is imported from the base directory (e.g., ``'eval:parse'`` refers to
+	the function ``parse`` in ``eval.py``). ``None`` selects :func:`parse_yaml_output`.
+	"""
+	if spec is None:
+		return parse_yaml_output
+	module_name, sep, fn_name = spec.partition(':')
+	if not sep or not module_name or not fn_name:
+		raise RuntimeError("Parse functions have to be given as '<module>:<function>', got '{}'".format(spec))
+
+	basedir = os.path.abspath(basedir)
+	if basedir not in sys.path:
+		sys.path.insert(0, basedir)
+	module = importlib.import_module(module_name)
+	try:
+		return getattr(module, fn_name)
+	except AttributeError:
+		raise RuntimeError("Module '{}' does not define '{}'".format(module_name, fn_name))
@@ -0,0 +1,104 @@
+
+import subprocess
+
+# Maximal number of job IDs that are passed to a single squeue/sacct invocation.
+JOB_ID_CHUNK_SIZE = 500
+
+# Translates the compact state codes of squeue's '%t' field to Slurm's full state names
+# (i.e., the names that sacct reports).
+SQUEUE_STATE_CODES = {
+	'BF': 'BOOT_FAIL',
+	'CA': 'CANCELLED',
+	'CD': 'COMPLETED',
+	'CF': 'CONFIGURING',
+	'CG': 'COMPLETING',
+	'DL': 'DEADLINE',
+	'F': 'FAILED',
+	'NF': 'NODE_FAIL',
+	'OOM': 'OUT_OF_MEMORY',
+	'PD': 'PENDING',
+	'PR': 'PREEMPTED',
+	'R': 'RUNNING',
+	'RD': 'RESV_DEL_HOLD',
+	'RF': 'REQUEUE_FED',
+	'RH': 'REQUEUE_HOLD',
+	'RQ': 'REQUEUED',
+	'RS': 'RESIZING',
+	'RV': 'REVOKED',
+	'SE': 'SPECIAL_EXIT',
+	'SI': 'SIGNALING',
+	'SO': 'STAGE_OUT',
+	'ST': 'STOPPED',
+	'S': 'SUSPENDED',
+	'TO': 'TIMEOUT'
+}
+
+def _chunks(job_ids):
+	job_ids = list(job_ids)
+	for i in range(0, len(job_ids), JOB_ID_CHUNK_SIZE):
+		yield job_ids[i:i + JOB_ID_CHUNK_SIZE]
+
+def query_squeue(job_ids):
+	"""
+	Asks squeue about the given jobs of the current user.
+
+	Returns a dictionary that maps job IDs (``'<jobid>'`` or ``'<jobid>_<index>'`` for
+	job array elements) to Slurm state names. Jobs that have left the queue are omitted.
+	"""
+
+	states = {}
+	for chunk in _chunks(job_ids):
+		# -h omits the header line.
+		# -r outputs one job array element per line.
+		process = subprocess.run(['squeue', '-h', '-r', '--me', '-j', ','.join(chunk), '-o', '%i %t'],
+				stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+		if process.returncode != 0:
+			# squeue fails if none of the given jobs is known to slurmctld anymore.
+			if b'Invalid job id' in process.stderr:
+				continue
+			raise RuntimeError('squeue failed: {}'.format(process.stderr.decode().strip()))
+
+		for line in process.stdout.decode().splitlines():
+			entry = line.split()
+			if len(entry) != 2:
+				continue
+			states[entry[0]] = SQUEUE_STATE_CODES.get(entry[1], entry[1])
+	return states
+
+def query_sacct(job_ids):
+	"""
+	Asks the Slurm accounting database about the given jobs.
+
+	Returns a dictionary that maps job IDs to ``(state, elapsed)``-tuples, where ``state``
+	is a Slurm state name and ``elapsed`` is the wall time of the job in seconds.
+	Jobs that are unknown to sacct are omitted. If job accounting is not available,
+	an empty dictionary is returned.
+	"""
+
+	job_ids = set(job_ids)
+	results = {}
+	for chunk in _chunks(sorted(job_ids)):
+		# -n omits the header line, -P separates fields by '|'.
+		# -X only reports allocations (and not job steps).
+		try:
+			process = subprocess.run(['sacct', '-n', '-P', '-X', '-j', ','.join(chunk),
+					'--format=JobID,State,ElapsedRaw'],
+					stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+		except FileNotFoundError:
+			return results
+		if process.returncode != 0:
+			# For example, if accounting storage is disabled.
+			return results
+
+		for line in process.stdout.decode().splitlines():
+			entry = line.split('|')
+			if len(entry) != 3 or entry[0] not in job_ids:
+				continue
+			# Cancelled jobs are reported as 'CANCELLED by <uid>'.
+			state = entry[1].split()[0] if entry[1] else None
+			try:
+				elapsed = float(entry[2])
+			except ValueError:
+				elapsed = None
+			results[entry[0]] = (state, elapsed)
+	return results
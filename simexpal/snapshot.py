@@ -0,0 +1,144 @@
+import array
+import hashlib
+import json
+import os
+import sys
+
+from . import util
+
+# Increment this whenever the layout of the snapshot changes.
+SNAPSHOT_VERSION = 3
+
+# Upper bound on the length of the header line (that stores the key).
+MAX_HEADER_SIZE = 4096
+
+# Type code of the run columns (see simexpal.base.RunTable).
+RUN_COLUMN_TYPECODE = 'l'
+
+def _file_digest(path):
+	try:
+		with open(path, 'rb') as f:
+			return hashlib.sha1(f.read()).hexdigest()
+	except FileNotFoundError:
+		return None
+
+def _file_stamp(path):
+	try:
+		st = os.stat(path)
+	except FileNotFoundError:
+		return None
+	return [st.st_mtime_ns, st.st_size]
+
+def compute_snapshot_key(basedir, setup_file='experiments.yml'):
+	"""
+	Computes the key that identifies a compiled configuration.
+
+	The key covers the setup file and the launchers.yml file (by content), the
+	validation schemas and the matrix expansion code (by modification time).
+	It also covers the binary layout of the run columns. The key is a JSON-compatible list.
+	"""
+
+	pkg_dir = os.path.abspath(os.path.dirname(__file__))
+	return [SNAPSHOT_VERSION,
+			sys.byteorder,
+			array.array(RUN_COLUMN_TYPECODE).itemsize,
+			_file_digest(os.path.join(basedir, setup_file)),
+			_file_digest(os.path.expanduser('~/.simexpal/launchers.yml')),
+			_file_stamp(os.path.join(pkg_dir, 'schemes', 'experiments.json')),
+			_file_stamp(os.path.join(pkg_dir, 'schemes', 'launchers.json')),
+			_file_stamp(os.path.join(pkg_dir, 'base.py'))]
+
+class ConfigSnapshot:
+	"""
+	Compiled form of an experiments.yml file that is stored in the base directory.
+
+	It holds the validated YAML and, once the run matrix has been expanded, the
+	experiments and runs of the matrix (in canonical order). Experiments are stored
+	as ``(experiment, revision, variants)`` name tuples; runs are stored as the
+	columns of a :class:`simexpal.base.RunTable` (experiment indices, instance
+	indices and repetitions).
+
+	The file consists of a JSON header line that holds the key, a JSON line that holds
+	the YAML, the experiments and the number of runs, followed by the raw bytes of the
+	run columns. No code is executed while loading a snapshot, i.e., snapshots from
+	untrusted sources (e.g., cloned repositories) are harmless.
+	"""
+
+	def __init__(self, path, key):
+		self.path = path
+		self.key = key
+		self.yml = None
+		self.experiments = None
+		self.runs = None
+
+	@property
+	def has_matrix(self):
+		return self.experiments is not None and self.runs is not None
+
+	def discard_matrix(self):
+		self.experiments = None
+		self.runs = None
+
+	def save(self):
+		body = {'yml': self.yml, 'experiments': self.experiments, 'num_runs': None}
+		columns = None
+		if self.has_matrix:
+			columns = [array.array(RUN_COLUMN_TYPECODE, col) for col in self.runs]
+			body['num_runs'] = len(columns[0])
+
+		# YAML can hold values that JSON cannot represent faithfully (e.g., dates or
+		# non-string keys). Such configurations are not snapshotted.
+		try:
+			body_json = json.dumps(body)
+		except (TypeError, ValueError):
+			return
+		if json.loads(body_json)['yml'] != self.yml:
+			return
+
+		tmp_path = '{}.{}.tmp'.format(self.path, os.getpid())
+		with open(tmp_path, 'wb') as f:
+			f.write(json.dumps({'key': self.key}).encode() + b'\n')
+			f.write(body_json.encode() + b'\n')
+			if columns is not None:
+				for col in columns:
+					col.tofile(f)
+		os.replace(tmp_path, self.path)
+
+def load_snapshot(basedir, setup_file='experiments.yml'):
+	"""
+	Loads the snapshot of the given base directory.
+
+	If no snapshot exists or the snapshot is outdated, the returned snapshot is
+	empty (i.e., its ``yml`` attribute is ``None``).
+	"""
+
+	snapshot = ConfigSnapshot(os.path.join(basedir, util.SIMEX_SNAPSHOT),
+			compute_snapshot_key(basedir, setup_file))
+	try:
+		with open(snapshot.path, 'rb') as f:
+			# Check the key before reading anything else.
+			header = json.loads(f.readline(MAX_HEADER_SIZE).decode())
+			if not isinstance(header, dict) or header.get('key', None) != snapshot.key:
+				return snapshot
+
+			body = json.loads(f.readline().decode())
+			yml, experiments, num_runs = body['yml'], body['experiments'], body['num_runs']
+			runs = None
+			if num_runs is not None:
+				runs = []
+				for _ in range(3):
+					col = array.array(RUN_COLUMN_TYPECODE)
+					col.fromfile(f, num_runs)
+					runs.append(col)
+	except FileNotFoundError:
+		return snapshot
+	except Exception:
+		# Treat corrupted snapshots (e.g., written by incompatible versions) as outdated.
+		return snapshot
+
+	if not isinstance(yml, dict):
+		return snapshot
+	snapshot.yml = yml
+	snapshot.experiments = experiments
+	snapshot.runs = runs
+	return snapshot
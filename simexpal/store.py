@@ -0,0 +1,395 @@
+
+import contextlib
+import json
+import os
+import sqlite3
+
+from . import util
+
+DEFAULT_STATUS_STORE = 'sqlite'
+SQLITE_BUSY_TIMEOUT = 60
+SQLITE_SCHEMA_VERSION = 1
+
+BUILD_PHASES = [util.CHECKOUT, util.REGENERATED, util.CONFIGURED, util.COMPILED, util.INSTALLED]
+
+class StatusStore:
+	"""
+	Persistent cache of run statuses, build phases, setup file validation results,
+	the states of Slurm jobs and parsed run outputs.
+
+	Run entries are kept in memory once they have been loaded. Only entries that
+	changed since the last :meth:`flush` are written back to the backend.
+	"""
+
+	def __init__(self, path):
+		self.path = path
+		self._runs = None
+		self._changed = {}
+		self._deleted = set()
+
+	def _ensure_runs(self):
+		if self._runs is None:
+			self._runs = self._load_runs()
+		return self._runs
+
+	def preload(self):
+		"""Loads all run entries into memory. Afterwards, reading entries is thread-safe."""
+		self._ensure_runs()
+
+	def get_run(self, internal_name, instance):
+		"""Returns the cached ``(status, last_mod)``-tuple of a run or ``None``."""
+		return self._ensure_runs().get((internal_name, instance), None)
+
+	def put_run(self, internal_name, instance, status, last_mod):
+		runs = self._ensure_runs()
+		key = (internal_name, instance)
+		entry = (int(status), last_mod)
+		if runs.get(key, None) == entry:
+			return
+		runs[key] = entry
+		self._changed[key] = entry
+		self._deleted.discard(key)
+
+	def delete_run(self, internal_name, instance):
+		runs = self._ensure_runs()
+		key = (internal_name, instance)
+		if runs.pop(key, None) is None:
+			return
+		self._changed.pop(key, None)
+		self._deleted.add(key)
+
+	def all_runs(self):
+		"""Yields ``((internal_name, instance), (status, last_mod))`` for all cached runs."""
+		yield from self._ensure_runs().items()
+
+	def flush(self):
+		if not self._changed and not self._deleted:
+			return
+		self._write_runs(self._changed, self._deleted)
+		self._changed = {}
+		self._deleted = set()
+
+	def exists(self):
+		"""Returns whether the backend has been created (i.e., something has been written before)."""
+		return os.path.isfile(self.path)
+
+	def close(self):
+		pass
+
+	# Backend interface.
+
+	def _load_runs(self):
+		raise NotImplementedError()
+
+	def _write_runs(self, changed, deleted):
+		raise NotImplementedError()
+
+	def get_build_phases(self, build_name):
+		raise NotImplementedError()
+
+	def init_build(self, build_name):
+		raise NotImplementedError()
+
+	def mark_build_phase(self, build_name, phase):
+		raise NotImplementedError()
+
+	def get_validation(self):
+		raise NotImplementedError()
+
+	def update_validation(self, entries):
+		raise NotImplementedError()
+
+	def get_slurm_jobs(self, job_ids):
+		"""Returns a dictionary that maps the given job IDs to cached ``(status, elapsed, expires)``-tuples."""
+		raise NotImplementedError()
+
+	def put_slurm_jobs(self, entries):
+		raise NotImplementedError()
+
+	def get_results(self, parser, keys):
+		"""
+		Returns the cached results of the given parser for the given runs.
+
+		:param keys: Iterable of ``(internal_name, instance)`` keys of runs.
+		:return: Dictionary that maps the keys of runs that have a cached result to
+			``(mtime_ns, size, data)``-tuples, where ``data`` is the JSON-encoded result.
+		"""
+		raise NotImplementedError()
+
+	def put_results(self, parser, entries):
+		raise NotImplementedError()
+
+class SqliteStatusStore(StatusStore):
+	"""
+	Stores the cache in an SQLite database in WAL mode.
+
+	Multiple simexpal processes can use the same database concurrently;
+	writers only ever touch the rows that they changed.
+	"""
+
+	def __init__(self, path, legacy_cache_path=None):
+		super().__init__(path)
+		self._legacy_cache_path = legacy_cache_path
+		self._db = None
+
+	def _connect(self, create):
+		# The database is only created on the first write (or to take over a legacy
+		# .simex.cache file), such that merely reading does not touch the base directory.
+		# Returns None if the database does not exist and create is false.
+		if self._db is not None:
+			return self._db
+		if (not create and not os.path.isfile(self.path)
+				and (self._legacy_cache_path is None or not os.path.isfile(self._legacy_cache_path))):
+			return None
+
+		# We manage transactions manually (see _transaction()).
+		self._db = sqlite3.connect(self.path, timeout=SQLITE_BUSY_TIMEOUT, isolation_level=None)
+
+		# WAL mode is not available on all file systems (e.g., NFS without shared memory support).
+		# In that case, SQLite keeps using its default rollback journal.
+		self._db.execute('PRAGMA journal_mode=WAL')
+		self._db.execute('PRAGMA synchronous=NORMAL')
+
+		with self._transaction():
+			version = self._db.execute('PRAGMA user_version').fetchone()[0]
+			if version < SQLITE_SCHEMA_VERSION:
+				self._create_schema()
+				if version == 0 and self._legacy_cache_path is not None:
+					self._import_legacy_cache(self._legacy_cache_path)
+				self._db.execute('PRAGMA user_version={}'.format(SQLITE_SCHEMA_VERSION))
+		return self._db
+
+	def _query(self, sql, parameters=()):
+		db = self._connect(False)
+		if db is None:
+			return iter(())
+		return db.execute(sql, parameters)
+
+	@contextlib.contextmanager
+	def _transaction(self):
+		# BEGIN IMMEDIATE acquires the write lock upfront. This avoids deadlocks
+		# between processes that would otherwise try to upgrade read locks.
+		self._connect(True)
+		self._db.execute('BEGIN IMMEDIATE')
+		try:
+			yield
+		except BaseException:
+			self._db.execute('ROLLBACK')
+			raise
+		self._db.execute('COMMIT')
+
+	def _create_schema(self):
+		self._db.execute('CREATE TABLE IF NOT EXISTS runs ('
+				'internal_name TEXT NOT NULL, instance TEXT NOT NULL,'
+				'status INTEGER NOT NULL, last_mod REAL,'
+				'PRIMARY KEY (internal_name, instance)) WITHOUT ROWID')
+		self._db.execute('CREATE TABLE IF NOT EXISTS builds ('
+				'name TEXT NOT NULL, phase TEXT NOT NULL, done INTEGER NOT NULL,'
+				'PRIMARY KEY (name, phase)) WITHOUT ROWID')
+		self._db.execute('CREATE TABLE IF NOT EXISTS validation ('
+				'name TEXT PRIMARY KEY, last_mod REAL)')
+		self._db.execute('CREATE TABLE IF NOT EXISTS slurm_jobs ('
+				'job_id TEXT PRIMARY KEY, status INTEGER NOT NULL, elapsed REAL, expires REAL)')
+		self._db.execute('CREATE TABLE IF NOT EXISTS results ('
+				'parser TEXT NOT NULL, internal_name TEXT NOT NULL, instance TEXT NOT NULL,'
+				'mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL, data TEXT NOT NULL,'
+				'PRIMARY KEY (parser, internal_name, instance)) WITHOUT ROWID')
+
+	def _import_legacy_cache(self, legacy_cache_path):
+		# Take over the build phases from a .simex.cache file written by previous versions.
+		# Statuses and validation results are cheap to recompute, so we do not import them.
+		try:
+			with open(legacy_cache_path, 'r') as f:
+				cache = json.load(f)
+		except (FileNotFoundError, ValueError):
+			return
+
+		for build_name, phases in cache.items():
+			if build_name in ['status', 'validation', 'slurm'] or not isinstance(phases, dict):
+				continue
+			self._db.executemany('INSERT OR REPLACE INTO builds (name, phase, done) VALUES (?, ?, ?)',
+					[(build_name, phase, int(bool(done))) for phase, done in phases.items()])
+
+	def _load_runs(self):
+		cursor = self._query('SELECT internal_name, instance, status, last_mod FROM runs')
+		return {(name, instance): (status, last_mod) for name, instance, status, last_mod in cursor}
+
+	def _write_runs(self, changed, deleted):
+		with self._transaction():
+			self._db.executemany('DELETE FROM runs WHERE internal_name = ? AND instance = ?', deleted)
+			self._db.executemany('INSERT OR REPLACE INTO runs (internal_name, instance, status, last_mod)'
+					' VALUES (?, ?, ?, ?)',
+					[(name, instance, status, last_mod) for (name, instance), (status, last_mod) in changed.items()])
+
+	def get_build_phases(self, build_name):
+		phases = {phase: False for phase in BUILD_PHASES}
+		cursor = self._query('SELECT phase, done FROM builds WHERE name = ?', (build_name,))
+		for phase, done in cursor:
+			phases[phase] = bool(done)
+		return phases
+
+	def init_build(self, build_name):
+		with self._transaction():
+			self._db.executemany('INSERT OR IGNORE INTO builds (name, phase, done) VALUES (?, ?, 0)',
+					[(build_name, phase) for phase in BUILD_PHASES])
+
+	def mark_build_phase(self, build_name, phase):
+		assert phase is not None
+		with self._transaction():
+			self._db.execute('INSERT OR REPLACE INTO builds (name, phase, done) VALUES (?, ?, 1)',
+					(build_name, phase))
+
+	def get_validation(self):
+		cursor = self._query('SELECT name, last_mod FROM validation')
+		return {name: last_mod for name, last_mod in cursor}
+
+	def update_validation(self, entries):
+		with self._transaction():
+			self._db.executemany('INSERT OR REPLACE INTO validation (name, last_mod) VALUES (?, ?)',
+					entries.items())
+
+	def get_slurm_jobs(self, job_ids):
+		job_ids = list(job_ids)
+		entries = {}
+		# Stay below SQLite's limit on the number of host parameters.
+		for i in range(0, len(job_ids), 500):
+			chunk = job_ids[i:i + 500]
+			cursor = self._query('SELECT job_id, status, elapsed, expires FROM slurm_jobs'
+					' WHERE job_id IN ({})'.format(', '.join('?' * len(chunk))), chunk)
+			for job_id, status, elapsed, expires in cursor:
+				entries[job_id] = (status, elapsed, expires)
+		return entries
+
+	def put_slurm_jobs(self, entries):
+		with self._transaction():
+			self._db.executemany('INSERT OR REPLACE INTO slurm_jobs (job_id, status, elapsed, expires)'
+					' VALUES (?, ?, ?, ?)',
+					[(job_id, int(status), elapsed, expires) for job_id, (status, elapsed, expires) in entries.items()])
+
+	def get_results(self, parser, keys):
+		keys = set(keys)
+		names = sorted({name for name, _ in keys})
+		instances = sorted({instance for _, instance in keys})
+		entries = {}
+		# Stay below SQLite's limit on the number of host parameters. The query returns a
+		# superset of the requested keys (all combinations of names and instances).
+		for i in range(0, len(names), 250):
+			name_chunk = names[i:i + 250]
+			for j in range(0, len(instances), 250):
+				instance_chunk = instances[j:j + 250]
+				cursor = self._query('SELECT internal_name, instance, mtime_ns, size, data FROM results'
+						' WHERE parser = ? AND internal_name IN ({}) AND instance IN ({})'.format(
+							', '.join('?' * len(name_chunk)), ', '.join('?' * len(instance_chunk))),
+						[parser] + name_chunk + instance_chunk)
+				for name, instance, mtime_ns, size, data in cursor:
+					if (name, instance) in keys:
+						entries[(name, instance)] = (mtime_ns, size, data)
+		return entries
+
+	def put_results(self, parser, entries):
+		with self._transaction():
+			self._db.executemany('INSERT OR REPLACE INTO results'
+					' (parser, internal_name, instance, mtime_ns, size, data) VALUES (?, ?, ?, ?, ?, ?)',
+					[(parser, name, instance, mtime_ns, size, data)
+						for (name, instance), (mtime_ns, size, data) in entries.items()])
+
+	def close(self):
+		if self._db is not None:
+			self._db.close()
+			self._db = None
+
+class JsonStatusStore(StatusStore):
+	"""
+	Stores the cache in a single JSON file (the format used by previous versions of simexpal).
+
+	Every write rewrites the whole file; this backend is not safe for concurrent use.
+	"""
+
+	def _read_cache(self):
+		# The file is only created on the first write.
+		try:
+			with open(self.path, 'r') as f:
+				return json.load(f)
+		except FileNotFoundError:
+			return {'status': {}, 'validation': {}}
+
+	def _write_cache(self, cache):
+		with open(self.path, 'w') as f:
+			json.dump(cache, f)
+
+	def _load_runs(self):
+		runs = {}
+		for internal_name, instances in self._read_cache().get('status', {}).items():
+			for instance, entry in instances.items():
+				runs[(internal_name, instance)] = (entry['status'], entry['last_mod'])
+		return runs
+
+	def _write_runs(self, changed, deleted):
+		status_dict = {}
+		for (internal_name, instance), (status, last_mod) in self._runs.items():
+			status_dict.setdefault(internal_name, {})[instance] = {'status': status, 'last_mod': last_mod}
+
+		cache = self._read_cache()
+		cache['status'] = status_dict
+		self._write_cache(cache)
+
+	def get_build_phases(self, build_name):
+		phases = {phase: False for phase in BUILD_PHASES}
+		phases.update(self._read_cache().get(build_name, {}))
+		return phases
+
+	def init_build(self, build_name):
+		cache = self._read_cache()
+		if build_name not in cache:
+			cache[build_name] = {phase: False for phase in BUILD_PHASES}
+			self._write_cache(cache)
+
+	def mark_build_phase(self, build_name, phase):
+		assert phase is not None
+		cache = self._read_cache()
+		cache.setdefault(build_name, {phase: False for phase in BUILD_PHASES})[phase] = True
+		self._write_cache(cache)
+
+	def get_validation(self):
+		return self._read_cache().get('validation', {})
+
+	def update_validation(self, entries):
+		cache = self._read_cache()
+		cache.setdefault('validation', {}).update(entries)
+		self._write_cache(cache)
+
+	def get_slurm_jobs(self, job_ids):
+		slurm_dict = self._read_cache().get('slurm', {})
+		return {job_id: tuple(slurm_dict[job_id]) for job_id in job_ids if job_id in slurm_dict}
+
+	def put_slurm_jobs(self, entries):
+		cache = self._read_cache()
+		cache.setdefault('slurm', {}).update({job_id: [int(status), elapsed, expires]
+				for job_id, (status, elapsed, expires) in entries.items()})
+		self._write_cache(cache)
+
+	# This backend rewrites the whole file on every write, so parsed results are not cached.
+
+	def get_results(self, parser, keys):
+		return {}
+
+	def put_results(self, parser, entries):
+		pass
+
+def open_store(basedir, backend=None):
+	"""
+	Opens the status store of the given base directory.
+
+	:param backend: Either ``'sqlite'`` or ``'json'``. Defaults to :data:`DEFAULT_STATUS_STORE`.
+	"""
+
+	if backend is None:
+		backend = DEFAULT_STATUS_STORE
+
+	if backend == 'sqlite':
+		return SqliteStatusStore(os.path.join(basedir, util.SIMEX_DB),
+				legacy_cache_path=os.path.join(basedir, util.SIMEX_CACHE))
+	elif backend == 'json':
+		return JsonStatusStore(os.path.join(basedir, util.SIMEX_CACHE))
+	else:
+		raise RuntimeError("Unknown status store backend '{}'".format(backend))
@@ -1,4 +1,5 @@
 
+import contextlib
 import errno
 import os
 import re
@@ -16,6 +17,8 @@ REGENERATED = "regeneration_done"
 CHECKOUT = "checkout_done"
 
 SIMEX_CACHE = "./.simex.cache"
+SIMEX_DB = "./.simex.db"
+SIMEX_SNAPSHOT = "./.simex.snapshot"
 
 def expand_at_params(s, fn, listfn=None):
 	def subfn(m):
@@ -98,7 +101,7 @@ def read_json_file(json_file):
 		last_mod = os.fstat(f.fileno()).st_mtime
 	return json_dict, last_mod
 
-def validate_setup_file(basedir, setup_file, setup_file_schema_name):
+def validate_setup_file(basedir, setup_file, setup_file_schema_name, store=None):
 	""" Reads, validates and sanitizes the setup file
 	"""
 
@@ -132,12 +135,13 @@ def validate_setup_file(basedir, setup_file, setup_file_schema_name):
 
 	cur_file_path = os.path.abspath(os.path.dirname(__file__))
 
-	validation_cache_dict = {}
-	try:
-		with open(os.path.join(basedir, SIMEX_CACHE), 'r') as cachefile:
-			validation_cache_dict = json.load(cachefile)["validation"]
-	except FileNotFoundError:
-		pass
+	if store is None:
+		from simexpal.store import open_store
+
+		with contextlib.closing(open_store(basedir)) as store:
+			return validate_setup_file(basedir, setup_file, setup_file_schema_name, store=store)
+
+	validation_cache_dict = store.get_validation()
 
 	# Validate setup file and potentially cache results.
 	setup_file_path = os.path.join(basedir, setup_file)
@@ -188,13 +192,9 @@ def validate_setup_file(basedir, setup_file, setup_file_schema_name):
 		else:
 			do_exit = True
 
-	if writeback_cache:
-		if os.path.isfile(os.path.join(basedir, SIMEX_CACHE)):
-			with open(os.path.join(basedir, SIMEX_CACHE), 'r') as cachefile:
-				cache = json.load(cachefile)
-			cache["validation"] = validation_cache_dict
-			with open(os.path.join(basedir, SIMEX_CACHE), 'w') as cachefile:
-				json.dump(cache, cachefile)
+	# Validation results alone are not worth creating the store.
+	if writeback_cache and store.exists():
+		store.update_validation(validation_cache_dict)
 
 	if do_exit:
 		sys.exit(1)
@@ -214,6 +214,44 @@ def compute_network_size(path, out):
 	}
 	yaml.dump(data, out, default_flow_style=False)
 
+def get_mtime(path):
+	try:
+		return os.stat(path).st_mtime
+	except FileNotFoundError:
+		return None
+
+class DirectoryListing:
+	"""
+	Maps the names of the files in a directory to their modification times.
+
+	The directory is read by a single scandir() call. Files are only stat()ed when
+	their modification time is requested; file systems that return attributes
+	together with directory entries (e.g., NFS with READDIRPLUS) can answer those
+	from their attribute cache.
+	"""
+
+	def __init__(self, path):
+		self.path = path
+		self._entries = {}
+		try:
+			with os.scandir(path) as it:
+				for entry in it:
+					self._entries[entry.name] = entry
+		except FileNotFoundError:
+			pass
+
+	def __contains__(self, name):
+		return name in self._entries
+
+	def get_mtime(self, name):
+		entry = self._entries.get(name, None)
+		if entry is None:
+			return None
+		try:
+			return entry.stat().st_mtime
+		except FileNotFoundError:
+			return None
+
 def ensure_list_type(arg):
 	if isinstance(arg, list):
 		return arg
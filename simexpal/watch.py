@@ -0,0 +1,283 @@
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import time
+
+# Constants from <sys/inotify.h>.
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+# The status of a run only depends on the existence of files and on their modification
+# time at creation (simexpal writes .run and .status files by renaming temporary files).
+# Hence, we do not need to listen for IN_MODIFY, which would fire for all output.
+WATCH_MASK = (IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO
+		| IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+
+_EVENT_HEADER = struct.Struct('iIII')
+
+DEFAULT_POLL_INTERVAL = 2
+
+class Watcher:
+	"""
+	Watches a set of directories for files that are created, renamed or deleted.
+
+	Directories that do not exist yet are picked up once they appear, as long as
+	one of the given ``parents`` directories (e.g., ``output/`` and ``aux/``) exists
+	when they are created.
+	"""
+
+	def __init__(self, dirs, parents=()):
+		self.dirs = list(dirs)
+		self.parents = list(parents)
+
+	def wait(self, timeout=None):
+		"""
+		Waits until at least one of the directories changes (or until the timeout expires).
+
+		Returns the set of changed directories. Directories that were created since
+		the last call are also reported.
+		"""
+		raise NotImplementedError()
+
+	def close(self):
+		pass
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.close()
+
+class InotifyWatcher(Watcher):
+	"""Watcher that is based on Linux' inotify API (accessed through ctypes)."""
+
+	def __init__(self, dirs, parents=()):
+		super().__init__(dirs, parents)
+
+		self._libc = _load_libc()
+		if self._libc is None:
+			raise OSError(errno.ENOSYS, 'inotify is not available')
+
+		self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+		if self._fd < 0:
+			err = ctypes.get_errno()
+			raise OSError(err, os.strerror(err))
+
+		self._paths = {} # Maps watch descriptors to paths.
+		self._watched = set()
+		try:
+			self._add_missing_watches()
+		except OSError:
+			# For example, if the limit of inotify watches is exceeded.
+			self.close()
+			raise
+
+	def _add_watch(self, path):
+		wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+		if wd < 0:
+			err = ctypes.get_errno()
+			if err in [errno.ENOENT, errno.ENOTDIR]:
+				return False
+			raise OSError(err, os.strerror(err), path)
+		self._paths[wd] = path
+		self._watched.add(path)
+		return True
+
+	def _add_missing_watches(self):
+		added = set()
+		for path in self.parents + self.dirs:
+			if path in self._watched:
+				continue
+			if self._add_watch(path):
+				added.add(path)
+		return added
+
+	def _read_events(self):
+		changed = set()
+		overflow = False
+		rescan = False
+		while True:
+			try:
+				buf = os.read(self._fd, 64 * 1024)
+			except BlockingIOError:
+				break
+			offset = 0
+			while offset < len(buf):
+				wd, mask, _, length = _EVENT_HEADER.unpack_from(buf, offset)
+				offset += _EVENT_HEADER.size + length
+
+				if mask & IN_Q_OVERFLOW:
+					overflow = True
+					continue
+				path = self._paths.get(wd, None)
+				if path is None:
+					continue
+				if mask & IN_IGNORED:
+					# The directory was deleted (or moved away).
+					del self._paths[wd]
+					self._watched.discard(path)
+				changed.add(path)
+				if path in self.parents:
+					rescan = True
+
+		if overflow:
+			changed.update(self.dirs)
+		if overflow or rescan:
+			changed.update(self._add_missing_watches())
+		return changed.intersection(self.dirs)
+
+	def wait(self, timeout=None):
+		deadline = None
+		if timeout is not None:
+			deadline = time.monotonic() + timeout
+
+		while True:
+			remaining = None
+			if deadline is not None:
+				remaining = max(0, deadline - time.monotonic())
+			readable, _, _ = select.select([self._fd], [], [], remaining)
+			if not readable:
+				return set()
+			changed = self._read_events()
+			# Events for parent directories do not necessarily affect any directory of interest.
+			if changed:
+				return changed
+
+	def close(self):
+		if self._fd >= 0:
+			os.close(self._fd)
+			self._fd = -1
+
+class PollingWatcher(Watcher):
+	"""
+	Fallback watcher that periodically compares the modification times of the directories.
+
+	Only the directories themselves are stat()ed, not the files inside them.
+	"""
+
+	def __init__(self, dirs, parents=(), interval=DEFAULT_POLL_INTERVAL):
+		super().__init__(dirs, parents)
+		self.interval = interval
+		self._stamps = {path: self._stamp(path) for path in self.dirs}
+
+	@staticmethod
+	def _stamp(path):
+		try:
+			return os.stat(path).st_mtime_ns
+		except FileNotFoundError:
+			return None
+
+	def wait(self, timeout=None):
+		deadline = None
+		if timeout is not None:
+			deadline = time.monotonic() + timeout
+
+		while True:
+			changed = set()
+			for path in self.dirs:
+				stamp = self._stamp(path)
+				if stamp != self._stamps[path]:
+					self._stamps[path] = stamp
+					changed.add(path)
+			if changed:
+				return changed
+
+			delay = self.interval
+			if deadline is not None:
+				delay = min(delay, deadline - time.monotonic())
+				if delay <= 0:
+					return set()
+			time.sleep(delay)
+
+def _load_libc():
+	try:
+		libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+		libc.inotify_init1.argtypes = [ctypes.c_int]
+		libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+	except (OSError, AttributeError):
+		return None
+	return libc
+
+def open_watcher(dirs, parents=(), poll_interval=DEFAULT_POLL_INTERVAL):
+	"""Returns an :class:`InotifyWatcher` if inotify is available and a :class:`PollingWatcher` otherwise."""
+
+	try:
+		return InotifyWatcher(dirs, parents)
+	except OSError:
+		return PollingWatcher(dirs, parents, interval=poll_interval)
+
+def watch_statuses(cfg, runs, interval=1.0, timeout=None, workers=None):
+	"""
+	Yields the statuses of the given runs whenever they (might) have changed.
+
+	The first list of statuses is yielded immediately. Afterwards, runs are refreshed
+	whenever files in their output or aux directories change. Jobs can also end without
+	touching any file (e.g., if Slurm cancels a pending job or kills a job that runs out
+	of time). Hence, runs that are in submission, submitted or started are additionally
+	refreshed at least every ``timeout`` seconds.
+
+	:param interval: Minimal number of seconds between two refreshes. Changes that happen
+		in the meantime are collected.
+	:param timeout: By default, :data:`simexpal.base.SLURM_STATUS_TTL`.
+	:param workers: See :meth:`simexpal.base.Config.refresh_statuses`.
+	"""
+
+	from .base import Status, SLURM_STATUS_TTL
+
+	if timeout is None:
+		timeout = SLURM_STATUS_TTL
+
+	runs = list(runs)
+	statuses = cfg.refresh_statuses(runs, workers=workers)
+	cfg.writeback_status_cache()
+
+	# Map the output and aux directories to the runs that they affect.
+	runs_by_dir = {}
+	for i, run in enumerate(runs):
+		runs_by_dir.setdefault(run.experiment.output_subdir, []).append(i)
+		runs_by_dir.setdefault(run.experiment.aux_subdir, []).append(i)
+	parents = [cfg.basedir, os.path.join(cfg.basedir, 'output'), os.path.join(cfg.basedir, 'aux')]
+
+	with open_watcher(runs_by_dir.keys(), parents) as watcher:
+		yield list(statuses)
+		while True:
+			changed = watcher.wait(timeout)
+
+			# Bound the refresh rate; collect all changes that happen in the meantime.
+			deadline = time.monotonic() + interval
+			while True:
+				remaining = deadline - time.monotonic()
+				if remaining <= 0:
+					break
+				changed |= watcher.wait(remaining)
+
+			indices = {i for path in changed for i in runs_by_dir[path]}
+
+			# The cached statuses of these runs are only invalidated by file changes.
+			# Drop them, such that the launchers are asked again (Slurm is queried at
+			# most once per SLURM_STATUS_TTL).
+			cfg.queue_queried = False
+			for i, status in enumerate(statuses):
+				if status in [Status.IN_SUBMISSION, Status.SUBMITTED, Status.STARTED]:
+					runs[i].purge_status_cache_dict()
+					indices.add(i)
+
+			indices = sorted(indices)
+			new_statuses = cfg.refresh_statuses([runs[i] for i in indices], workers=workers)
+			for i, status in zip(indices, new_statuses):
+				statuses[i] = status
+			cfg.writeback_status_cache()
+			yield list(statuses)
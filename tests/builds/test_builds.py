@@ -1,7 +1,6 @@
 
 import os
 import shutil
-import json
 import pytest
 
 from simexpal import base
@@ -20,24 +19,22 @@ def test_simex_d_vcs_less():
 
     build.make_builds(cfg, revision, [vcs_less_build.info], ['main'], wanted_phases)
 
-    def check_cache_containment(cache_entries, dir, build_name):
-        assert os.path.isfile(os.path.join(dir, util.SIMEX_CACHE))
-        with open(os.path.join(dir, util.SIMEX_CACHE), "r") as cachefile:
-            cache = json.load(cachefile)
-            for cache_entry in cache_entries:
-                assert cache_entry in cache[build_name]
+    def check_cache_containment(cache_entries, cfg, build_name):
+        assert os.path.isfile(cfg.status_store.path)
+        phases = cfg.status_store.get_build_phases(build_name)
+        for cache_entry in cache_entries:
+            assert phases[cache_entry]
 
-    check_cache_containment(wanted_cache_entries, vcs_less_build._cfg.basedir, 'vcs-less')
+    check_cache_containment(wanted_cache_entries, vcs_less_build._cfg, 'vcs-less')
 
 def test_simex_builds():
     cfg = base.config_for_dir(file_dir + '/experiments_ymls/build_examples/')
     
-    def check_cache_containment(cache_entries, dir, build_name):
-        assert os.path.isfile(os.path.join(dir, util.SIMEX_CACHE))
-        with open(os.path.join(dir, util.SIMEX_CACHE), "r") as cachefile:
-            cache = json.load(cachefile)
-            for cache_entry in cache_entries:
-                assert cache_entry in cache[build_name]
+    def check_cache_containment(cache_entries, cfg, build_name):
+        assert os.path.isfile(cfg.status_store.path)
+        phases = cfg.status_store.get_build_phases(build_name)
+        for cache_entry in cache_entries:
+            assert phases[cache_entry]
 
     test_instances = [(b.revision.name, b.name) for b in cfg.all_builds()]
 
@@ -45,7 +42,7 @@ def test_simex_builds():
         revision = cfg.get_revision(rev_name)
         example_build = cfg.get_build(build_name, revision)
         build.make_builds(cfg, revision, [example_build.info], [build_name], wanted_phases)
-        check_cache_containment(wanted_cache_entries, example_build._cfg.basedir, build_name)
+        check_cache_containment(wanted_cache_entries, example_build._cfg, build_name)
 
 # pytest runs this function first, then on yield runs all tests, then finally runs the code following 'yield' (as cleanup/finalize)
 @pytest.fixture(scope='session', autouse=True)
@@ -62,7 +59,8 @@ def cleanup_build_files():
     try_delete(f"{file_dir}/experiments_ymls/build_examples/dev-builds")
     try_delete(f"{file_dir}/experiments_ymls/build_examples/develop")
     try_delete(f"{file_dir}/experiments_ymls/build_examples/bin")
-    try:
-        os.remove(f"{file_dir}/experiments_ymls/build_examples/.simex.cache")
-    except FileNotFoundError:
-        pass
+    for name in ['.simex.db', '.simex.db-wal', '.simex.db-shm', '.simex.snapshot']:
+        try:
+            os.remove(f"{file_dir}/experiments_ymls/build_examples/{name}")
+        except FileNotFoundError:
+            pass
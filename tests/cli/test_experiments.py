@@ -22,6 +22,21 @@ def test_simex_e_launch(launcher, rel_yml_path):
     assert ret_code == 0
 
 
+@pytest.mark.parametrize("rel_yml_path", yml_dirs)
+def test_simex_e_launch_jobs_requires_fork(rel_yml_path):
+    cwd = file_dir + rel_yml_path
+    ret_code = subprocess.check_call(["simex", "i", "install"], cwd=cwd)
+    assert ret_code == 0
+
+    proc = subprocess.run(
+        ["simex", "e", "launch", "--launch-through=queue", "-j", "2"], cwd=cwd,
+        stderr=subprocess.PIPE, universal_newlines=True
+    )
+
+    assert proc.returncode != 0
+    assert "only supported by the fork launcher" in proc.stderr
+
+
 @pytest.mark.parametrize("rel_yml_path", yml_dirs)
 def test_simex_e_purge_all(rel_yml_path):
     cwd = file_dir + rel_yml_path
@@ -0,0 +1,15 @@
+import os
+import shutil
+import pytest
+
+@pytest.fixture
+def copy_yml_dir(request, tmp_path):
+    # Copies experiments_ymls/<name> (next to the requesting test) into tmp_path,
+    # such that tests can write to the base directory.
+    def copy(name):
+        src = os.path.join(os.path.dirname(os.path.abspath(request.module.__file__)),
+                'experiments_ymls', name)
+        basedir = os.path.join(str(tmp_path), name)
+        shutil.copytree(src, basedir)
+        return basedir
+    return copy
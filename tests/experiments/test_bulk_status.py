@@ -0,0 +1,55 @@
+
+import pytest
+
+from simexpal import base
+from simexpal.launch import common
+from simexpal.launch.fork import ForkLauncher
+
+@pytest.fixture
+def cfg(copy_yml_dir):
+    return base.config_for_dir(copy_yml_dir('bulk_status'))
+
+def test_refresh_statuses_matches_get_status(cfg):
+    runs = list(cfg.discover_all_runs())
+
+    launcher = ForkLauncher()
+    launcher.submit(cfg, runs[0])
+    launcher.submit(cfg, runs[-1])
+    common.lock_run(runs[1])
+    assert common.lock_run(runs[2])
+    common.create_run_file(runs[2])
+
+    statuses = cfg.refresh_statuses(runs)
+    assert statuses == [run.get_status() for run in runs]
+    assert statuses[0] == base.Status.FINISHED
+    assert statuses[1] == base.Status.IN_SUBMISSION
+    assert statuses[2] == base.Status.SUBMITTED
+    assert statuses[3] == base.Status.NOT_SUBMITTED
+    assert statuses[-1] == base.Status.FAILED
+
+def test_refresh_statuses_uses_status_cache(cfg, monkeypatch):
+    runs = list(cfg.discover_all_runs())
+
+    launcher = ForkLauncher()
+    for run in runs:
+        launcher.submit(cfg, run)
+    expected = cfg.refresh_statuses(runs)
+    cfg.writeback_status_cache()
+
+    # A fresh configuration must not parse any .status files if the cache is up to date.
+    fresh_cfg = base.config_for_dir(cfg.basedir)
+
+    def fail_load(*args, **kwargs):
+        raise AssertionError('.status file was parsed')
+    monkeypatch.setattr(base.yaml, 'load', fail_load)
+
+    assert fresh_cfg.refresh_statuses(fresh_cfg.discover_all_runs()) == expected
+
+def test_threaded_refresh_is_deterministic(cfg):
+    runs = list(cfg.discover_all_runs())
+
+    launcher = ForkLauncher()
+    for run in runs[::2]:
+        launcher.submit(cfg, run)
+
+    assert cfg.refresh_statuses(runs, workers=4) == cfg.refresh_statuses(runs)
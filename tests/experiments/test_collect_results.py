@@ -0,0 +1,142 @@
+
+import functools
+import os
+import pickle
+import pytest
+import yaml
+
+from simexpal import base
+from simexpal import util
+
+def parse(run, f):
+    return [run.experiment.display_name, run.instance.shortname, run.repetition, yaml.safe_load(f)['value']]
+
+def finish_run(run, value, status=0):
+    util.try_mkdir(os.path.join(run.config.basedir, 'output'))
+    util.try_mkdir(run.experiment.output_subdir)
+    with open(run.output_file_path('out'), 'w') as f:
+        yaml.dump({'value': value}, f)
+    with open(run.output_file_path('status'), 'w') as f:
+        yaml.dump({'timeout': False, 'walltime': 0, 'status': status, 'signal': None, 'error': None}, f)
+
+@pytest.fixture
+def cfg(copy_yml_dir):
+    cfg = base.config_for_dir(copy_yml_dir('collect_results'))
+    for i, run in enumerate(cfg.discover_all_runs()):
+        # Leave some runs unfinished and let some runs fail.
+        if i % 7 == 3:
+            continue
+        finish_run(run, i, status=1 if i % 11 == 5 else 0)
+    return cfg
+
+def test_runs_are_picklable(cfg):
+    for run in list(cfg.discover_all_runs())[::13]:
+        restored = pickle.loads(pickle.dumps(run))
+        assert restored.config.basedir == cfg.basedir
+        assert restored.internal_name == run.internal_name
+        assert restored.instance.shortname == run.instance.shortname
+        assert restored.repetition == run.repetition
+
+@pytest.mark.parametrize('workers, executor', [(None, 'process'), (3, 'thread'), (3, 'process')])
+def test_collect_results(cfg, workers, executor):
+    expected = []
+    for i, run in enumerate(cfg.discover_all_runs()):
+        if i % 7 != 3 and i % 11 != 5:
+            expected.append((run, [run.experiment.display_name, run.instance.shortname, run.repetition, i]))
+    assert len(expected) > 2 * base.RESULT_CHUNK_SIZE
+
+    results = list(cfg.collect_results(parse, workers=workers, executor=executor))
+    assert results == expected
+
+def test_collect_results_of_selected_runs(cfg):
+    runs = cfg.find_runs(instance='inst-b', variants=['v2'])
+    results = list(cfg.collect_results(parse, runs=runs))
+    assert results
+    assert all(run.instance.shortname == 'inst-b' and result[1] == 'inst-b' for run, result in results)
+
+def test_results_are_cached(cfg):
+    parsed = []
+    def counting_parse(run, f):
+        parsed.append(run)
+        return parse(run, f)
+
+    first = list(cfg.collect_results(counting_parse))
+    assert len(parsed) == len(first)
+
+    # Nothing is re-parsed unless outputs change (also in new processes).
+    del parsed[:]
+    assert list(cfg.collect_results(counting_parse)) == first
+    cfg = base.config_for_dir(cfg.basedir)
+    assert [result for _, result in cfg.collect_results(counting_parse)] == [result for _, result in first]
+    assert parsed == []
+
+    # Only changed outputs and newly finished runs are parsed again.
+    runs = list(cfg.discover_all_runs())
+    changed_run, unfinished_run = runs[6], runs[3]
+    finish_run(changed_run, 'changed')
+    finish_run(unfinished_run, 'new')
+    results = dict(cfg.collect_results(counting_parse))
+    assert parsed == [unfinished_run, changed_run]
+    assert results[changed_run][3] == 'changed'
+    assert results[unfinished_run][3] == 'new'
+
+    # Changing the version invalidates the cache.
+    del parsed[:]
+    list(cfg.collect_results(counting_parse, version=2))
+    assert len(parsed) == len(results)
+
+    del parsed[:]
+    list(cfg.collect_results(counting_parse, cache=False))
+    assert len(parsed) == len(results)
+
+def test_results_without_json_representation_are_not_cached(cfg):
+    parsed = []
+    def tuple_parse(run, f):
+        parsed.append(run)
+        return tuple(parse(run, f))
+
+    first = list(cfg.collect_results(tuple_parse))
+    del parsed[:]
+    # Tuples would come back as lists, so they are parsed again.
+    assert list(cfg.collect_results(tuple_parse)) == first
+    assert len(parsed) == len(first)
+
+def test_results_are_looked_up_in_batches(cfg, monkeypatch):
+    monkeypatch.setattr(base, 'RESULT_CACHE_BATCH_SIZE', 16)
+    first = list(cfg.collect_results(parse, workers=3, executor='thread'))
+    assert first == list(cfg.collect_results(parse))
+
+    # Only the cached results of the selected runs are loaded.
+    lookups = []
+    get_results = cfg.status_store.get_results
+    def recording_get_results(parser, keys):
+        lookups.append(list(keys))
+        return get_results(parser, lookups[-1])
+    monkeypatch.setattr(cfg.status_store, 'get_results', recording_get_results)
+
+    results = list(cfg.collect_results(parse, runs=cfg.find_runs(instance='inst-b')))
+    assert results == [(run, result) for run, result in first if run.instance.shortname == 'inst-b']
+    assert all(len(keys) <= 16 for keys in lookups)
+    assert sum(len(keys) for keys in lookups) == len(results)
+
+def test_runs_are_streamed(cfg, monkeypatch):
+    monkeypatch.setattr(base, 'RESULT_CACHE_BATCH_SIZE', 16)
+    consumed = []
+    def generate_runs():
+        for run in cfg.discover_all_runs():
+            consumed.append(run)
+            yield run
+
+    results = cfg.collect_results(parse, runs=generate_runs())
+    next(results)
+    assert len(consumed) <= 3 * 16
+    assert len(list(results)) + 1 == len(list(cfg.collect_results(parse)))
+
+def test_parser_keys():
+    def other_parse(run, f):
+        return None
+
+    assert base.get_parser_key(parse) == base.get_parser_key(parse)
+    assert base.get_parser_key(parse) != base.get_parser_key(other_parse)
+    assert base.get_parser_key(parse, version=1) != base.get_parser_key(parse, version=2)
+    assert base.get_parser_key(functools.partial(parse)) is None
@@ -0,0 +1,108 @@
+
+import array
+import json
+import os
+import pickle
+import pytest
+
+from simexpal import base
+from simexpal import snapshot
+from simexpal import util
+
+def run_keys(cfg):
+    return [(run.experiment.display_name, run.instance.shortname, run.repetition)
+            for run in cfg.discover_all_runs()]
+
+@pytest.fixture
+def basedir(copy_yml_dir):
+    return copy_yml_dir('config_snapshot')
+
+def test_warm_start_skips_parsing_and_expansion(basedir, monkeypatch):
+    expected = run_keys(base.Config(os.path.abspath(basedir),
+            util.validate_setup_file(basedir, 'experiments.yml', 'experiments.json')))
+
+    # The first invocation writes the snapshot.
+    assert run_keys(base.config_for_dir(basedir)) == expected
+    assert os.path.isfile(os.path.join(basedir, util.SIMEX_SNAPSHOT))
+
+    def fail(*args, **kwargs):
+        raise AssertionError('snapshot was not used')
+    monkeypatch.setattr(util, 'validate_setup_file', fail)
+    monkeypatch.setattr(base.Config, '_expand_matrix', fail)
+
+    assert run_keys(base.config_for_dir(basedir)) == expected
+
+def test_snapshot_is_invalidated_on_change(basedir):
+    assert len(run_keys(base.config_for_dir(basedir))) == 4
+
+    with open(os.path.join(basedir, 'experiments.yml'), 'r') as f:
+        experiments_yml = f.read()
+    with open(os.path.join(basedir, 'experiments.yml'), 'w') as f:
+        f.write(experiments_yml.replace('repeat: 2', 'repeat: 3'))
+
+    assert len(run_keys(base.config_for_dir(basedir))) == 6
+
+def test_corrupted_snapshot_is_ignored(basedir):
+    expected = run_keys(base.config_for_dir(basedir))
+
+    with open(os.path.join(basedir, util.SIMEX_SNAPSHOT), 'wb') as f:
+        f.write(b'garbage')
+
+    assert run_keys(base.config_for_dir(basedir)) == expected
+
+class _Payload:
+    def __init__(self, marker):
+        self.marker = marker
+
+    def __reduce__(self):
+        return (open, (self.marker, 'w'))
+
+def test_pickled_snapshot_is_not_loaded(basedir):
+    expected = run_keys(base.config_for_dir(basedir))
+
+    # Snapshots of previous versions were pickled; loading them would execute arbitrary code.
+    marker = os.path.join(basedir, 'marker')
+    with open(os.path.join(basedir, util.SIMEX_SNAPSHOT), 'wb') as f:
+        pickle.dump(_Payload(marker), f)
+
+    assert run_keys(base.config_for_dir(basedir)) == expected
+    assert not os.path.exists(marker)
+
+@pytest.mark.parametrize('data', [
+    {'yml': 'invalid', 'experiments': None, 'num_runs': None},
+    {'experiments': [['unknown', None, []]]},
+    {'num_runs': 1000},
+])
+def test_incompatible_snapshot_is_ignored(basedir, data):
+    expected = run_keys(base.config_for_dir(basedir))
+
+    # Keep the key, such that the snapshot is considered up-to-date.
+    path = os.path.join(basedir, util.SIMEX_SNAPSHOT)
+    with open(path, 'rb') as f:
+        header = f.readline()
+        body = json.loads(f.readline().decode())
+        columns = f.read()
+    body.update(data)
+    with open(path, 'wb') as f:
+        f.write(header)
+        f.write(json.dumps(body).encode() + b'\n')
+        f.write(columns)
+
+    assert run_keys(base.config_for_dir(basedir)) == expected
+    assert len(list(base.config_for_dir(basedir).discover_all_runs(stream=True))) == len(expected)
+
+def test_out_of_range_runs_are_ignored(basedir):
+    expected = run_keys(base.config_for_dir(basedir))
+
+    path = os.path.join(basedir, util.SIMEX_SNAPSHOT)
+    with open(path, 'rb') as f:
+        header = f.readline()
+        body = json.loads(f.readline().decode())
+    body['num_runs'] = 2
+    with open(path, 'wb') as f:
+        f.write(header)
+        f.write(json.dumps(body).encode() + b'\n')
+        for col in [[0, 99], [0, 0], [0, 1]]:
+            array.array(snapshot.RUN_COLUMN_TYPECODE, col).tofile(f)
+
+    assert run_keys(base.config_for_dir(basedir)) == expected
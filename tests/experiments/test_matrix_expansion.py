@@ -0,0 +1,118 @@
+
+import os
+import pytest
+
+from simexpal import base
+from simexpal import util
+
+file_dir = os.path.abspath(os.path.dirname(__file__))
+
+def run_key(run):
+    exp = run.experiment
+    return (exp.name, exp.revision.name if exp.revision is not None else '_none',
+            [variant.name for variant in exp.variation], run.instance.shortname, run.repetition)
+
+@pytest.fixture
+def cfg():
+    basedir = file_dir + '/experiments_ymls/matrix_expansion'
+    return base.Config(basedir,
+            util.validate_setup_file(basedir, 'experiments.yml', 'experiments.json'))
+
+def test_runs_are_sorted_and_unique(cfg):
+    keys = [run_key(run) for run in cfg.discover_all_runs()]
+    assert keys
+    assert all(a < b for a, b in zip(keys, keys[1:]))
+
+def test_streaming_matches_memorized_expansion(cfg):
+    streamed = [run_key(run) for run in cfg.discover_all_runs(stream=True)]
+    # Streaming does not memorize the runs.
+    assert not cfg._runs_discovered
+
+    assert streamed == [run_key(run) for run in cfg.discover_all_runs()]
+    assert streamed == [run_key(run) for run in cfg.discover_all_runs(stream=True)]
+
+def test_streaming_is_lazy(cfg):
+    runs = cfg.discover_all_runs(stream=True)
+    first = next(runs)
+    assert run_key(first)[0] == 'alpha'
+    assert not cfg._runs_discovered
+
+@pytest.mark.parametrize('criteria', [
+    {'experiment': 'alpha'},
+    {'instance': 'm', 'revision': 'r1'},
+    {'instset': 's1', 'variants': ['c']},
+    {'axes': ['n'], 'repetition': 1},
+    {'experiment': 'zeta', 'instance': 'a', 'repetition': 0, 'variants': ['n:3']},
+])
+def test_find_runs_matches_linear_scan(cfg, criteria):
+    def selects(run):
+        exp = run.experiment
+        variant_names = [variant.name for variant in exp.variation]
+        return (criteria.get('experiment', exp.name) == exp.name
+                and criteria.get('instance', run.instance.shortname) == run.instance.shortname
+                and (criteria.get('instset') is None or criteria['instset'] in run.instance.instsets)
+                and (criteria.get('revision') is None
+                    or (exp.revision is not None and exp.revision.name == criteria['revision']))
+                and all(name in variant_names for name in criteria.get('variants', []))
+                and all(any(variant.axis == axis for variant in exp.variation)
+                    for axis in criteria.get('axes', []))
+                and criteria.get('repetition', run.repetition) == run.repetition)
+
+    expected = [run_key(run) for run in cfg.discover_all_runs() if selects(run)]
+    assert expected
+    assert [run_key(run) for run in cfg.find_runs(**criteria)] == expected
+
+def test_find_runs_without_discovery(cfg):
+    found = [run_key(run) for run in cfg.find_runs(experiment='alpha', instance='a', repetition=0)]
+    # Fully specified lookups must not expand the whole matrix.
+    assert not cfg._runs_discovered
+
+    expected = [run_key(run) for run in cfg.discover_all_runs()
+            if run.experiment.name == 'alpha' and run.instance.shortname == 'a' and run.repetition == 0]
+    assert found == expected
+    assert cfg.find_runs(experiment='zeta', instance='a', repetition=5) == []
+    assert cfg.find_runs(experiment='nonexistent', instance='a', repetition=0) == []
+
+def test_run_table_lookup(cfg):
+    runs = list(cfg.discover_all_runs())
+    assert list(cfg.discover_all_runs()) == runs
+
+    for run in runs[::7]:
+        found = cfg.find_runs(experiment=run.experiment.name, instance=run.instance.shortname,
+                repetition=run.repetition, variants=[variant.name for variant in run.experiment.variation])
+        assert run in found
+
+@pytest.mark.parametrize('criteria', [
+    {},
+    {'experiment': 'alpha'},
+    {'instset': 's1', 'variants': ['c']},
+    {'axes': ['n'], 'repetition': 1},
+])
+def test_count_runs_matches_expansion(cfg, criteria):
+    num_runs = cfg.count_runs(**criteria)
+    assert not cfg._runs_discovered
+    assert num_runs == len(cfg.find_runs(**criteria))
+
+    for group_by, key_arg in [('experiment', 'experiment'), ('revision', 'revision'), ('instset', 'instset')]:
+        counts = cfg.count_runs(group_by=group_by, **criteria)
+        for key, num_runs in counts.items():
+            if key is None or key_arg in criteria:
+                continue
+            assert num_runs == len(cfg.find_runs(**dict(criteria, **{key_arg: key})))
+
+    for variant, num_runs in cfg.count_runs(group_by='variant', **criteria).items():
+        variants = criteria.get('variants', []) + [variant]
+        assert num_runs == len(cfg.find_runs(**dict(criteria, variants=variants)))
+
+@pytest.mark.parametrize('stream', [False, True])
+def test_shards_partition_runs(cfg, stream):
+    all_keys = [run_key(run) for run in cfg.discover_all_runs(stream=stream)]
+
+    shards = [list(cfg.discover_all_runs(stream=stream, shard=(i, 3))) for i in range(3)]
+    for i, runs in enumerate(shards):
+        assert runs
+        assert all(base.get_run_shard(run.internal_name, run.instance.shortname, 3) == i for run in runs)
+    assert sorted(run_key(run) for runs in shards for run in runs) == all_keys
+
+    assert cfg.find_runs(experiment='alpha', shard=(1, 3)) == [run for run in shards[1]
+            if run.experiment.name == 'alpha']
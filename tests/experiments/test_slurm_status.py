@@ -0,0 +1,117 @@
+
+import subprocess
+import pytest
+
+from simexpal import base
+from simexpal import slurmquery
+from simexpal.launch import common
+
+class FakeSlurm:
+    def __init__(self, queue, accounting):
+        self.queue = queue
+        self.accounting = accounting
+        self.calls = []
+
+    def __call__(self, args, **kwargs):
+        self.calls.append(args)
+        job_ids = args[args.index('-j') + 1].split(',')
+        if args[0] == 'squeue':
+            assert '--me' in args
+            out = ''.join('{} {}\n'.format(job_id, self.queue[job_id])
+                    for job_id in job_ids if job_id in self.queue)
+        else:
+            out = ''.join('{}|{}|{}\n'.format(job_id, *self.accounting[job_id])
+                    for job_id in job_ids if job_id in self.accounting)
+        return subprocess.CompletedProcess(args, 0, out.encode(), b'')
+
+@pytest.fixture
+def basedir(copy_yml_dir):
+    basedir = copy_yml_dir('slurm_status')
+    cfg = base.config_for_dir(basedir)
+    for i, run in enumerate(cfg.discover_all_runs()):
+        assert common.lock_run(run)
+        common.create_run_file(run, launcher='slurm', job_id='7_{}'.format(i))
+    cfg.status_store.close()
+    return basedir
+
+def test_slurm_states_are_queried_in_batches(basedir, monkeypatch):
+    fake = FakeSlurm({'7_0': 'PD', '7_1': 'R'}, {'7_2': ('CANCELLED by 1000', 12)})
+    monkeypatch.setattr(slurmquery.subprocess, 'run', fake)
+
+    cfg = base.config_for_dir(basedir)
+    statuses = cfg.refresh_statuses(list(cfg.discover_all_runs()))
+    assert statuses == [base.Status.SUBMITTED, base.Status.STARTED, base.Status.KILLED]
+    assert cfg.get_slurm_job_elapsed('7_2') == 12
+
+    # One squeue call for our jobs and one sacct call for the jobs that left the queue.
+    assert [args[0] for args in fake.calls] == ['squeue', 'sacct']
+    assert sorted(fake.calls[0][fake.calls[0].index('-j') + 1].split(',')) == ['7_0', '7_1', '7_2']
+    assert fake.calls[1][fake.calls[1].index('-j') + 1] == '7_2'
+
+def test_single_runs_query_all_pending_jobs(basedir, monkeypatch):
+    fake = FakeSlurm({'7_0': 'PD', '7_1': 'R'}, {'7_2': ('COMPLETED', 3)})
+    monkeypatch.setattr(slurmquery.subprocess, 'run', fake)
+
+    cfg = base.config_for_dir(basedir)
+    statuses = [run.get_status() for run in cfg.discover_all_runs()]
+    assert statuses == [base.Status.SUBMITTED, base.Status.STARTED, base.Status.FAILED]
+
+    # The first lookup resolves the jobs of all runs at once.
+    assert [args[0] for args in fake.calls] == ['squeue', 'sacct']
+    assert sorted(fake.calls[0][fake.calls[0].index('-j') + 1].split(',')) == ['7_0', '7_1', '7_2']
+
+def test_query_slurm_defaults_to_pending_jobs(basedir, monkeypatch):
+    fake = FakeSlurm({'7_0': 'PD', '7_1': 'R', '7_2': 'R'}, {})
+    monkeypatch.setattr(slurmquery.subprocess, 'run', fake)
+
+    cfg = base.config_for_dir(basedir)
+    cfg.query_slurm()
+    assert [args[0] for args in fake.calls] == ['squeue']
+    assert cfg.get_slurm_job_status('7_2') == base.Status.STARTED
+    assert len(fake.calls) == 1
+
+def test_slurm_states_are_cached(basedir, monkeypatch):
+    fake = FakeSlurm({'7_0': 'PD', '7_1': 'R'}, {'7_2': ('TIMEOUT', 60)})
+    monkeypatch.setattr(slurmquery.subprocess, 'run', fake)
+
+    cfg = base.config_for_dir(basedir)
+    cfg.refresh_statuses(list(cfg.discover_all_runs()))
+    assert len(fake.calls) == 2
+
+    # A second invocation within the TTL does not query Slurm.
+    cfg = base.config_for_dir(basedir)
+    statuses = cfg.refresh_statuses(list(cfg.discover_all_runs()))
+    assert statuses == [base.Status.SUBMITTED, base.Status.STARTED, base.Status.TIMEOUT]
+    assert len(fake.calls) == 2
+
+    # After the TTL, only queued jobs are queried again; terminal states are kept.
+    fake.queue = {'7_0': 'R'}
+    fake.accounting['7_1'] = ('COMPLETED', 5)
+    cfg = base.config_for_dir(basedir)
+    entries = cfg.status_store.get_slurm_jobs(['7_0', '7_1', '7_2'])
+    assert entries['7_2'][2] is None
+    cfg.status_store.put_slurm_jobs({job_id: (status, elapsed, 0)
+            for job_id, (status, elapsed, _) in entries.items() if job_id != '7_2'})
+    statuses = cfg.refresh_statuses(list(cfg.discover_all_runs()))
+    assert statuses == [base.Status.STARTED, base.Status.FAILED, base.Status.TIMEOUT]
+    assert sorted(fake.calls[2][fake.calls[2].index('-j') + 1].split(',')) == ['7_0', '7_1']
+
+def test_unknown_jobs_are_failed(basedir, monkeypatch):
+    def run(args, **kwargs):
+        if args[0] == 'squeue':
+            return subprocess.CompletedProcess(args, 1, b'', b'slurm_load_jobs error: Invalid job id specified')
+        raise FileNotFoundError()
+    monkeypatch.setattr(slurmquery.subprocess, 'run', run)
+
+    cfg = base.config_for_dir(basedir)
+    run = next(cfg.discover_all_runs())
+    assert run.get_status() == base.Status.FAILED
+
+def test_failed_jobs_without_status_file_are_unfinished(basedir, monkeypatch, capsys):
+    fake = FakeSlurm({}, {'7_0': ('FAILED', 1), '7_1': ('CANCELLED by 1000', 1), '7_2': ('TIMEOUT', 1)})
+    monkeypatch.setattr(slurmquery.subprocess, 'run', fake)
+
+    cfg = base.config_for_dir(basedir)
+    with pytest.deprecated_call():
+        assert cfg.collect_successful_results(lambda run, f: None) == []
+    assert capsys.readouterr().out.count('Skipping unfinished run') == 3
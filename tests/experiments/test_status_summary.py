@@ -0,0 +1,56 @@
+
+import csv
+import io
+import json
+import subprocess
+import pytest
+
+from simexpal import base
+from simexpal.launch import common
+
+@pytest.fixture
+def basedir(copy_yml_dir):
+    basedir = copy_yml_dir('status_summary')
+
+    # Submit all runs of variant v2.
+    cfg = base.config_for_dir(basedir)
+    for run in cfg.find_runs(variants=['v2']):
+        assert common.lock_run(run)
+        common.create_run_file(run, launcher='fork')
+    cfg.status_store.close()
+    return basedir
+
+def test_status_summary(basedir):
+    cfg = base.config_for_dir(basedir)
+    summary = cfg.status_summary()
+
+    assert list(summary.keys()) == [
+        ('exp', ('v1',), None, 'small'),
+        ('exp', ('v1',), None, 'large'),
+        ('exp', ('v2',), None, 'small'),
+        ('exp', ('v2',), None, 'large'),
+    ]
+    assert summary[('exp', ('v1',), None, 'small')][base.Status.NOT_SUBMITTED] == 2
+    assert summary[('exp', ('v2',), None, 'small')][base.Status.SUBMITTED] == 2
+    assert summary[('exp', ('v2',), None, 'large')] == [0, 0, 1, 0, 0, 0, 0, 0, 0]
+
+    summary = cfg.status_summary(cfg.find_runs(instance='inst-a'), group_by=('instance',))
+    assert summary == {('inst-a',): [1, 0, 1, 0, 0, 0, 0, 0, 0]}
+
+    with pytest.raises(RuntimeError):
+        cfg.status_summary(group_by=('color',))
+
+def test_list_formats(basedir):
+    out = subprocess.check_output(['simex', 'e', 'list', '--format', 'json', '--by', 'variation'],
+            cwd=basedir)
+    assert json.loads(out.decode()) == [
+        {'variation': ['v1'], 'not_submitted': 2, 'in_submission': 0, 'submitted': 0, 'started': 0,
+            'finished': 0, 'timeout': 0, 'killed': 0, 'failed': 0, 'broken': 0, 'total': 2},
+        {'variation': ['v2'], 'not_submitted': 0, 'in_submission': 0, 'submitted': 2, 'started': 0,
+            'finished': 0, 'timeout': 0, 'killed': 0, 'failed': 0, 'broken': 0, 'total': 2},
+    ]
+
+    out = subprocess.check_output(['simex', 'e', 'list', '--format', 'csv'], cwd=basedir)
+    rows = list(csv.DictReader(io.StringIO(out.decode())))
+    assert [(row['variation'], row['instset'], row['total']) for row in rows] == [
+        ('v1', 'small', '2'), ('v1', 'large', '1'), ('v2', 'small', '2'), ('v2', 'large', '1')]
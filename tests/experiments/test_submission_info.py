@@ -0,0 +1,58 @@
+
+import os
+import socket
+import pytest
+
+from simexpal import base
+from simexpal.launch import common
+
+@pytest.fixture
+def run(copy_yml_dir):
+    cfg = base.config_for_dir(copy_yml_dir('submission_info'))
+    run = next(cfg.discover_all_runs())
+    assert common.lock_run(run)
+    return run
+
+def test_run_file_records_submission(run):
+    assert run.get_submission_info() is None
+
+    common.create_run_file(run, launcher='slurm', job_id='42_3')
+    info = run.get_submission_info()
+    assert info.launcher == 'slurm'
+    assert info.job_id == '42_3'
+    assert info.submit_host == socket.gethostname()
+    assert info.submit_time is not None
+    assert run.slurm_jobid == '42_3'
+    assert run.get_queue_jobid() is None
+
+def test_submission_info_is_memorized(run, monkeypatch):
+    common.create_run_file(run, launcher='queue', job_id='abc')
+
+    num_loads = [0]
+    load = base.yaml.load
+    def counting_load(*args, **kwargs):
+        num_loads[0] += 1
+        return load(*args, **kwargs)
+    monkeypatch.setattr(base.yaml, 'load', counting_load)
+
+    assert run.get_queue_jobid() == 'abc'
+    assert run.slurm_jobid is None
+    assert run.get_submission_info().launcher == 'queue'
+    assert num_loads[0] == 1
+
+    # Rewriting the file invalidates the memo.
+    common.create_run_file(run, launcher='queue', job_id='def')
+    os.utime(run.aux_file_path('run'), ns=(0, 0))
+    assert run.get_queue_jobid() == 'def'
+    assert num_loads[0] == 2
+
+def test_legacy_run_files(run):
+    with open(run.aux_file_path('run'), 'w') as f:
+        f.write("slurm_jobid: '17'\n")
+    info = run.get_submission_info()
+    assert (info.launcher, info.job_id) == ('slurm', '17')
+
+    with open(run.aux_file_path('run'), 'w') as f:
+        pass
+    os.utime(run.aux_file_path('run'), ns=(0, 0))
+    assert run.slurm_jobid is None
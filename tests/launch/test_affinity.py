@@ -0,0 +1,62 @@
+
+import os
+import pytest
+import yaml
+
+from simexpal import base
+from simexpal.launch import common
+from simexpal.launch.fork import ForkLauncher
+
+# Two packages with two physical cores each; CPU n and n + 4 are SMT siblings.
+def read_core_id(cpu):
+    return (cpu % 4 // 2, cpu % 2)
+
+def test_physical_cores():
+    assert common.get_physical_cores(range(8), read_core_id) == [[0, 4], [1, 5], [2, 6], [3, 7]]
+    assert common.get_physical_cores([1, 3], lambda cpu: None) == [[1], [3]]
+
+def test_resolve_affinity(monkeypatch):
+    monkeypatch.setattr(common, '_read_core_id', read_core_id)
+    available = set(range(8))
+
+    assert common.resolve_affinity('logical', [0, 1], available) == [0, 1]
+    assert common.resolve_affinity('logical', [6, 7], available) == [6, 7]
+    # Only one logical CPU per physical core is used.
+    assert common.resolve_affinity('physical', [0, 1, 2, 3], available) == [0, 1, 2, 3]
+    assert common.resolve_affinity('physical', [1], {1, 3, 5}) == [3]
+    with pytest.raises(RuntimeError):
+        common.resolve_affinity('physical', range(5), available)
+
+    # Explicit CPU lists are distributed over the slots.
+    assert common.resolve_affinity('0-2,5', [0, 1, 2, 3], available) == [0, 1, 2, 5]
+    assert common.resolve_affinity('0-2,5', [3], available) == [5]
+    assert common.resolve_affinity([3, 1], [0], available) == [1]
+    assert common.resolve_affinity([3, 1], [1], available) == [3]
+    with pytest.raises(RuntimeError):
+        common.resolve_affinity([3, 1], [2], available)
+    with pytest.raises(RuntimeError):
+        common.parse_cpu_list('0-x')
+
+@pytest.mark.skipif(not hasattr(os, 'sched_setaffinity'), reason='requires sched_setaffinity()')
+def test_affinity_is_applied(copy_yml_dir):
+    cfg = base.config_for_dir(copy_yml_dir('affinity'))
+
+    first_cpu = min(os.sched_getaffinity(0))
+    launcher = ForkLauncher()
+    runs = {run.experiment.variation[0].name: run for run in cfg.discover_all_runs()}
+    for run in runs.values():
+        launcher.submit(cfg, run)
+
+    def read_yaml(run, ext):
+        with open(run.output_file_path(ext)) as f:
+            return yaml.safe_load(f)
+
+    assert read_yaml(runs['none'], 'status')['affinity'] is None
+    assert read_yaml(runs['logical'], 'out') == [first_cpu]
+    assert read_yaml(runs['logical'], 'status')['affinity'] == [first_cpu]
+    if first_cpu == 0:
+        assert read_yaml(runs['explicit'], 'out') == [0]
+
+    status = read_yaml(runs['unavailable'], 'status')
+    assert status['error'] == 'affinity_failed'
+    assert runs['unavailable'].get_status() == base.Status.FAILED
@@ -0,0 +1,56 @@
+
+import os
+import pytest
+import yaml
+
+from simexpal import base
+from simexpal.launch.fork import ForkLauncher
+
+@pytest.fixture
+def cfg(copy_yml_dir):
+    return base.config_for_dir(copy_yml_dir('fork_launcher'))
+
+# Returns the maximal number of runs that were executed at the same time.
+def max_overlap(runs):
+    events = []
+    for run in runs:
+        with open(run.output_file_path('out')) as f:
+            start, end = yaml.safe_load(f)
+        events.extend([(start, 1), (end, -1)])
+
+    overlap = max_value = 0
+    for _, delta in sorted(events):
+        overlap += delta
+        max_value = max(max_value, overlap)
+    return max_value
+
+@pytest.mark.parametrize('experiment, jobs, expected', [
+    ('default', 3, 3),
+    ('default', 2, 2),
+    ('threads', 3, 1),
+    ('threads', 4, 2),
+    ('exclusive', 3, 1),
+    ('serial', 3, 1),
+])
+def test_parallel_launch(cfg, experiment, jobs, expected):
+    runs = cfg.find_runs(experiment=experiment)
+    ForkLauncher(jobs=jobs).submit_multiple(cfg, runs)
+
+    for run in runs:
+        assert run.get_status() == base.Status.FINISHED
+        assert os.path.isfile(run.aux_file_path('run'))
+    if expected == 1:
+        assert max_overlap(runs) == 1
+    else:
+        assert 1 < max_overlap(runs) <= expected
+
+def test_locked_runs_are_skipped(cfg):
+    runs = cfg.find_runs(experiment='default')
+    ForkLauncher(jobs=2).submit_multiple(cfg, runs[:1])
+    with open(runs[0].output_file_path('out')) as f:
+        output = f.read()
+
+    ForkLauncher(jobs=2).submit_multiple(cfg, runs)
+    with open(runs[0].output_file_path('out')) as f:
+        assert f.read() == output
+    assert all(run.get_status() == base.Status.FINISHED for run in runs)
@@ -0,0 +1,30 @@
+
+import os
+import pytest
+
+from simexpal import base
+from simexpal.launch import common
+from simexpal.launch.fork import ForkLauncher
+
+@pytest.mark.parametrize('mode, use_splice', [('lazy', True), ('lazy', False), ('direct', False)])
+def test_output_capture(copy_yml_dir, monkeypatch, mode, use_splice):
+    monkeypatch.setattr(common, 'USE_SPLICE', use_splice and common.USE_SPLICE)
+    # Use small chunks, such that the output is captured in many steps.
+    monkeypatch.setattr(common, 'CAPTURE_CHUNK_SIZE', 64 * 1024)
+
+    cfg = base.config_for_dir(copy_yml_dir('output_capture'))
+    noisy, = cfg.find_runs(experiment='noisy-' + mode)
+    quiet, = cfg.find_runs(experiment='quiet-' + mode)
+
+    launcher = ForkLauncher()
+    for run in [noisy, quiet]:
+        launcher.submit(cfg, run)
+        assert run.get_status() == base.Status.FINISHED
+
+    assert noisy.get_output().read_bytes() == bytes(range(256)) * 20000
+    assert noisy.get_error_output().read_text() == 'err'
+
+    # Only lazy capturing avoids creating empty files.
+    assert os.path.exists(quiet.aux_file_path('stdout')) == (mode == 'direct')
+    assert os.path.exists(quiet.aux_file_path('stderr')) == (mode == 'direct')
+    assert quiet.get_output().read_bytes() == b''
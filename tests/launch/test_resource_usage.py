@@ -0,0 +1,37 @@
+
+import yaml
+
+from simexpal import base
+from simexpal.launch.fork import ForkLauncher
+
+def test_resource_usage(copy_yml_dir):
+    cfg = base.config_for_dir(copy_yml_dir('resource_usage'))
+    run, = cfg.discover_all_runs()
+    assert run.get_resource_usage() is None
+
+    ForkLauncher().submit(cfg, run)
+    assert run.get_status() == base.Status.FINISHED
+
+    with open(run.output_file_path('status')) as f:
+        status_dict = yaml.safe_load(f)
+    assert set(base.RUSAGE_FIELDS) <= set(status_dict)
+
+    usage = run.get_resource_usage()
+    assert usage.maxrss >= 64 * 1024
+    assert usage.utime >= 0.1
+    assert usage.cpu_time == usage.utime + usage.stime
+    assert usage.cpu_time <= usage.walltime
+    assert usage.minflt >= 64 * 1024 // 4
+    assert usage.nvcsw >= 0 and usage.nivcsw >= 0 and usage.majflt >= 0
+
+    frame = cfg.results_frame(resource_usage=True)
+    assert frame.column_names[-len(base.RUSAGE_FIELDS) - 1:] == ['rusage.' + field
+            for field in ['walltime'] + base.RUSAGE_FIELDS]
+    assert list(frame.metrics['rusage.maxrss']) == [usage.maxrss]
+    assert 'rusage.maxrss' not in cfg.results_frame().column_names
+
+def test_old_status_files():
+    usage = base.ResourceUsage.from_yml({'timeout': False, 'walltime': 1.5, 'status': 0,
+            'signal': None, 'error': None})
+    assert usage.walltime == 1.5
+    assert usage.maxrss is None and usage.cpu_time is None
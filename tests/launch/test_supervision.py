@@ -0,0 +1,46 @@
+
+import time
+import pytest
+import yaml
+
+from simexpal import base
+from simexpal.launch import common
+from simexpal.launch.fork import ForkLauncher
+
+@pytest.fixture
+def cfg(copy_yml_dir):
+    return base.config_for_dir(copy_yml_dir('supervision'))
+
+def read_status(run):
+    with open(run.output_file_path('status')) as f:
+        return yaml.safe_load(f)
+
+@pytest.mark.parametrize('use_pidfd', [True, False])
+def test_exit_wakes_supervisor(cfg, monkeypatch, use_pidfd):
+    if not use_pidfd:
+        # Fall back to SIGCHLD.
+        monkeypatch.delattr(common.os, 'pidfd_open', raising=False)
+
+    runs = list(cfg.find_runs(experiment='fast'))
+    launcher = ForkLauncher()
+    start = time.perf_counter()
+    for run in runs:
+        launcher.submit(cfg, run)
+    elapsed = time.perf_counter() - start
+
+    # The supervisor must not wait for a select() timeout after the child exits.
+    assert elapsed < 2
+    for run in runs:
+        assert run.get_status() == base.Status.FINISHED
+        assert read_status(run)['walltime'] < 0.5
+        assert run.get_output().read_text() == 'out\n'
+        assert run.get_error_output().read_text() == 'err\n'
+
+def test_timeout_is_precise(cfg):
+    run = cfg.find_runs(experiment='slow')[0]
+    ForkLauncher().submit(cfg, run)
+
+    status = read_status(run)
+    assert run.get_status() == base.Status.TIMEOUT
+    assert status['signal'] == 'SIGXCPU'
+    assert 1 <= status['walltime'] < 1.25
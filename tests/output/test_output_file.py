@@ -0,0 +1,73 @@
+
+import os
+import subprocess
+import pytest
+
+from simexpal import base
+from simexpal import output
+from simexpal import util
+
+@pytest.fixture
+def path(tmp_path, monkeypatch):
+    # Use small blocks, so that reads span multiple blocks.
+    monkeypatch.setattr(output, 'BLOCK_SIZE', 16)
+    path = str(tmp_path / 'log.out')
+    with open(path, 'wb') as f:
+        f.write(b''.join('line {}\n'.format(i).encode() for i in range(100)))
+    return path
+
+def test_head_and_tail(path):
+    f = output.OutputFile(path)
+    assert f.head(3) == ['line 0', 'line 1', 'line 2']
+    assert f.tail(3) == ['line 97', 'line 98', 'line 99']
+    assert f.tail(1000) == ['line {}'.format(i) for i in range(100)]
+    assert f.tail(0) == []
+    assert list(f.iter_lines()) == ['line {}'.format(i) for i in range(100)]
+
+def test_tail_without_trailing_newline(tmp_path):
+    path = str(tmp_path / 'log.out')
+    with open(path, 'wb') as f:
+        f.write(b'a\nb\n\nc')
+    assert output.OutputFile(path).tail(3) == ['b', '', 'c']
+    assert output.OutputFile(path).head(10) == ['a', 'b', '', 'c']
+
+def test_byte_ranges(path):
+    f = output.OutputFile(path)
+    with open(path, 'rb') as g:
+        data = g.read()
+
+    assert f.size == len(data)
+    assert f.read_bytes(5, 30) == data[5:30]
+    assert f.read_bytes(-20) == data[-20:]
+    assert b''.join(f.iter_blocks(7, -3)) == data[7:-3]
+    with f.mmap() as m:
+        assert m[:] == data
+        assert m.find(b'line 50') == data.find(b'line 50')
+
+def test_missing_files_are_empty(tmp_path):
+    f = output.OutputFile(str(tmp_path / 'missing.out'))
+    assert not f.exists
+    assert f.size == 0
+    assert f.head(5) == f.tail(5) == []
+    assert f.read_bytes() == b''
+    with f.mmap() as m:
+        assert m == b''
+
+def test_print_tail(copy_yml_dir):
+    cfg = base.config_for_dir(copy_yml_dir('output_file'))
+    run = next(cfg.discover_all_runs())
+    util.try_mkdir(os.path.join(cfg.basedir, 'output'))
+    util.try_mkdir(run.experiment.output_subdir)
+    with open(run.output_file_path('out'), 'w') as f:
+        f.write(''.join('line {}\n'.format(i) for i in range(1000)))
+    assert run.get_output().tail(1) == ['line 999']
+
+    out = subprocess.check_output(['simex', 'e', 'print', '--experiment', 'exp', '--tail', '2'],
+            cwd=cfg.basedir).decode()
+    assert 'line 998\nline 999\n' in out
+    assert 'line 997' not in out
+
+    out = subprocess.check_output(['simex', 'e', 'print', '--experiment', 'exp', '--bytes=7:14'],
+            cwd=cfg.basedir).decode()
+    assert 'line 1\n' in out
+    assert 'line 2' not in out
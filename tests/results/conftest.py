@@ -0,0 +1,17 @@
+import os
+import pytest
+import yaml
+
+from simexpal import util
+
+@pytest.fixture
+def finish_run():
+    # Writes the given output and a .status file of a successful run.
+    def finish(run, output):
+        util.try_mkdir(os.path.join(run.config.basedir, 'output'))
+        util.try_mkdir(run.experiment.output_subdir)
+        with open(run.output_file_path('out'), 'w') as f:
+            yaml.dump(output, f)
+        with open(run.output_file_path('status'), 'w') as f:
+            yaml.dump({'timeout': False, 'walltime': 0, 'status': 0, 'signal': None, 'error': None}, f)
+    return finish
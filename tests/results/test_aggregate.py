@@ -0,0 +1,67 @@
+
+import random
+import statistics
+import pytest
+
+from simexpal import base
+from simexpal import results
+
+def test_running_stats():
+    values = [random.uniform(-5, 5) for _ in range(1000)]
+    running = results.RunningStats()
+    for value in values:
+        running.add(value)
+
+    assert running.count == 1000
+    assert running.mean == pytest.approx(statistics.mean(values))
+    assert running.var == pytest.approx(statistics.variance(values))
+    assert (running.min, running.max) == (min(values), max(values))
+
+    low, high = running.ci95
+    half_width = 1.9623 * statistics.stdev(values) / 1000 ** 0.5
+    assert low == pytest.approx(running.mean - half_width, rel=1e-3)
+    assert high == pytest.approx(running.mean + half_width, rel=1e-3)
+
+@pytest.mark.parametrize('p', [0.1, 0.5, 0.9])
+def test_quantile_sketch(p):
+    small = results.QuantileSketch(p)
+    for value in [4, 1, 3, 2]:
+        small.add(value)
+    # Small samples are exact (and linearly interpolated).
+    assert small.value() == pytest.approx(1 + 3 * p)
+
+    rng = random.Random(42)
+    values = [rng.gauss(0, 1) for _ in range(20000)]
+    sketch = results.QuantileSketch(p)
+    for value in values:
+        sketch.add(value)
+    exact = sorted(values)[int(p * len(values))]
+    assert sketch.value() == pytest.approx(exact, abs=0.05)
+
+def test_aggregate(copy_yml_dir, finish_run):
+    cfg = base.config_for_dir(copy_yml_dir('aggregate'))
+    expected = {}
+    for i, run in enumerate(cfg.discover_all_runs()):
+        finish_run(run, {'time': i * 0.5, 'size': 100, 'algo': 'quick'})
+        key = ('exp', tuple(v.name for v in run.experiment.variation), None, run.instance.shortname)
+        expected.setdefault(key, []).append(i * 0.5)
+
+    summary = cfg.aggregate(metrics=['time', 'missing'], stats=['count', 'mean', 'median', 'p90', 'stddev', 'ci95'])
+    assert list(summary.keys()) == list(expected.keys())
+    for key, values in expected.items():
+        stats = summary[key]['time']
+        assert list(stats.keys()) == ['count', 'mean', 'median', 'p90', 'stddev', 'ci95']
+        assert stats['count'] == 5
+        assert stats['mean'] == pytest.approx(statistics.mean(values))
+        assert stats['median'] == pytest.approx(statistics.median(values))
+        assert stats['p90'] == pytest.approx(values[3] + 0.6 * (values[4] - values[3]))
+        assert stats['stddev'] == pytest.approx(statistics.stdev(values))
+        assert stats['ci95'][0] < stats['mean'] < stats['ci95'][1]
+        assert list(summary[key].keys()) == ['time']
+
+    # Non-numeric metrics are skipped when aggregating all metrics.
+    summary = cfg.aggregate(stats=['max'], group_by=['experiment'])
+    assert summary == {('exp',): {'time': {'max': 9.5}, 'size': {'max': 100}}}
+
+    with pytest.raises(RuntimeError):
+        cfg.aggregate(stats=['mode'])
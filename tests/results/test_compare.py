@@ -0,0 +1,92 @@
+
+import os
+import subprocess
+import pytest
+
+from simexpal import base
+from simexpal import results
+
+# Times of the repetitions per (revision, instance).
+times = {
+    ('old', 'inst-a'): [1.0, 1.1, 0.9, 1.0],
+    ('new', 'inst-a'): [0.5, 0.55, 0.45, 0.5], # 2x faster.
+    ('old', 'inst-b'): [1.0, 1.02, 0.98, 1.0],
+    ('new', 'inst-b'): [1.5, 1.52, 1.48, 1.5], # Significantly slower.
+    ('old', 'inst-c'): [1.0, 2.0, 1.0, 2.0],
+    ('new', 'inst-c'): [1.1, 2.1, 1.1, 2.1], # Slower but not significant.
+}
+
+@pytest.fixture
+def cfg(copy_yml_dir, finish_run):
+    cfg = base.config_for_dir(copy_yml_dir('compare'))
+    for run in cfg.discover_all_runs():
+        key = (run.experiment.revision.name, run.instance.shortname)
+        finish_run(run, {'time': times[key][run.repetition]})
+    return cfg
+
+def test_welch_t_test():
+    first, second = results.RunningStats(), results.RunningStats()
+    for value in [27.5, 21.0, 19.0, 23.6, 17.0, 17.9, 16.9, 20.1, 21.9, 22.6, 23.1, 19.6, 19.0, 21.7, 21.4]:
+        first.add(value)
+    for value in [27.1, 22.0, 20.8, 23.4, 23.4, 23.5, 25.8, 22.0, 24.8, 20.2, 21.9, 22.1, 22.9, 20.5, 24.4]:
+        second.add(value)
+    # Reference value of Welch's t-test (t = -2.46, df = 24.99).
+    assert results.welch_t_test(first, second) == pytest.approx(0.02138, abs=1e-4)
+
+    single = results.RunningStats()
+    single.add(1)
+    assert results.welch_t_test(single, second) is None
+
+def test_compare_revisions(cfg):
+    comparison, = cfg.compare_revisions('old', 'new', ['time'])
+    rows = {row.instance: row for row in comparison.rows()}
+    assert list(rows) == ['inst-a', 'inst-b', 'inst-c']
+
+    assert rows['inst-a'].speedup == pytest.approx(2)
+    assert rows['inst-a'].verdict == 'improvement'
+    assert rows['inst-b'].speedup == pytest.approx(1 / 1.5)
+    assert rows['inst-b'].p_value < 0.001
+    assert rows['inst-b'].verdict == 'regression'
+    assert rows['inst-c'].speedup < 0.95
+    assert rows['inst-c'].p_value > 0.05
+    assert rows['inst-c'].verdict is None
+    assert all(row.base.count == 4 for row in rows.values())
+
+    geomeans = comparison.geometric_means()
+    expected = (2 * (1 / 1.5) * (1.5 / 1.6)) ** (1 / 3)
+    assert geomeans[('exp', ())] == pytest.approx(expected)
+    assert geomeans[None] == pytest.approx(expected)
+
+    # Reversing the revisions (and the direction of the metric) yields the same verdicts.
+    comparison, = cfg.compare_revisions('new', 'old', ['time'], higher_is_better=True)
+    assert [row.verdict for row in comparison.rows()] == ['improvement', 'regression', None]
+
+    with pytest.raises(RuntimeError):
+        cfg.compare_revisions('old', 'missing', ['time'])
+
+def test_compare_matches_repetitions(cfg):
+    # Repetitions that only exist for one revision are ignored.
+    run, = cfg.find_runs(revision='new', instance='inst-a', repetition=3)
+    os.unlink(run.output_file_path('status'))
+    comparison, = cfg.compare_revisions('old', 'new', ['time'])
+    row = comparison.rows()[0]
+    assert row.base.count == row.target.count == 3
+    assert row.base.mean == pytest.approx(1)
+
+def test_compare_cli(cfg):
+    proc = subprocess.run(['simex', 'results', 'compare', '--base', 'old', '--target', 'new',
+            '--metric', 'time', '--fail-on-regression'], cwd=cfg.basedir, stdout=subprocess.PIPE)
+    assert proc.returncode == 1
+    out = proc.stdout.decode()
+    assert 'regression' in out
+    assert '1 regression(s) beyond 5%' in out
+
+    out = subprocess.check_output(['simex', 'results', 'compare', '--base', 'old', '--target', 'new',
+            '--metric', 'time', '--instance', 'inst-a'], cwd=cfg.basedir).decode()
+    assert '0 regression(s)' in out
+    assert 'inst-b' not in out
+
+    # Errors (e.g., unknown revisions) make the command fail.
+    proc = subprocess.run(['simex', 'results', 'compare', '--base', 'old', '--target', 'missing',
+            '--metric', 'time'], cwd=cfg.basedir, stderr=subprocess.PIPE)
+    assert proc.returncode != 0
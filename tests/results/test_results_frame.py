@@ -0,0 +1,75 @@
+
+import csv
+import io
+import os
+import subprocess
+import pytest
+
+from simexpal import base
+from simexpal import results
+
+@pytest.fixture
+def cfg(copy_yml_dir, finish_run):
+    cfg = base.config_for_dir(copy_yml_dir('results_frame'))
+    for i, run in enumerate(cfg.discover_all_runs()):
+        output = {'time': i, 'algo': 'quick' if i % 2 else 'merge', 'nested': {'a': 1}}
+        if i == 3:
+            output['time'] = 0.5
+            output['extra'] = True
+        finish_run(run, output)
+    return cfg
+
+def test_results_frame(cfg):
+    frame = cfg.results_frame()
+    runs = list(cfg.discover_all_runs())
+    assert len(frame) == len(runs) == 8
+
+    assert frame.column_names == ['experiment', 'variation', 'revision', 'instance', 'repetition',
+            'algo', 'time', 'extra']
+    assert frame.experiment.categories == ['exp']
+    assert list(frame.experiment.codes) == [0] * 8
+    assert list(frame.variation) == [','.join(v.name for v in run.experiment.variation) for run in runs]
+    assert list(frame.revision.codes) == [-1] * 8
+    assert list(frame.instance) == [run.instance.shortname for run in runs]
+    assert list(frame.repetition) == [run.repetition for run in runs]
+
+    # Integer columns are promoted to floats; missing values are tracked.
+    assert frame.metrics['time'].kind == 'float'
+    assert list(frame.metrics['time']) == [0, 1, 2, 0.5, 4, 5, 6, 7]
+    assert frame.metrics['algo'].kind == 'str'
+    assert frame.metrics['algo'].values.categories == ['merge', 'quick']
+    assert list(frame.metrics['extra']) == [None, None, None, True, None, None, None, None]
+
+def test_inconsistent_metrics_are_rejected():
+    column = results.MetricColumn('m')
+    column.append(1)
+    with pytest.raises(RuntimeError):
+        column.append('text')
+
+def test_export_csv(cfg):
+    subprocess.check_call(['simex', 'results', 'export', '--format', 'csv', '--variants', 'v2'],
+            cwd=cfg.basedir)
+    with open(os.path.join(cfg.basedir, 'results.csv'), newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 4
+    assert all(row['variation'] == 'v2' and row['revision'] == '' for row in rows)
+
+    out = subprocess.check_output(['simex', 'results', 'export', '--format', 'csv', '-o', '-'],
+            cwd=cfg.basedir)
+    rows = list(csv.DictReader(io.StringIO(out.decode())))
+    assert [row['extra'] for row in rows] == ['', '', '', 'True', '', '', '', '']
+
+def test_export_npz(cfg, tmp_path):
+    np = pytest.importorskip('numpy')
+    path = str(tmp_path / 'results.npz')
+    cfg.results_frame().export(path, 'npz')
+    with np.load(path) as data:
+        assert list(data['instance.categories']) == ['inst-a', 'inst-b']
+        assert list(data['time']) == [0, 1, 2, 0.5, 4, 5, 6, 7]
+
+def test_export_parquet(cfg, tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    path = str(tmp_path / 'results.parquet')
+    cfg.results_frame().export(path, 'parquet')
+    table = pq.read_table(path, filters=[('instance', '=', 'inst-b')])
+    assert table.num_rows == 4
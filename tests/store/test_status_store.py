@@ -0,0 +1,88 @@
+
+import json
+import os
+import pytest
+
+from simexpal import store
+from simexpal import util
+from simexpal.base import Status
+
+@pytest.mark.parametrize('backend', ['sqlite', 'json'])
+def test_run_entries_persist(tmp_path, backend):
+    status_store = store.open_store(str(tmp_path), backend=backend)
+    status_store.put_run('exp~var@rev', 'inst', Status.FINISHED, 123.5)
+    status_store.put_run('exp', 'inst', Status.STARTED, 42.0)
+    status_store.flush()
+    status_store.delete_run('exp', 'inst')
+    status_store.flush()
+
+    reopened = store.open_store(str(tmp_path), backend=backend)
+    assert reopened.get_run('exp~var@rev', 'inst') == (Status.FINISHED, 123.5)
+    assert reopened.get_run('exp', 'inst') is None
+
+def test_sqlite_writers_only_touch_changed_entries(tmp_path):
+    first = store.open_store(str(tmp_path))
+    second = store.open_store(str(tmp_path))
+
+    # Both processes load the (empty) cache before either writes.
+    assert first.get_run('a', 'inst') is None
+    assert second.get_run('b', 'inst') is None
+
+    first.put_run('a', 'inst', Status.FINISHED, 1.0)
+    second.put_run('b', 'inst', Status.FAILED, 2.0)
+    first.flush()
+    second.flush()
+
+    reopened = store.open_store(str(tmp_path))
+    assert reopened.get_run('a', 'inst') == (Status.FINISHED, 1.0)
+    assert reopened.get_run('b', 'inst') == (Status.FAILED, 2.0)
+
+@pytest.mark.parametrize('backend', ['sqlite', 'json'])
+def test_build_phases_and_validation(tmp_path, backend):
+    status_store = store.open_store(str(tmp_path), backend=backend)
+    status_store.init_build('foo')
+    assert not any(status_store.get_build_phases('foo').values())
+
+    status_store.mark_build_phase('foo', util.CHECKOUT)
+    assert status_store.get_build_phases('foo')[util.CHECKOUT]
+    assert not status_store.get_build_phases('foo')[util.COMPILED]
+
+    status_store.update_validation({'experiments.yml': 10.0})
+    assert store.open_store(str(tmp_path), backend=backend).get_validation() == {'experiments.yml': 10.0}
+
+def test_results_are_looked_up_by_key(tmp_path):
+    status_store = store.open_store(str(tmp_path))
+    status_store.put_results('parser', {('exp', 'inst-a'): (1, 2, b'a'), ('exp', 'inst-b'): (1, 2, b'b'),
+            ('exp[1]', 'inst-a'): (1, 2, b'c')})
+    status_store.put_results('other', {('exp[1]', 'inst-b'): (1, 2, b'd')})
+
+    assert status_store.get_results('parser', [('exp', 'inst-b'), ('exp[1]', 'inst-b')]) == {
+            ('exp', 'inst-b'): (1, 2, b'b')}
+    assert status_store.get_results('parser', []) == {}
+    # More keys than SQLite allows host parameters per query.
+    keys = [('exp', 'inst-{}'.format(i)) for i in range(1000)] + [('exp', 'inst-a'), ('exp', 'inst-b'),
+            ('exp[1]', 'inst-a')]
+    assert set(status_store.get_results('parser', keys)) == {('exp', 'inst-a'), ('exp', 'inst-b'),
+            ('exp[1]', 'inst-a')}
+
+def test_sqlite_imports_legacy_build_phases(tmp_path):
+    with open(os.path.join(str(tmp_path), util.SIMEX_CACHE), 'w') as f:
+        json.dump({'status': {}, 'validation': {},
+                'foo': {util.CHECKOUT: True, util.COMPILED: False}}, f)
+
+    status_store = store.open_store(str(tmp_path))
+    phases = status_store.get_build_phases('foo')
+    assert phases[util.CHECKOUT]
+    assert not phases[util.COMPILED]
+
+@pytest.mark.parametrize('backend', ['sqlite', 'json'])
+def test_store_is_created_on_first_write(tmp_path, backend):
+    status_store = store.open_store(str(tmp_path), backend=backend)
+    assert status_store.get_run('exp', 'inst') is None
+    assert status_store.get_validation() == {}
+    assert status_store.get_slurm_jobs(['1']) == {}
+    assert not os.path.exists(status_store.path)
+
+    status_store.put_run('exp', 'inst', Status.FINISHED, 1.0)
+    status_store.flush()
+    assert os.path.isfile(status_store.path)
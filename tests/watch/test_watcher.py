@@ -0,0 +1,72 @@
+
+import os
+import subprocess
+import pytest
+
+from simexpal import base
+from simexpal import slurmquery
+from simexpal import watch
+from simexpal.launch import common
+
+def make_watcher(kind, dirs, parents):
+    if kind == 'inotify':
+        try:
+            return watch.InotifyWatcher(dirs, parents)
+        except OSError:
+            pytest.skip('inotify is not available')
+    return watch.PollingWatcher(dirs, parents, interval=0.05)
+
+@pytest.mark.parametrize('kind', ['inotify', 'polling'])
+def test_watcher_reports_changed_directories(tmp_path, kind):
+    output = os.path.join(str(tmp_path), 'output')
+    first = os.path.join(output, 'first')
+    second = os.path.join(output, 'second')
+    os.mkdir(output)
+    os.mkdir(first)
+
+    with make_watcher(kind, [first, second], [str(tmp_path), output]) as watcher:
+        assert watcher.wait(0.1) == set()
+
+        with open(os.path.join(first, 'inst.out'), 'w'):
+            pass
+        assert watcher.wait(5) == {first}
+
+        # Directories that are created later are picked up as well.
+        os.mkdir(second)
+        assert watcher.wait(5) == {second}
+        os.rename(os.path.join(first, 'inst.out'), os.path.join(second, 'inst.out'))
+        changed = watcher.wait(5)
+        changed |= watcher.wait(0.2)
+        assert changed == {first, second}
+
+def test_scheduler_backed_runs_are_refreshed(copy_yml_dir, monkeypatch):
+    basedir = copy_yml_dir('slurm_watch')
+    cfg = base.config_for_dir(basedir)
+    runs = list(cfg.discover_all_runs())
+    for i, run in enumerate(runs):
+        assert common.lock_run(run)
+        common.create_run_file(run, launcher='slurm', job_id='7_{}'.format(i))
+
+    queue = {'7_0': 'PD', '7_1': 'R', '7_2': 'R'}
+    accounting = {}
+    def fake_slurm(args, **kwargs):
+        job_ids = args[args.index('-j') + 1].split(',')
+        if args[0] == 'squeue':
+            out = ''.join('{} {}\n'.format(job_id, queue[job_id]) for job_id in job_ids if job_id in queue)
+        else:
+            out = ''.join('{}|{}|{}\n'.format(job_id, *accounting[job_id])
+                    for job_id in job_ids if job_id in accounting)
+        return subprocess.CompletedProcess(args, 0, out.encode(), b'')
+    monkeypatch.setattr(slurmquery.subprocess, 'run', fake_slurm)
+    monkeypatch.setattr(base, 'SLURM_STATUS_TTL', 0)
+
+    statuses = watch.watch_statuses(cfg, runs, interval=0, timeout=0.1)
+    try:
+        assert next(statuses) == [base.Status.SUBMITTED, base.Status.STARTED, base.Status.STARTED]
+
+        # The jobs end without writing any file.
+        del queue['7_0'], queue['7_1']
+        accounting.update({'7_0': ('CANCELLED by 1000', 0), '7_1': ('TIMEOUT', 60)})
+        assert next(statuses) == [base.Status.KILLED, base.Status.TIMEOUT, base.Status.STARTED]
+    finally:
+        statuses.close()